@@ -6,20 +6,43 @@ Date: 5/19/2022
 """
 
 # Imports
+import argparse
 import random
+import sys
 import tkinter as tk
 import tkinter.font as font
 from enum import Enum
 import time
+from word_store import get_word_store
+from wordy_engine import WordyEngine, InvalidGuess, ABSENT, PRESENT, CORRECT, WON, LOST
+from candidates import get_candidate_index, count
+from opening_book import get_opening_book
+from render import DiffRenderer
+from scheduler import FrameScheduler
+from word_trie import get_word_trie, PrefixCursor
+from suggest import suggest
+from adversary import AdversarialEngine
+from multiboard import MultiBoardEngine, BOARD_CHOICES, default_num_guesses
+from difficulty import get_difficulty_index, LEVELS
+from solver import get_solver
+from warmup import WarmUp
+from metrics import metrics
+from history import get_game_history, close_game_history
+from game_log import GameLog, LogHeader, load_current
 
 class Wordy:
-    def __init__(self):
-        """ Initialize the game """
+    def __init__(self, short_wordlist_filename="short_wordlist.txt", long_wordlist_filename="long_wordlist.txt"):
+        """ Initialize the game, the word lists can be replaced by ones built with dictionary_loader.py """
+        self.started_at = time.perf_counter()   # for the time to first paint and to playable
+        self.startup_seconds = {}               # 'first_paint' and 'playable', recorded with or without metrics
+
         # Constants
         self.WORD_SIZE = 5  # number of letters in the hidden word
         self.NUM_GUESSES = 6 # number of guesses that the user gets 
-        self.LONG_WORDLIST_FILENAME = "long_wordlist.txt"
-        self.SHORT_WORDLIST_FILENAME = "short_wordlist.txt"
+        self.WORD_SIZE_CHOICES = tuple(range(3, 16))  # word lengths offered in the parameter frame
+        self.NUM_BOARDS = 1  # number of hidden words played at once, one board each
+        self.LONG_WORDLIST_FILENAME = long_wordlist_filename
+        self.SHORT_WORDLIST_FILENAME = short_wordlist_filename
 
         # Size of the frame that holds all guesses.  This is the upper left
         # frame in the window.
@@ -86,13 +109,23 @@ class Wordy:
 
         self.MESSAGE_DISPLAY_TIME_SECS = 5 # Length of time the message should be
                                             # displayed.
-        self.PROCESS_GUESS_WAITTIME = 1  # When processing a guess (changing color
-                                        # of the guess frames), time to wait between
-                                        # updating successive frames.
+        self.CANDIDATE_LIST_SIZE = 100  # Most remaining words listed in the message frame.
+        self.PROCESS_GUESS_WAITTIME = 0.25  # When processing a guess (changing color
+                                        # of the guess frames), time in seconds to wait
+                                        # between updating successive frames.
 
         # Create window
         self.window = tk.Tk()
         self.window.title("Wordy")
+        # Closing the window quits like the Quit button
+        self.window.protocol("WM_DELETE_WINDOW", self.quit_button_handler)
+
+        # Tile reveals are animated by the scheduler, keys hit while a
+        # guess is being revealed wait in pending_keys
+        self.scheduler = FrameScheduler(self.window.after, self.window.after_cancel, self.render)
+        self.pending_keys = []
+        self.reveal_order = {}   # row being revealed -> order of its tiles
+        self.revealed = {}       # row being revealed -> number of tiles shown so far
 
         # Create guess fram
         self.guess_frame = tk.Frame(self.window, width=self.PARENT_GUESS_FRAME_WIDTH,
@@ -113,6 +146,22 @@ class Wordy:
         self.control_frame.grid_propagate(False)
 
         self.button_dict = {}
+
+        # Widgets are only configured through the renderer, which skips
+        # options that already have the wanted value
+        self.renderer = DiffRenderer()
+        self.engine = None
+        self.game_log = None        # GameLog the keys of the game are written to
+        self.prefix = None          # PrefixCursor over the typed letters when guesses must be words
+        self.boards = []            # engine of each board, the engine itself for one board
+        self.settled = set()        # solved boards whose boxes no longer change
+        self.guess_rows = self.NUM_GUESSES
+        self.letter_box_list = []   # [board][row][column] labels
+        self.letter_frame_list = [] # [board][row][column] frames
+        self.board_frame_list = []
+        self.grid_shape = None
+        self.configure_calls_at_guess = 0
+        self.guess_submitted_at = 0.0   # for the submit to fully revealed latency
         self.FONT = font.Font(family=self.FONT_FAMILY, size= self.FONT_SIZE_GUESS)
         self.PADDING = 10 # Padding around widgets
         self.ENTRY_SIZE = 10 # Size of entry widget
@@ -127,18 +176,69 @@ class Wordy:
         self.keyboard_third_row()
 
         # initialize the short and long word lists
-        self.short_word_list = []
-        self.long_word_list = []
+        self.word_store = None
+        self.short_word_list = ()
+        self.long_word_list = ()
 
         # initialize timer
         self.timer = None        
 
         # initialize hidden word as empty string
         self.hidden_word = ''
-        
-        # Start event loop
+
+        # Start Game waits for the warm-up to load the word lists
+        self.start_button['state'] = 'disabled'
+        self.warmup = None
+
+    def run(self):
+        """ Starts the event loop, the warm-up begins once the window is drawn. """
+        self.window.after_idle(self.first_paint)
         self.window.mainloop()
 
+    def first_paint(self):
+        """ Logs the time to first paint and starts loading the game data in the background. """
+        self.startup_seconds['first_paint'] = time.perf_counter() - self.started_at
+        metrics.observe('startup.first_paint', self.startup_seconds['first_paint'])
+        self.start_warmup()
+
+    def start_warmup(self):
+        """ Builds what the default word length needs on a worker thread. """
+        word_size = self.WORD_SIZE
+        store = lambda results: results['word lists']
+        steps = [
+            ('word lists', lambda results: get_word_store(self.SHORT_WORDLIST_FILENAME,
+                                                          self.LONG_WORDLIST_FILENAME), True),
+            ('remaining words index', lambda results: get_candidate_index(store(results), word_size), True),
+            ('prefix index', lambda results: get_word_trie(store(results), word_size), True),
+            ('hint data', lambda results: get_solver(store(results), word_size), False),
+            ('difficulty pools', lambda results: get_difficulty_index(store(results), word_size), False),
+            ('game history', lambda results: get_game_history(), False)]
+        self.message_var.set('Loading...')
+        self.warmup = WarmUp(steps, self.window.after, self.warmup_progress, self.warmup_ready)
+        self.warmup.start()
+
+    def warmup_progress(self, label, done, total, error):
+        """ Shows which warm-up step finished while the game is not playable yet. """
+        metrics.observe('warmup.' + label, self.warmup.timings[label])
+        if error is not None:
+            metrics.count('warmup.errors')
+            metrics.note('warmup.error.' + label, repr(error))
+        if not self.warmup.ready:
+            self.message_var.set(f'Loading: {label} done ({done}/{total})')
+
+    def warmup_ready(self, results, errors):
+        """ Enables Start Game once the required data is loaded. """
+        self.start_button['state'] = 'normal'
+        self.startup_seconds['playable'] = time.perf_counter() - self.started_at
+        metrics.observe('startup.playable', self.startup_seconds['playable'])
+
+        # The startup times are shown until the first guess replaces them
+        self.configure_calls_var.set('First paint {:.0f} ms, playable {:.0f} ms'.format(
+            self.startup_seconds['first_paint'] * 1000, self.startup_seconds['playable'] * 1000))
+        if self.engine is None and 'word lists' in results and self.resume_game(results['word lists']):
+            return
+        self.show_message('Ready. Click Start Game' if not errors else 'Loading failed, data is built on Start')
+
     def message_frame(self):
         """ Creates the message frame and label and centers the message. """
 
@@ -153,13 +253,19 @@ class Wordy:
         self.message = tk.Label(self.message_f, textvariable=self.message_var)
         self.message.grid(row=1, column=1)
 
+        # Create the remaining words label and list
+        self.candidates_var = tk.StringVar()
+        self.candidates_label = tk.Label(self.message_f, textvariable=self.candidates_var)
+        self.candidates_label.grid(row=2, column=1)
+        self.candidates_listbox = tk.Listbox(self.message_f, height=6, width=20)
+
         # Center column 1 in the frame.
         self.message_f.grid_columnconfigure(1, weight = 1)
 
         # Center (row wise) the message.
         self.message_f.grid_rowconfigure(0, weight = 1)
         self.message_f.grid_rowconfigure(1, weight = 0)
-        self.message_f.grid_rowconfigure(2, weight = 1)
+        self.message_f.grid_rowconfigure(4, weight = 1)
 
     def parameters(self):
         """ Creates the parameter frame and all its widgets and centers them. """
@@ -198,6 +304,13 @@ class Wordy:
                             var = self.specify_word_var)
         self.specify_word.grid(row = 4, column = 1, sticky = tk.W, padx= self.USER_SELECTION_PADDING)
 
+        # Creates the show remaining words checkbox
+        self.show_candidates_var = tk.BooleanVar()
+        self.show_candidates_var.set(False)
+        self.show_candidates = tk.Checkbutton(self.parameter_frame, text="Show remaining words",
+                            var = self.show_candidates_var, command=self.show_candidates_handler)
+        self.show_candidates.grid(row = 5, column = 1, sticky = tk.W, padx= self.USER_SELECTION_PADDING)
+
         # Creates the specify word entry field
         self.specify_entry_var = tk.StringVar()
         self.specify_entry = tk.Entry(self.parameter_frame, textvariable=self.specify_entry_var, width = 5)
@@ -208,10 +321,44 @@ class Wordy:
         self.show_word_label = tk.Label(self.parameter_frame, textvariable=self.show_word_label_var)
         self.show_word_label.grid(row=3, column=2, padx=self.USER_SELECTION_PADDING)
 
+        # Creates the word length label and selector
+        self.word_size_label = tk.Label(self.parameter_frame, text="Word length")
+        self.word_size_label.grid(row = 6, column = 1, sticky = tk.W, padx= self.USER_SELECTION_PADDING)
+        self.word_size_var = tk.StringVar()
+        self.word_size = tk.Spinbox(self.parameter_frame, values=self.WORD_SIZE_CHOICES,
+                            textvariable=self.word_size_var, width=3, state='readonly')
+        self.word_size_var.set(str(self.WORD_SIZE))
+        self.word_size.grid(row = 6, column = 2, padx= self.USER_SELECTION_PADDING)
+
+        # Creates the adversarial mode checkbox
+        self.adversarial_var = tk.BooleanVar()
+        self.adversarial_var.set(False)
+        self.adversarial = tk.Checkbutton(self.parameter_frame, text="Adversarial mode",
+                            var = self.adversarial_var)
+        self.adversarial.grid(row = 7, column = 1, sticky = tk.W, padx= self.USER_SELECTION_PADDING)
+
+        # Creates the number of boards label and selector
+        self.num_boards_label = tk.Label(self.parameter_frame, text="Boards")
+        self.num_boards_label.grid(row = 8, column = 1, sticky = tk.W, padx= self.USER_SELECTION_PADDING)
+        self.num_boards_var = tk.StringVar()
+        self.num_boards = tk.Spinbox(self.parameter_frame, values=BOARD_CHOICES,
+                            textvariable=self.num_boards_var, width=3, state='readonly')
+        self.num_boards_var.set(str(self.NUM_BOARDS))
+        self.num_boards.grid(row = 8, column = 2, padx= self.USER_SELECTION_PADDING)
+
+        # Creates the difficulty label and selector
+        self.difficulty_label = tk.Label(self.parameter_frame, text="Difficulty")
+        self.difficulty_label.grid(row = 9, column = 1, sticky = tk.W, padx= self.USER_SELECTION_PADDING)
+        self.difficulty_var = tk.StringVar()
+        self.difficulty = tk.Spinbox(self.parameter_frame, values=('Any',) + LEVELS,
+                            textvariable=self.difficulty_var, width=7, state='readonly')
+        self.difficulty_var.set('Any')
+        self.difficulty.grid(row = 9, column = 2, padx= self.USER_SELECTION_PADDING)
+
         # Center the widgets in the frame
         self.parameter_frame.grid_columnconfigure(1, weight = 1)
         self.parameter_frame.grid_rowconfigure(0, weight = 1)
-        self.parameter_frame.grid_rowconfigure(5, weight = 1)
+        self.parameter_frame.grid_rowconfigure(10, weight = 1)
 
     def buttons(self):
         """ Creates the button frame and the start and and quit buttons. """
@@ -226,39 +373,86 @@ class Wordy:
         self.start_button  = tk.Button(self.button_frame, text = "Start Game", command = self.start_button_handler)
         self.start_button.grid(row = 1, column=1)
     
+        # Create the hint button
+        self.hint_button = tk.Button(self.button_frame, text="Hint", command=self.hint_button_handler)
+        self.hint_button.grid(row=1, column=2)
+
         # Creats the quit button
         self.quit_button = tk.Button(self.button_frame, text="Quit", command= self.quit_button_handler)
-        self.quit_button.grid(row=1, column=2)
+        self.quit_button.grid(row=1, column=3)
+
+        # Create the stats button
+        self.stats_button = tk.Button(self.button_frame, text="Stats", command=self.stats_button_handler)
+        self.stats_button.grid(row=1, column=4)
+        self.stats_window = None
+
+        # Create the label counting Tk configure calls for the last guess
+        self.configure_calls_var = tk.StringVar()
+        self.configure_calls_label = tk.Label(self.button_frame, textvariable=self.configure_calls_var)
+        self.configure_calls_label.grid(row=2, column=1, columnspan=4)
 
         # Centers the buttons in the frame
         self.button_frame.grid_columnconfigure(0, weight=1)
-        self.button_frame.grid_columnconfigure(3, weight=1)
+        self.button_frame.grid_columnconfigure(5, weight=1)
         self.button_frame.grid_rowconfigure(1, weight=1)
 
     def start_button_handler(self):
         """ Handles the parameters when game is started. """
 
+        # Use the selected word length and number of boards
+        self.WORD_SIZE = int(self.word_size_var.get())
+        self.NUM_BOARDS = int(self.num_boards_var.get())
+
         # Get the short and long word lists
         self.word_lists()
 
-        # Clear letter frames
-        self.letter_frames()
+        # Several boards always play random words
+        if self.NUM_BOARDS > 1:
+            if self.adversarial_var.get() == True or self.specify_word_var.get() == True:
+                self.show_message("Adversarial mode and Specify Word play one board")
+                return
+            if len(self.short_word_list) < self.NUM_BOARDS:
+                self.show_message(f"Not enough words of this length for {self.NUM_BOARDS} boards")
+                return
+
+        self.clear_boards(default_num_guesses(self.NUM_BOARDS, self.NUM_GUESSES))
         
-        if self.specify_word_var.get() == False:
-            # Selects random word from short list if word is not specified
-            self.hidden_word = random.choice(self.short_word_list)
+        if self.NUM_BOARDS > 1:
+            # One distinct random word per board
+            hidden_words = random.sample(self.short_word_list, self.NUM_BOARDS)
+            self.hidden_word = ' '.join(hidden_words)
+
+        elif self.adversarial_var.get() == True:
+            # The hidden word is only settled by the guesses
+            self.hidden_word = ''
+
+        elif self.specify_word_var.get() == False:
+            # Selects random word from short list if word is not specified,
+            # from the chosen pool of the difficulty index if there is one
+            self.hidden_word = self.word_store.random_answer(self.WORD_SIZE)
+            if self.difficulty_var.get() in LEVELS:
+                index = get_difficulty_index(self.word_store, self.WORD_SIZE)
+                if index is not None:
+                    self.hidden_word = index.draw(self.difficulty_var.get())
+                else:
+                    self.show_message("No difficulty index for this length, run: python Wordy.py difficulty")
         
         else:
             # Sets word to specified word
-            self.hidden_word = self.specify_entry_var.get()
+            self.hidden_word = self.specify_entry_var.get().strip().lower()
 
             # Checks if the word is correct length
             if len(self.hidden_word) != self.WORD_SIZE:
                 self.show_message("Incorrect specified word length")
                 return
 
+            # Checks if the word can be typed on the keyboard
+            if not (self.hidden_word.isascii() and self.hidden_word.isalpha()):
+                self.show_message("Specified word must be letters A to Z")
+                return
+
             # Checks if the word is in the long word list 
-            if self.hidden_word not in self.long_word_list and self.be_words_var.get() == True:
+            if not self.word_store.is_valid(self.hidden_word) and self.be_words_var.get() == True:
                 self.show_message("Specified word is not a valid word")
                 return
             
@@ -268,47 +462,232 @@ class Wordy:
 
         self.show_word_handler()
 
-        if self.be_words_var.get() == True:
-            # Guesses have to be words in long word list
-            pass
+        # Start a new game in the engine
+        if self.NUM_BOARDS > 1:
+            self.engine = MultiBoardEngine(hidden_words, self.guess_rows, self.word_store, self.WORD_SIZE,
+                                           guesses_must_be_words=self.be_words_var.get(),
+                                           hard_mode=self.hard_mode_var.get())
+        elif self.adversarial_var.get() == True:
+            self.engine = AdversarialEngine(self.word_store, self.WORD_SIZE, self.NUM_GUESSES,
+                                            guesses_must_be_words=self.be_words_var.get(),
+                                            hard_mode=self.hard_mode_var.get())
+        else:
+            self.engine = WordyEngine(self.hidden_word, self.NUM_GUESSES, self.word_store, self.WORD_SIZE,
+                                      guesses_must_be_words=self.be_words_var.get(),
+                                      hard_mode=self.hard_mode_var.get())
+
+        # Log the keys of the game so it can be resumed after Quit or a crash
+        boards = getattr(self.engine, 'boards', [self.engine])
+        hidden_words = [] if self.adversarial_var.get() else [board.hidden_word for board in boards]
+        if self.game_log is not None:
+            self.game_log.close()
+        self.game_log = GameLog(LogHeader(self.WORD_SIZE, self.engine.num_guesses, hidden_words,
+                                          self.engine.hard_mode, self.engine.guesses_must_be_words,
+                                          self.adversarial_var.get(), self.specify_word_var.get(),
+                                          self.difficulty_var.get(), self.word_store.fingerprint))
+        self.begin_game()
+
+        # Calls the method to print the parameter options selected
+        self.parameter_options_display()
+
+    def clear_boards(self, guess_rows):
+        """ Stops any reveal of the previous game and draws empty boards. """
+        self.scheduler.cancel()
+        self.pending_keys = []
+        self.reveal_order = {}
+        self.revealed = {}
+
+        # Clear letter frames
+        self.engine = None
+        self.prefix = None
+        self.boards = []
+        self.settled = set()
+        self.guess_rows = guess_rows
+        self.letter_frames()
+
+    def begin_game(self):
+        """ Shows the game in self.engine, new or replayed, with a single render. """
+        self.boards = getattr(self.engine, 'boards', [self.engine])
+        self.settled = set(b for b, board in enumerate(self.boards) if board.status == WON)
+
+        # Follow the typed letters through the word list so dead end keys can be greyed out
+        self.prefix = None
+        if self.be_words_var.get():
+            self.prefix = PrefixCursor(get_word_trie(self.word_store, self.WORD_SIZE))
+            for letter in self.engine.current:
+                self.prefix.push(letter)
+
+        # Every answer of this length is a candidate until the first guess
+        self.candidate_index = get_candidate_index(self.word_store, self.WORD_SIZE)
+        self.candidates = self.candidate_index.full
+        self.update_candidates()
+        self.render()
+        self.configure_calls_at_guess = self.renderer.configure_calls
+
+        # Times of the guesses for the game history
+        self.game_started_at = time.perf_counter()
+        self.guess_seconds = []
 
         # Disable checkboxes when game is started
         self.hard_mode['state'] = 'disabled'
         self.be_words['state'] = 'disabled'
         self.specify_word['state'] = 'disabled'
-        
-        # Calls the method to print the parameter options selected
-        self.parameter_options_display()
+        self.word_size['state'] = 'disabled'
+        self.adversarial['state'] = 'disabled'
+        self.num_boards['state'] = 'disabled'
+        self.difficulty['state'] = 'disabled'
 
-    def parameter_options_display(self):
-        """ Prints out all of the options of the parameters and the hidden word. """
+    def resume_game(self, word_store):
+        """
+        Rebuilds the game the last run left in its log by replaying the keys
+        through the engine, then paints it once.  Returns False if there was
+        no game to resume.
+        """
+        with metrics.timer('resume.replay'):
+            resumed = load_current(word_store)
+        if resumed is None:
+            return False
+        header, engine = resumed
+
+        # Show the settings of the logged game
+        self.word_size_var.set(str(header.word_size))
+        self.num_boards_var.set(str(max(1, len(header.hidden_words))))
+        self.hard_mode_var.set(header.hard_mode)
+        self.be_words_var.set(header.guesses_must_be_words)
+        self.adversarial_var.set(header.adversarial)
+        self.specify_word_var.set(header.specify_word)
+        self.difficulty_var.set(header.difficulty)
+        self.WORD_SIZE = header.word_size
+        self.NUM_BOARDS = max(1, len(header.hidden_words))
+        self.word_lists()
 
-        print("Hard mode = " + str(self.hard_mode_var.get()))
-        print("Guesses must be words = " + str(self.be_words_var.get()))
-        print("Show word = " + str(self.show_word_var.get()))
-        print("Specify word = " + str(self.specify_word_var.get()))
-        print("Hidden word = " + self.hidden_word) 
+        self.clear_boards(header.num_guesses)
+        self.engine = engine
+        self.hidden_word = ' '.join(header.hidden_words)
+        self.show_word_handler()
+        self.game_log = GameLog.reopen()
+        self.begin_game()
+
+        # The game clock counts from the logged start, guesses before the resume have no times
+        self.game_started_at -= time.time() - header.started
+        self.guess_seconds = [None] * len(engine.guesses)
+        metrics.count('games.resumed')
+
+        if engine.status in (WON, LOST):
+            self.game_over()
+        else:
+            self.show_message('Resumed the last game')
+        return True
+
+    def enable_parameters(self):
+        """ Enables the game settings again once a game is over. """
+        self.hard_mode['state'] = 'normal'
+        self.be_words['state'] = 'normal'
+        self.specify_word['state'] = 'normal'
+        self.word_size['state'] = 'readonly'
+        self.adversarial['state'] = 'normal'
+        self.num_boards['state'] = 'readonly'
+        self.difficulty['state'] = 'readonly'
+
+    def parameter_options_display(self):
+        """ Records the options of the parameters and the hidden word in the metrics. """
+        metrics.count('games.started')
+        if not metrics.enabled:
+            return
+
+        metrics.note('game', {'hard_mode': self.hard_mode_var.get(),
+                              'guesses_must_be_words': self.be_words_var.get(),
+                              'show_word': self.show_word_var.get(),
+                              'specify_word': self.specify_word_var.get(),
+                              'word_length': self.WORD_SIZE,
+                              'adversarial_mode': self.adversarial_var.get(),
+                              'boards': self.NUM_BOARDS,
+                              'difficulty': self.difficulty_var.get(),
+                              'hidden_word': self.hidden_word})
+
+    def hint_button_handler(self):
+        """ Shows the guess that is expected to narrow down the remaining words the most. """
+        if self.engine is None or self.engine.status in (WON, LOST):
+            return
+
+        with metrics.timer('hint'):
+            guess = get_opening_book().best_guess(self.word_store, self.WORD_SIZE, self.candidates,
+                                                  self.engine.constraints, self.engine.hard_mode)
+        if guess is None:
+            self.show_message('No hint available')
+        else:
+            self.show_message(f'Hint: try {guess.upper()}')
+
+    def stats_button_handler(self):
+        """ Opens the statistics window, or brings it up to date if it is open. """
+        if self.stats_window is None or not self.stats_window.winfo_exists():
+            self.stats_window = tk.Toplevel(self.window)
+            self.stats_window.title('Statistics')
+            self.stats_var = tk.StringVar()
+            tk.Label(self.stats_window, textvariable=self.stats_var, justify='left',
+                     font=('Courier', 12)).grid(row=1, column=1, padx=10, pady=10)
+        self.show_stats()
+
+    def show_stats(self):
+        """ Shows the win rate, guess distribution and streaks kept by the game history. """
+        if self.stats_window is None or not self.stats_window.winfo_exists():
+            return
+        stats = get_game_history().stats()
+        lines = [f"Played {stats['games']}   Win % {stats['win_rate'] * 100:.0f}",
+                 f"Current streak {stats['streak']}   Max streak {stats['best_streak']}",
+                 '', 'Guess distribution']
+
+        # One bar per number of guesses, scaled to the most common one
+        distribution = {int(guesses): wins for guesses, wins in stats['distribution'].items()}
+        most = max(distribution.values(), default=0)
+        for guesses in range(1, max(distribution, default=self.NUM_GUESSES) + 1):
+            wins = distribution.get(guesses, 0)
+            bar = '#' * (round(20 * wins / most) if most else 0)
+            lines.append(f'{guesses:>2} {bar} {wins}')
+        self.stats_var.set('\n'.join(lines))
+
+    def record_game(self):
+        """ Adds the finished game to the history and refreshes the statistics window. """
+        feedback = [[board.feedback[row] if row < len(board.feedback) else None for board in self.boards]
+                    for row in range(len(self.engine.guesses))]
+        if len(self.boards) == 1:
+            feedback = [row[0] for row in feedback]
+        settings = {'word_length': self.WORD_SIZE, 'num_guesses': self.engine.num_guesses,
+                    'boards': len(self.boards), 'hard_mode': self.engine.hard_mode,
+                    'guesses_must_be_words': self.engine.guesses_must_be_words,
+                    'adversarial_mode': isinstance(self.engine, AdversarialEngine),
+                    'specify_word': self.specify_word_var.get(), 'difficulty': self.difficulty_var.get(),
+                    'dictionary': self.word_store.fingerprint}
+        with metrics.timer('history.record'):
+            get_game_history().record(settings, ' '.join(board.hidden_word for board in self.boards),
+                                      self.engine.status == WON, self.engine.guesses, feedback,
+                                      self.guess_seconds, time.perf_counter() - self.game_started_at)
+        self.show_stats()
 
     def quit_button_handler(self):
-        """ Quits the window. """
+        """ Quits the window, writing the metrics and profile if they were recorded. """
+        if metrics.enabled:
+            metrics.note('opening_book', get_opening_book().stats())
+            metrics.note('tk_configure_calls', self.renderer.configure_calls)
+        metrics.dump()
+        metrics.stop_profile()
+        close_game_history()
+        if self.game_log is not None:
+            self.game_log.close()
         self.window.destroy()
 
     def word_lists(self):
         """ Implements the short and long word lists from the given files. """
-    
-        # Append all words from short word file to short word list
-        short_file = open(self.SHORT_WORDLIST_FILENAME , 'r')
-        for word in short_file:
-            word = word.strip()
-            if len(word) == self.WORD_SIZE:
-                self.short_word_list.append(word)
-
-        # Append all words from the long word file to long word file
-        long_file = open(self.LONG_WORDLIST_FILENAME, 'r')
-        for word in long_file:
-            word = word.strip()
-            if len(word) == self.WORD_SIZE:
-                self.long_word_list.append(word)
+
+        # The files are only read the first time the store is requested,
+        # later games reuse the same indexed store.
+        with metrics.timer('load.word_lists'):
+            self.word_store = get_word_store(self.SHORT_WORDLIST_FILENAME, self.LONG_WORDLIST_FILENAME)
+            self.short_word_list = self.word_store.answers_of_length(self.WORD_SIZE)
+            self.long_word_list = self.word_store.allowed_of_length(self.WORD_SIZE)
+
+        # Solve the first turns of a dictionary the first time it is seen
+        get_opening_book().warm_in_background(self.word_store, self.WORD_SIZE)
 
     def show_message(self, message):
         """
@@ -325,6 +704,26 @@ class Wordy:
         # Reset message to empty
         self.message_var.set('')
 
+    def update_candidates(self):
+        """ Narrows the remaining words with the engine's constraints and displays them. """
+        if self.engine.guesses:
+            # With several boards the constraints switch boards as they are solved
+            within = self.candidates if len(self.boards) == 1 else None
+            with metrics.timer('candidates.filter'):
+                self.candidates = self.candidate_index.filter(self.engine.constraints, within)
+        self.candidates_var.set(f'Remaining words: {count(self.candidates)}')
+        self.show_candidates_handler()
+
+    def show_candidates_handler(self):
+        """ Shows the list of remaining words if show remaining words is checked. """
+        self.candidates_listbox.delete(0, 'end')
+        if self.show_candidates_var.get() == True and self.engine is not None:
+            words = self.candidate_index.words_in(self.candidates, self.CANDIDATE_LIST_SIZE)
+            self.candidates_listbox.insert('end', *words)
+            self.candidates_listbox.grid(row=3, column=1)
+        else:
+            self.candidates_listbox.grid_remove()
+
     def show_word_handler(self):
         """ Shows the word if show word is checked and dissappears if not. """
         if self.show_word_var.get() == True and self.hidden_word != '':
@@ -335,41 +734,90 @@ class Wordy:
 
     def letter_frames(self):
         """ 
-        Creates a grid of frames for the letters to go in 
+        Creates a grid of frames for the letters to go in, one grid per board.
+        The grids are only rebuilt when their size changes, otherwise they
+        are cleared in place.
         """
-        
+
+        shape = (self.NUM_BOARDS, self.guess_rows, self.WORD_SIZE)
+        if self.grid_shape == shape:
+            self.render()
+            return
+
+        # Remove the grids of the previous size
+        for b in range(len(self.letter_frame_list)):
+            for r in range(len(self.letter_frame_list[b])):
+                for c in range(len(self.letter_frame_list[b][r])):
+                    self.renderer.remove(('box', b, r, c))
+                    self.renderer.remove(('tile', b, r, c))
+        for board_frame in self.board_frame_list:
+            board_frame.destroy()
+
         self.letter_box_list = []
-        self.current_guess = {"row":0, "col":0}
         self.letter_frame_list = []
-        self.guessed_letters_list = []
-
-        # Create the grid of guess box frames
-        for r in range(1,self.NUM_GUESSES+1):
+        self.board_frame_list = []
+        self.grid_shape = shape
+
+        # Arrange the boards in the number of columns that gives the biggest
+        # boxes, and shrink the boxes so long words still fit in the guess frame
+        box_size, board_columns = max(
+            (min(self.PARENT_GUESS_FRAME_WIDTH // (columns * (self.WORD_SIZE + 1)),
+                 self.PARENT_GUESS_FRAME_HEIGHT // (self.NUM_BOARDS // columns * (self.guess_rows + 1))), columns)
+            for columns in range(1, self.NUM_BOARDS + 1) if self.NUM_BOARDS % columns == 0)
+        padding = self.GUESS_FRAME_PADDING if box_size >= self.GUESS_FRAME_SIZE // 2 else 1
+        box_size = min(self.GUESS_FRAME_SIZE, box_size - 2 * padding)
+        font_size = max(6, self.FONT_SIZE_GUESS * box_size // self.GUESS_FRAME_SIZE)
+        board_rows = self.NUM_BOARDS // board_columns
+
+        for b in range(self.NUM_BOARDS):
+            board_frame = tk.Frame(self.guess_frame)
+            board_frame.grid(row=b // board_columns + 1, column=b % board_columns + 1,
+                             padx=padding, pady=padding)
+            self.board_frame_list.append(board_frame)
             self.letter_box_list.append([])
             self.letter_frame_list.append([])
 
-            for c in range(1,self.WORD_SIZE+1):
-                self.letter_box = tk.Frame(self.guess_frame, width=self.GUESS_FRAME_SIZE, 
-                                height= self.GUESS_FRAME_SIZE, borderwidth = 0.5, relief= 'solid')
-                self.letter_box.grid(row=r, column=c, padx= self.GUESS_FRAME_PADDING, pady= self.GUESS_FRAME_PADDING)
-                self.letter_box.grid_propagate(False)
-
-                self.letter_label = tk.Label(self.letter_box, text="", font=(self.FONT_FAMILY, self.FONT_SIZE_GUESS))
-                self.letter_label.grid(row=1, column=1)
-                self.letter_box_list[r-1].append(self.letter_label)
-                self.letter_frame_list[r-1].append(self.letter_box)
-
-                # Center guess box
-                self.letter_box.grid_rowconfigure(0, weight=1)
-                self.letter_box.grid_rowconfigure(2, weight=1)
-                self.letter_box.grid_columnconfigure(0, weight=1)
-                self.letter_box.grid_columnconfigure(2, weight=1)
-
-        # Center the guess box frames in the guess frame
+            # Create the grid of guess box frames
+            for r in range(1,self.guess_rows+1):
+                self.letter_box_list[b].append([])
+                self.letter_frame_list[b].append([])
+
+                for c in range(1,self.WORD_SIZE+1):
+                    self.letter_box = tk.Frame(board_frame, width=box_size, 
+                                    height= box_size, borderwidth = 0.5, relief= 'solid')
+                    self.letter_box.grid(row=r, column=c, padx= padding, pady= padding)
+                    self.letter_box.grid_propagate(False)
+
+                    self.letter_label = tk.Label(self.letter_box, text="", font=(self.FONT_FAMILY, font_size))
+                    self.letter_label.grid(row=1, column=1)
+                    self.letter_box_list[b][r-1].append(self.letter_label)
+                    self.letter_frame_list[b][r-1].append(self.letter_box)
+
+                    # Remember the starting look of the box so it can be reset in place
+                    self.box_bg_begin = self.letter_box.cget('bg')
+                    self.tile_bg_begin = self.letter_label.cget('bg')
+                    self.tile_fg_begin = self.letter_label.cget('fg')
+                    self.renderer.add(('box', b, r-1, c-1), self.letter_box, bg=self.box_bg_begin)
+                    self.renderer.add(('tile', b, r-1, c-1), self.letter_label, text="",
+                                      bg=self.tile_bg_begin, fg=self.tile_fg_begin)
+
+                    # Center guess box
+                    self.letter_box.grid_rowconfigure(0, weight=1)
+                    self.letter_box.grid_rowconfigure(2, weight=1)
+                    self.letter_box.grid_columnconfigure(0, weight=1)
+                    self.letter_box.grid_columnconfigure(2, weight=1)
+
+        # Center the boards in the guess frame, clearing the weights of the
+        # previous layout's edge row and column first
+        if getattr(self, 'guess_frame_edge_column', None) is not None:
+            self.guess_frame.grid_columnconfigure(self.guess_frame_edge_column, weight=0)
+            self.guess_frame.grid_rowconfigure(self.guess_frame_edge_row, weight=0)
+        self.guess_frame_edge_column = board_columns + 1
+        self.guess_frame_edge_row = board_rows + 1
         self.guess_frame.grid_rowconfigure(0, weight=1)
-        self.guess_frame.grid_rowconfigure(self.NUM_GUESSES+2, weight=1)
+        self.guess_frame.grid_rowconfigure(self.guess_frame_edge_row, weight=1)
         self.guess_frame.grid_columnconfigure(0, weight=1)
-        self.guess_frame.grid_columnconfigure(self.WORD_SIZE+2, weight=1)
+        self.guess_frame.grid_columnconfigure(self.guess_frame_edge_column, weight=1)
 
     def keyboard_first_row(self):
         """
@@ -403,6 +851,8 @@ class Wordy:
             # where the key is the button text, and the
             # value is the button object.
             self.button_dict[self.KEYBOARD_BUTTON_NAMES[0][c]] = button
+            self.renderer.add(('key', self.KEYBOARD_BUTTON_NAMES[0][c]), button,
+                              fg=self.KEYBOARD_BUTTON_TEXT_BEGIN, state='normal')
 
             # Center the keys in the frame
             self.top_row_letters.grid_columnconfigure(c + 1, weight=1)  # Updated column configure to match the loop index
@@ -440,7 +890,9 @@ class Wordy:
             # Put the button in a dictionary of buttons
             # where the key is the button text, and the
             # value is the button object.
-            self.button_dict[self.KEYBOARD_BUTTON_NAMES[1][c]] = button 
+            self.button_dict[self.KEYBOARD_BUTTON_NAMES[1][c]] = button
+            self.renderer.add(('key', self.KEYBOARD_BUTTON_NAMES[1][c]), button,
+                              fg=self.KEYBOARD_BUTTON_TEXT_BEGIN, state='normal') 
 
             # Center the keys in te frame
             self.mid_row_letters.grid_columnconfigure(0, weight = 1)
@@ -485,7 +937,9 @@ class Wordy:
             # Put the button in a dictionary of buttons
             # where the key is the button text, and the
             # value is the button object.
-            self.button_dict[self.KEYBOARD_BUTTON_NAMES[2][c]] = button 
+            self.button_dict[self.KEYBOARD_BUTTON_NAMES[2][c]] = button
+            self.renderer.add(('key', self.KEYBOARD_BUTTON_NAMES[2][c]), button,
+                              fg=self.KEYBOARD_BUTTON_TEXT_BEGIN, state='normal') 
 
             # Center the keys in te frame
             self.bot_row_letters.grid_columnconfigure(0, weight = 1)
@@ -495,126 +949,249 @@ class Wordy:
         
 
     def keyboard_button_handler(self, text):
-        """ Displays which key was hit by the user in the terminal. """
-
-        print(text, "button was hit.")
+        """ Passes the key that was hit to the engine and updates the guess boxes. """
 
-        # Put letter in the correct box if letter clicked
-        if self.current_guess['col'] < self.WORD_SIZE and text not in ["ENTER", "BACK"]:
-            self.letter_box_list[self.current_guess['row']][self.current_guess['col']]['text'] = text
-            self.guessed_letters_list.append(text)
-            self.current_guess['col'] += 1
+        metrics.count('keys.' + (text.lower() if text in ('ENTER', 'BACK') else 'letter'))
 
-        # Remove the most recent letter guessed if back is clicked
-        elif text == 'BACK' and self.current_guess['col'] > 0:
-            self.current_guess['col'] -= 1
-            self.guessed_letters_list.pop()
-            self.letter_box_list[self.current_guess["row"]][self.current_guess["col"]]["text"] = ""
+        # Ignore keys until a game is started and after it is over
+        if self.engine is None or self.engine.status in (WON, LOST):
+            return
 
-        # If enter is clicked
-        elif text == 'ENTER':
+        # Hold keys until the guess being revealed is finished
+        if self.scheduler.busy:
+            self.pending_keys.append(text)
+            return
 
-            self.word_guessed = ''.join(self.guessed_letters_list).lower()
+        # Every key the engine is given goes to the log
+        self.game_log.append(text)
 
-            # Check if a full 5 letter word was guessed
-            if self.current_guess['col'] != self.WORD_SIZE:
-                self.show_message('Word not finished')
+        row = self.engine.row
 
-            # If guess must be words is on check if word is in the long list
-            elif self.be_words_var.get() and self.word_guessed not in self.long_word_list:
-                self.show_message(f'{self.word_guessed} is not in the word list')
+        # Remove the most recent letter guessed if back is clicked
+        if text == 'BACK':
+            if self.engine.delete_letter():
+                if self.prefix is not None:
+                    self.prefix.pop()
+                self.render()
 
-            # If user guessed word correctly, display message
-            elif self.word_guessed == self.hidden_word:
-                self.color_change(self.current_guess['row'])
-                self.show_message('Correct. Nice job. Game over.')
+        # If enter is clicked
+        elif text == 'ENTER':
+            try:
+                with metrics.timer('guess.submit'):
+                    self.engine.submit()
+            except InvalidGuess as error:
+                metrics.count('guesses.rejected')
+                message = str(error)
+
+                # Suggest the closest words when the guess is not a word
+                guess = ''.join(self.engine.current)
+                if self.engine.guesses_must_be_words and len(guess) == self.WORD_SIZE and \
+                        not self.word_store.is_valid(guess):
+                    suggestions = suggest(self.word_store, guess)
+                    if suggestions:
+                        message += '. Did you mean ' + ', '.join(word.upper() for word in suggestions) + '?'
+                self.show_message(message)
                 return
 
-            # If user did not guess word in 6 tries, display message
-            elif self.current_guess['row'] == self.NUM_GUESSES -1:
-                self.color_change(self.current_guess['row'])
-                self.show_message(f'Guesses used up. Word was {self.hidden_word}. Game over')
-                return
+            if self.prefix is not None:
+                self.prefix.reset()
+            metrics.count('guesses.accepted')
+            self.guess_submitted_at = time.perf_counter()
+            self.guess_seconds.append(self.guess_submitted_at - self.game_started_at)
+            self.color_change(row)
 
-            # reset the entry and move down to the next row
-            else:
-                self.color_change(self.current_guess['row'])
-                self.current_guess['row'] += 1
-                self.current_guess['col'] = 0
-                self.guessed_letters_list = []
-            
+        # Put letter in the correct box if letter clicked
+        elif self.engine.type_letter(text):
+            if self.prefix is not None:
+                self.prefix.push(text.lower())
+            self.render()
 
     def color_change(self, row):
         """
         Changes the color of keyboard and guess frames depending on accuracy of user guess. 
+        The boxes are revealed one at a time, correct letters first.
         """
+        self.reveal_order[row] = self.get_order_of_letters(row)
+        self.revealed[row] = 0
+
+        for step in range(self.WORD_SIZE):
+            self.scheduler.schedule(step * self.PROCESS_GUESS_WAITTIME * 1000,
+                                    lambda: self.reveal_next(row))
+        self.scheduler.when_idle(lambda: self.guess_revealed(row))
+
+    def reveal_next(self, row):
+        """ Shows the result of the next box of a row, the scheduler redraws afterwards. """
+        self.revealed[row] += 1
+
+    def guess_revealed(self, row):
+        """ Finishes a guess once all its boxes are shown. """
+        del self.revealed[row]
+        del self.reveal_order[row]
+        self.render()
+        metrics.observe('guess.reveal', time.perf_counter() - self.guess_submitted_at)
+
+        # Boards solved by now are left alone by later renders
+        self.settled.update(b for b, board in enumerate(self.boards) if board.status == WON)
+        self.update_candidates()
+
+        # Show how many widgets had to be configured for this guess
+        calls = self.renderer.configure_calls - self.configure_calls_at_guess
+        self.configure_calls_at_guess = self.renderer.configure_calls
+        self.configure_calls_var.set(f'Tk updates last guess: {calls}')
+
+        if self.engine.status in (WON, LOST):
+            self.game_over()
+
+        # Replay the keys that were hit during the reveal
+        keys, self.pending_keys = self.pending_keys, []
+        for key in keys:
+            self.keyboard_button_handler(key)
+
+    def game_over(self):
+        """ Records the finished game, ends its log and shows the result. """
+        self.record_game()
+        self.game_log.finish(self.engine.status)
+
+        # If user guessed word correctly, display message
+        if self.engine.status == WON:
+            self.show_message('Correct. Nice job. Game over.')
+
+        # If user did not guess word in 6 tries, display message
+        else:
+            missed = ', '.join(board.hidden_word for board in self.boards if board.status != WON)
+            self.show_message(f'Guesses used up. Word was {missed}. Game over')
+        self.enable_parameters()
 
-        # Initialize a list for the letters guessed
-        self.letters_guessed = []
-
-        # Correct letters fill in first
-        self.order_of_guesses = self.get_order_of_letters()
-
-        # Loop through each letter
-        for col in self.order_of_guesses:
-
-            # Get current letter from box
-            cur_letter = self.letter_box_list[row][col]["text"].lower()
-
-            # Color changes to white
-            self.letter_box_list[row][col]["fg"] = "white"
-
-            # Change to green if letter is in correct place
-            if cur_letter == self.hidden_word[col]:
-                self.letter_frame_list[row][col]["bg"] = self.GUESS_FRAME_BG_CORRECT_RIGHT_LOC
-                self.letter_box_list[row][col]["bg"] = self.GUESS_FRAME_BG_CORRECT_RIGHT_LOC
-                self.button_dict[self.letter_box_list[row][col]["text"]]["fg"] = self.GUESS_FRAME_BG_CORRECT_RIGHT_LOC
-
-            # Change to orange if letter is in the word but in the wrong place
-            elif cur_letter in self.hidden_word:
-
-                # Change to gray after max amount if the letter appears multiple times
-                if cur_letter in self.letters_guessed:
-                    if self.letters_guessed.count(cur_letter) >= self.hidden_word.count(cur_letter):
-                        self.letter_frame_list[row][col]["bg"] = self.GUESS_FRAME_BG_WRONG
-                        self.letter_box_list[row][col]["bg"] = self.GUESS_FRAME_BG_WRONG
-                        self.button_dict[self.letter_box_list[row][col]["text"]]["fg"] = self.GUESS_FRAME_BG_WRONG
-                        continue
-                
-                self.letter_frame_list[row][col]["bg"] = self.GUESS_FRAME_BG_CORRECT_WRONG_LOC
-                self.letter_box_list[row][col]["bg"] = self.GUESS_FRAME_BG_CORRECT_WRONG_LOC
-                self.button_dict[self.letter_box_list[row][col]["text"]]["fg"] = self.GUESS_FRAME_BG_CORRECT_WRONG_LOC
-
-            # Change to grey if letter is not in the word
-            else:
-                self.letter_frame_list[row][col]["bg"] = self.GUESS_FRAME_BG_WRONG
-                self.letter_box_list[row][col]["bg"] = self.GUESS_FRAME_BG_WRONG
-                self.button_dict[self.letter_box_list[row][col]["text"]]["fg"] = self.GUESS_FRAME_BG_WRONG
-                
-            self.letters_guessed.append(cur_letter)
-
-    def get_order_of_letters(self):
+    def view_state(self):
+        """
+        Returns the wanted text and colors of every guess box and key as a
+        {widget key: options} dictionary built from the engine.
+        """
+        colors = {ABSENT: self.GUESS_FRAME_BG_WRONG,
+                  PRESENT: self.GUESS_FRAME_BG_CORRECT_WRONG_LOC,
+                  CORRECT: self.GUESS_FRAME_BG_CORRECT_RIGHT_LOC}
+        state = {}
+        keyboard = {}
+        engine = self.engine
+        current = engine.current if engine is not None else []
+
+        for b in range(self.NUM_BOARDS):
+            # Solved boards keep the look they were given when their last guess was revealed
+            if b in self.settled:
+                continue
+            board = self.boards[b] if b < len(self.boards) else None
+            guesses = board.guesses if board is not None else []
+            typing = board is not None and board.status not in (WON, LOST)
+
+            for row in range(self.guess_rows):
+                # Boxes of a row that is still being revealed
+                shown = None
+                if row in self.revealed:
+                    shown = self.reveal_order[row][:self.revealed[row]]
+
+                for col in range(self.WORD_SIZE):
+                    if row < len(guesses) and shown is not None and col not in shown:
+                        # Submitted guess waiting for its turn to be revealed
+                        state[('box', b, row, col)] = {'bg': self.box_bg_begin}
+                        state[('tile', b, row, col)] = {'text': guesses[row][col].upper(),
+                                                        'bg': self.tile_bg_begin, 'fg': self.tile_fg_begin}
+                    elif row < len(guesses):
+                        # Submitted guess, colored by its feedback
+                        bg = colors[board.feedback[row][col]]
+                        state[('box', b, row, col)] = {'bg': bg}
+                        state[('tile', b, row, col)] = {'text': guesses[row][col].upper(), 'bg': bg,
+                                                        'fg': self.GUESS_FRAME_TEXT_AFTER}
+                    else:
+                        # Row being typed or not reached yet
+                        text = current[col].upper() if typing and row == len(guesses) and col < len(current) else ""
+                        state[('box', b, row, col)] = {'bg': self.box_bg_begin}
+                        state[('tile', b, row, col)] = {'text': text, 'bg': self.tile_bg_begin,
+                                                        'fg': self.tile_fg_begin}
+
+        # Keys merge the boards still being solved (every board once all are solved)
+        for board in [board for board in self.boards if board.status != WON] or self.boards:
+            for row, (guess, feedback) in enumerate(zip(board.guesses, board.feedback)):
+                shown = self.reveal_order[row][:self.revealed[row]] if row in self.revealed else range(self.WORD_SIZE)
+                for col in shown:
+                    keyboard[guess[col]] = max(feedback[col], keyboard.get(guess[col], feedback[col]))
+
+        # Letters that no word continues the typed prefix with are greyed out
+        allowed = None
+        if self.prefix is not None and engine.status not in (WON, LOST) and not self.revealed:
+            allowed = self.prefix.allowed()
+
+        # The key shows the best result revealed for its letter in any guess
+        for name in self.button_dict:
+            result = keyboard.get(name.lower())
+            dead_end = allowed is not None and len(name) == 1 and not allowed >> (ord(name) - ord('A')) & 1
+            state[('key', name)] = {'fg': colors[result] if result is not None
+                                    else self.KEYBOARD_BUTTON_TEXT_BEGIN,
+                                    'state': 'disabled' if dead_end else 'normal'}
+        return state
+
+    def render(self):
+        """ Brings the guess boxes and keys up to date, configuring only what changed. """
+        with metrics.timer('render'):
+            self.renderer.apply_all(self.view_state())
+
+    def get_order_of_letters(self, row):
         """
         Returns a list with the correct letter indexes at the front
         """
 
-        self.order_of_guesses = []
-        self.guessed_word = ''.join(self.guessed_letters_list).lower()
+        # Several boards are revealed together, left to right
+        if len(self.boards) > 1:
+            return list(range(self.WORD_SIZE))
+
+        order_of_guesses = []
+        feedback = self.engine.feedback[row]
 
-        # To handle cases in which there are multiple of the same letter 
-        # in a guesses, add the correct letters first 
-        for i in range(len(self.hidden_word)):
-            if self.hidden_word[i] == self.guessed_word[i]:
+        for i in range(len(feedback)):
+            if feedback[i] == CORRECT:
                 # insert the correct letter to front of list
-                self.order_of_guesses.insert(0, i) 
+                order_of_guesses.insert(0, i)
             else:
                 # add to back of list if incorrect
-                self.order_of_guesses.append(i) 
+                order_of_guesses.append(i)
 
-        return self.order_of_guesses
+        return order_of_guesses
 
 
 
 
 if __name__ == "__main__":
-   Wordy()
\ No newline at end of file
+   # "python Wordy.py simulate ..." plays games headlessly, see simulate.py
+   if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+      import simulate
+      sys.exit(simulate.main(sys.argv[2:]))
+
+   # "python Wordy.py difficulty ..." builds the Easy/Medium/Hard pools, see difficulty.py
+   if len(sys.argv) > 1 and sys.argv[1] == "difficulty":
+      import difficulty
+      sys.exit(difficulty.main(sys.argv[2:]))
+
+   # "python Wordy.py serve ..." hosts games over HTTP and WebSocket, see server.py
+   if len(sys.argv) > 1 and sys.argv[1] == "serve":
+      import server
+      sys.exit(server.main(sys.argv[2:]))
+
+   # "python Wordy.py dictionary ..." builds word lists from a custom dictionary, see dictionary_loader.py
+   if len(sys.argv) > 1 and sys.argv[1] == "dictionary":
+      import dictionary_loader
+      sys.exit(dictionary_loader.main(sys.argv[2:]))
+
+   parser = argparse.ArgumentParser(description='Play Wordy.')
+   parser.add_argument('--short-wordlist', default="short_wordlist.txt", help='hidden word candidates')
+   parser.add_argument('--long-wordlist', default="long_wordlist.txt", help='allowed guesses')
+   # "--metrics" writes hot path timings to wordy_metrics.json on Quit,
+   # "--profile" also saves a cProfile capture to wordy_profile.prof
+   parser.add_argument('--metrics', action='store_true')
+   parser.add_argument('--profile', action='store_true')
+   args = parser.parse_args()
+
+   if args.metrics or args.profile:
+      metrics.enabled = True
+   if args.profile:
+      metrics.start_profile()
+
+   Wordy(args.short_wordlist, args.long_wordlist).run()
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+File: adversary.py
+Adversarial ("Absurdle") games.  No hidden word is picked up front: after
+every guess the remaining answers are partitioned by the feedback they would
+give (scoring.partition, one vectorized pass) and the game keeps the largest
+group, answering with that group's feedback.  The player only wins once a
+guess leaves no other answer to hide behind.
+"""
+
+# Imports
+from scoring import word_array, largest_bucket, decode
+from wordy_engine import WordyEngine
+
+
+class AdversarialEngine(WordyEngine):
+    """ WordyEngine that defers choosing the hidden word for as long as possible. """
+
+    __slots__ = ('candidates', 'candidate_codes')
+
+    def __init__(self, word_store, word_size, num_guesses=6, guesses_must_be_words=True,
+                 hard_mode=False):
+        """ Starts with every answer of the word length still possible. """
+        answers = word_store.answers_of_length(word_size)
+        if not answers:
+            raise ValueError(f'no answers of length {word_size}')
+        # hidden_word is always one of the remaining answers
+        super().__init__(answers[0], num_guesses, word_store, word_size,
+                         guesses_must_be_words, hard_mode)
+        self.candidates = answers
+        self.candidate_codes = word_array(answers, word_size)
+
+    def score(self, guess):
+        """ Keeps the largest group of answers that share a feedback and returns that feedback. """
+        pattern, keep = largest_bucket(guess, self.candidate_codes)
+        self.candidates = tuple(word for word, kept in zip(self.candidates, keep) if kept)
+        self.candidate_codes = self.candidate_codes[keep]
+        self.hidden_word = self.candidates[0]
+        return decode(pattern, self.word_size)
@@ -0,0 +1,90 @@
+"""
+File: benchmarks/bench_startup.py
+Compares dictionary start up cost of the original text parsing in
+Wordy.word_lists() with a cold (recompiling) and warm (memory-mapped)
+load of the compiled word list cache.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--word-size N]
+"""
+
+# Imports
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import word_cache  # noqa: E402
+
+SHORT_WORDLIST = os.path.join(ROOT, 'short_wordlist.txt')
+LONG_WORDLIST = os.path.join(ROOT, 'long_wordlist.txt')
+
+
+def text_parse(word_size, cache_path):
+    """ The original per-game parsing: read both files and keep one word length. """
+    short_word_list = []
+    long_word_list = []
+    with open(SHORT_WORDLIST, 'r') as short_file:
+        for word in short_file:
+            word = word.strip()
+            if len(word) == word_size:
+                short_word_list.append(word)
+    with open(LONG_WORDLIST, 'r') as long_file:
+        for word in long_file:
+            word = word.strip()
+            if len(word) == word_size:
+                long_word_list.append(word)
+    return short_word_list, long_word_list
+
+
+def cold_load(word_size, cache_path):
+    """ Load with no cache on disk, forcing a compile and write. """
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+    compiled = word_cache.load_word_lists(SHORT_WORDLIST, LONG_WORDLIST, cache_path)
+    return compiled.words(word_cache.SHORT, word_size), compiled.words(word_cache.LONG, word_size)
+
+
+def warm_load(word_size, cache_path):
+    """ Load from an up to date cache by memory-mapping it. """
+    compiled = word_cache.load_word_lists(SHORT_WORDLIST, LONG_WORDLIST, cache_path)
+    return compiled.words(word_cache.SHORT, word_size), compiled.words(word_cache.LONG, word_size)
+
+
+def time_case(function, word_size, cache_path, repeat):
+    """ Returns the list of wall clock times in milliseconds for repeated calls. """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(word_size, cache_path)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main(argv=None):
+    """ Runs the three start up cases and prints a summary table. """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--word-size', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = os.path.join(temp_dir, 'bench.wordcache')
+
+        print('%-12s %10s %10s %10s' % ('case', 'median ms', 'min ms', 'max ms'))
+        for name, function in (('text parse', text_parse), ('cold cache', cold_load),
+                               ('warm cache', warm_load)):
+            if function is warm_load:
+                # Make sure the warm case has a cache to map
+                cold_load(args.word_size, cache_path)
+            times = time_case(function, args.word_size, cache_path, args.repeat)
+            print('%-12s %10.2f %10.2f %10.2f' % (name, statistics.median(times),
+                                                  min(times), max(times)))
+
+
+if __name__ == '__main__':
+    main()
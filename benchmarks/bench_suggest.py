@@ -0,0 +1,119 @@
+"""
+File: benchmarks/bench_suggest.py
+Compares "did you mean" lookups on the wildcard index of suggest.py with a
+BK-tree under Hamming distance and a brute-force scan of the word list.
+Queries are valid words with one or two letters changed so that they are no
+longer words.
+
+Usage: python benchmarks/bench_suggest.py [--word-size 5 8 12] [--queries N]
+"""
+
+# Imports
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from suggest import NeighborIndex, brute_force_search, hamming, MAX_DISTANCE  # noqa: E402
+from word_store import WordStore  # noqa: E402
+
+SHORT_WORDLIST = os.path.join(ROOT, 'short_wordlist.txt')
+LONG_WORDLIST = os.path.join(ROOT, 'long_wordlist.txt')
+
+
+class BKTree:
+    """ BK-tree of equal length words under Hamming distance. """
+
+    def __init__(self, words):
+        """ Inserts the words.  Node i holds words[i] and a {distance: node} dict. """
+        self.words = []
+        self.children = []
+        for word in dict.fromkeys(words):
+            self.words.append(word)
+            self.children.append({})
+            node = 0
+            while len(self.words) > 1:
+                distance = hamming(word, self.words[node])
+                child = self.children[node].get(distance)
+                if child is None:
+                    self.children[node][distance] = len(self.words) - 1
+                    break
+                node = child
+
+    def search(self, word, max_distance=MAX_DISTANCE):
+        """ Returns the (distance, word) pairs within max_distance, nearest first. """
+        found = []
+        stack = [0] if self.words else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(word, self.words[node])
+            if distance <= max_distance:
+                found.append((distance, self.words[node]))
+            for edge, child in self.children[node].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+def misspell(word, valid, rng):
+    """ Changes one or two letters of a word until it is not a valid word. """
+    while True:
+        letters = list(word)
+        for position in rng.sample(range(len(word)), rng.choice((1, 2))):
+            letters[position] = rng.choice(string.ascii_lowercase)
+        query = ''.join(letters)
+        if query not in valid:
+            return query
+
+
+def time_lookups(search, queries):
+    """ Returns the results and per query times in milliseconds. """
+    results = []
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        times.append((time.perf_counter() - start) * 1000)
+    return results, sorted(times)
+
+
+def main(argv=None):
+    """ Builds the indexes per word length and times them against brute force. """
+    parser = argparse.ArgumentParser(description='Benchmark the did you mean lookups.')
+    parser.add_argument('--word-size', type=int, nargs='+', default=[5, 8, 12])
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    store = WordStore(SHORT_WORDLIST, LONG_WORDLIST)
+    rng = random.Random(args.seed)
+    for word_size in args.word_size:
+        words = store.allowed_of_length(word_size)
+        valid = set(words)
+        queries = [misspell(rng.choice(words), valid, rng) for _ in range(args.queries)]
+        print(f'length {word_size}: {len(words)} words')
+
+        expected, times = time_lookups(lambda query: brute_force_search(words, query), queries)
+        timings = [('brute force', 0.0, times)]
+        for name, build_index in (('wildcards', NeighborIndex), ('bk-tree', BKTree)):
+            start = time.perf_counter()
+            index = build_index(words)
+            build = time.perf_counter() - start
+            results, times = time_lookups(index.search, queries)
+            assert results == expected, f'{name} and brute force disagree'
+            timings.append((name, build, times))
+
+        for name, build, times in timings:
+            print(f'  {name:<12} build {build * 1000:5.0f} ms, mean {statistics.mean(times):.3f} ms, '
+                  f'p50 {times[len(times) // 2]:.3f} ms, p99 {times[int(len(times) * 0.99)]:.3f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,430 @@
+"""
+File: benchmarks/bench_suite.py
+Benchmark suite for the core operations of the game, run once per word
+length with its own parameter set:
+
+    load.cold       compile the word list cache from the text files, decode one length
+    load.warm       memory-map the up to date cache, decode one length
+    validate        WordyEngine.validate on a mix of words and non-words
+    score.original  the two pass coloring of the original color_change, for reference
+    score.engine    score_guess plus the reveal order of get_order_of_letters
+    score.batch     scoring.score_against, one guess against every answer (per pair)
+    filter          CandidateIndex.filter after one and two guesses
+    hint            Solver.best_guess for positions after the opening guess
+    game            full entropy solver games through simulate.play_game
+
+Before timing, the three scorers are checked against each other on random
+pairs and on words with repeated letters, so a faster scorer that changes
+the colors fails the run.  Words are drawn with a fixed seed.  Results are
+per operation times in microseconds (median and min over --repeat runs,
+with garbage collection paused as timeit does).
+
+Shared and throttled machines change speed from one second to the next, so
+a fixed reference loop is timed right before every run and each case is
+also kept relative to it.  Results can be saved as a JSON baseline, and
+later runs are compared with it on the relative figure.  A case is flagged
+when it is slower than the baseline by more than --threshold, and the run
+then exits with status 1.
+
+Usage: python benchmarks/bench_suite.py [--lengths 5 8 12] [--cases load validate ...]
+                                        [--repeat N] [--save] [--baseline FILE] [--threshold 0.25]
+"""
+
+# Imports
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import simulate  # noqa: E402
+import word_cache  # noqa: E402
+from candidates import get_candidate_index  # noqa: E402
+from scoring import word_array, score_against, decode  # noqa: E402
+from solver import get_solver  # noqa: E402
+from word_store import WordStore  # noqa: E402
+from wordy_engine import WordyEngine, InvalidGuess, score_guess, CORRECT, PRESENT, ABSENT  # noqa: E402
+
+SHORT_WORDLIST = os.path.join(ROOT, 'short_wordlist.txt')
+LONG_WORDLIST = os.path.join(ROOT, 'long_wordlist.txt')
+BASELINE_FILENAME = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# Operations per timed run for each word length.  Long words have fewer
+# answers, so they get fewer hint positions and games.
+PARAMETER_SETS = {
+    5: {'guesses': 2000, 'pairs': 5000, 'batch_guesses': 50, 'filters': 200, 'hints': 20, 'games': 20},
+    8: {'guesses': 2000, 'pairs': 5000, 'batch_guesses': 50, 'filters': 200, 'hints': 20, 'games': 20},
+    12: {'guesses': 2000, 'pairs': 5000, 'batch_guesses': 100, 'filters': 200, 'hints': 10, 'games': 10},
+}
+CHECK_PAIRS = 3000      # scorer agreement checks per word length
+REFERENCE_LOOPS = 50000 # iterations of the reference loop timed before every run
+
+
+def original_feedback(guess, hidden_word):
+    """
+    Colors a guess the way the original color_change did: correct letters
+    first, then the other letters left to right, a repeated letter turning
+    grey once the hidden word has no copies of it left.
+    """
+    order = []
+    for i in range(len(hidden_word)):
+        if hidden_word[i] == guess[i]:
+            order.insert(0, i)
+        else:
+            order.append(i)
+
+    feedback = [ABSENT] * len(guess)
+    letters_guessed = []
+    for col in order:
+        letter = guess[col]
+        if letter == hidden_word[col]:
+            feedback[col] = CORRECT
+        elif letter in hidden_word:
+            if letters_guessed.count(letter) >= hidden_word.count(letter):
+                continue
+            feedback[col] = PRESENT
+        letters_guessed.append(letter)
+    return tuple(feedback)
+
+
+def reveal_order(feedback):
+    """ Returns the box order of get_order_of_letters: correct boxes first. """
+    order = []
+    for i in range(len(feedback)):
+        if feedback[i] == CORRECT:
+            order.insert(0, i)
+        else:
+            order.append(i)
+    return order
+
+
+def repeated_letter_pairs(guesses, answers, rng, count):
+    """ Returns (guess, answer) pairs where both words repeat a letter they share. """
+    repeated = [word for word in guesses if len(set(word)) < len(word)]
+    repeated_answers = [word for word in answers if len(set(word)) < len(word)] or list(answers)
+    pairs = []
+    while repeated and len(pairs) < count:
+        guess = rng.choice(repeated)
+        answer = rng.choice(repeated_answers)
+        if set(guess) & set(answer):
+            pairs.append((guess, answer))
+    return pairs
+
+
+def check_scoring(store, length, rng):
+    """ Raises AssertionError if the scorers disagree on any checked pair.  Returns the pairs checked. """
+    guesses = store.allowed_of_length(length)
+    answers = store.answers_of_length(length)
+    pairs = [(rng.choice(guesses), rng.choice(answers)) for _ in range(CHECK_PAIRS // 2)]
+    pairs += repeated_letter_pairs(guesses, answers, rng, CHECK_PAIRS // 2)
+    if length == 5:
+        pairs += [('eerie', 'lever'), ('level', 'lever'), ('speed', 'abide'), ('geese', 'those')]
+
+    for guess, answer in pairs:
+        expected = original_feedback(guess, answer)
+        engine = score_guess(guess, answer)
+        batch = decode(score_against(guess, word_array([answer], length))[0], length)
+        assert engine == expected, f'score_guess({guess!r}, {answer!r}) = {engine}, original {expected}'
+        assert tuple(batch) == expected, \
+            f'score_against({guess!r}, {answer!r}) = {batch}, original {expected}'
+    return len(pairs)
+
+
+def mutate(word, rng):
+    """ Returns the word with one letter replaced. """
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+
+
+class Context:
+    """ What the cases of one word length share: the store, word lists, parameters and seeded random. """
+
+    def __init__(self, store, length, params, seed, temp_dir):
+        """ Collects the shared state. """
+        self.store = store
+        self.length = length
+        self.params = params
+        self.rng = random.Random(seed * 1000 + length)
+        self.temp_dir = temp_dir
+        self.guesses = store.allowed_of_length(length)
+        self.answers = store.answers_of_length(length)
+
+    def played_constraints(self, turns):
+        """ Returns the constraints of games with a random hidden word after random guesses. """
+        constraints = []
+        for _ in range(self.params['filters']):
+            engine = WordyEngine(self.rng.choice(self.answers), 6, self.store, self.length)
+            for _ in range(turns):
+                engine.submit(self.rng.choice(self.guesses))
+            constraints.append(engine.constraints)
+        return constraints
+
+
+# Each case takes the Context and returns (function to time, operations per call)
+
+def case_load_cold(context):
+    """ Recompiles the cache file every run. """
+    cache_path = os.path.join(context.temp_dir, 'cold.wordcache')
+
+    def run():
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        compiled = word_cache.load_word_lists(SHORT_WORDLIST, LONG_WORDLIST, cache_path)
+        compiled.words(word_cache.SHORT, context.length)
+        compiled.words(word_cache.LONG, context.length)
+    return run, 1
+
+
+def case_load_warm(context):
+    """ Maps the up to date cache file every run. """
+    cache_path = os.path.join(context.temp_dir, 'warm.wordcache')
+    word_cache.load_word_lists(SHORT_WORDLIST, LONG_WORDLIST, cache_path)
+
+    def run():
+        compiled = word_cache.load_word_lists(SHORT_WORDLIST, LONG_WORDLIST, cache_path)
+        compiled.words(word_cache.SHORT, context.length)
+        compiled.words(word_cache.LONG, context.length)
+    return run, 1
+
+
+def case_validate(context):
+    """ Half words, half words with a letter changed (mostly not words). """
+    rng = context.rng
+    count = context.params['guesses']
+    guesses = [rng.choice(context.guesses) for _ in range(count // 2)]
+    guesses += [mutate(rng.choice(context.guesses), rng) for _ in range(count - len(guesses))]
+    rng.shuffle(guesses)
+    engine = WordyEngine(context.answers[0], 6, context.store, context.length)
+
+    def run():
+        for guess in guesses:
+            try:
+                engine.validate(guess)
+            except InvalidGuess:
+                pass
+    return run, len(guesses)
+
+
+def scoring_pairs(context):
+    """ Random pairs, half of them with repeated letters. """
+    rng = context.rng
+    count = context.params['pairs']
+    pairs = [(rng.choice(context.guesses), rng.choice(context.answers)) for _ in range(count // 2)]
+    return pairs + repeated_letter_pairs(context.guesses, context.answers, rng, count - len(pairs))
+
+
+def case_score_original(context):
+    """ The original coloring loop. """
+    pairs = scoring_pairs(context)
+
+    def run():
+        for guess, answer in pairs:
+            original_feedback(guess, answer)
+    return run, len(pairs)
+
+
+def case_score_engine(context):
+    """ What a submitted guess costs the game: scoring and the reveal order. """
+    pairs = scoring_pairs(context)
+
+    def run():
+        for guess, answer in pairs:
+            reveal_order(score_guess(guess, answer))
+    return run, len(pairs)
+
+
+def case_score_batch(context):
+    """ Vectorized scoring of guesses against the whole answer list. """
+    answer_codes = word_array(context.answers, context.length)
+    guesses = [context.rng.choice(context.guesses) for _ in range(context.params['batch_guesses'])]
+
+    def run():
+        for guess in guesses:
+            score_against(guess, answer_codes)
+    return run, len(guesses) * len(context.answers)
+
+
+def case_filter(context):
+    """ Remaining answers after one and after two random guesses. """
+    index = get_candidate_index(context.store, context.length)
+    constraints = context.played_constraints(1)[::2] + context.played_constraints(2)[::2]
+
+    def run():
+        for constraint in constraints:
+            index.filter(constraint)
+    return run, len(constraints)
+
+
+def case_hint(context):
+    """ Best guesses after one random guess, for positions with more than two answers left. """
+    solver = get_solver(context.store, context.length)
+    positions = []
+    for _ in range(context.params['hints'] * 20):
+        engine = WordyEngine(context.rng.choice(context.answers), 6, context.store, context.length)
+        engine.submit(context.rng.choice(context.guesses))
+        candidates = solver.answers.filter(engine.constraints)
+        # Positions with one or two answers left are answered without scoring
+        if candidates.bit_count() > 2:
+            positions.append(candidates)
+            if len(positions) == context.params['hints']:
+                break
+
+    def run():
+        for candidates in positions:
+            solver.best_guess(candidates)
+    return run, len(positions)
+
+
+def case_game(context):
+    """ Full games of the entropy strategy, the solver memo is cleared every run. """
+    hidden_words = [context.rng.choice(context.answers) for _ in range(context.params['games'])]
+    get_solver(context.store, context.length)
+
+    def run():
+        simulate._entropy_memo.clear()
+        for hidden_word in hidden_words:
+            simulate.play_game(hidden_word, simulate.entropy_strategy, context.store, 6, False, True)
+    return run, len(hidden_words)
+
+
+CASES = (('load.cold', case_load_cold), ('load.warm', case_load_warm), ('validate', case_validate),
+         ('score.original', case_score_original), ('score.engine', case_score_engine),
+         ('score.batch', case_score_batch), ('filter', case_filter), ('hint', case_hint),
+         ('game', case_game))
+
+
+def reference_us():
+    """ Returns the microseconds a fixed pure Python loop takes right now. """
+    start = time.perf_counter()
+    total = 0
+    for number in range(REFERENCE_LOOPS):
+        total += number * number % 7
+    return (time.perf_counter() - start) * 1e6
+
+
+def time_case(run, ops, repeat):
+    """
+    Returns median and min microseconds per operation over repeat timed
+    runs, after a warm-up run, and the min relative to the reference loop.
+    """
+    run()
+    times = []
+    relative = []
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            reference = min(reference_us() for _ in range(3))
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1e6 / ops)
+            relative.append(times[-1] / reference)
+    finally:
+        if collecting:
+            gc.enable()
+    return {'median_us': statistics.median(times), 'min_us': min(times), 'relative': min(relative),
+            'ops': ops, 'repeat': repeat}
+
+
+def environment():
+    """ Returns what the timings depend on besides the code. """
+    store = WordStore(SHORT_WORDLIST, LONG_WORDLIST)
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'processor': platform.processor(), 'cpus': os.cpu_count(), 'platform': platform.platform(),
+            'dictionary': store.fingerprint}
+
+
+def compare(results, baseline, threshold):
+    """ Returns (key, baseline min us, min us, relative change) for the cases slower than the threshold. """
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None or not before['relative']:
+            continue
+        change = result['relative'] / before['relative'] - 1
+        if change > threshold:
+            regressions.append((key, before['min_us'], result['min_us'], change))
+    return regressions
+
+
+def main(argv=None):
+    """ Runs the selected cases for each word length, then saves or compares with the baseline. """
+    parser = argparse.ArgumentParser(description='Benchmark suite for the core operations of the game.')
+    parser.add_argument('--lengths', type=int, nargs='+', default=sorted(PARAMETER_SETS))
+    parser.add_argument('--cases', nargs='+', help='case names or prefixes, such as load score.batch')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=BASELINE_FILENAME)
+    parser.add_argument('--save', action='store_true', help='save the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='flag cases this fraction slower than the baseline, after the reference loop')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    unknown = [length for length in args.lengths if length not in PARAMETER_SETS]
+    if unknown:
+        parser.error(f'no parameter set for word length {unknown}, choose from {sorted(PARAMETER_SETS)}')
+    wanted = args.cases or [name for name, _ in CASES]
+    cases = [(name, setup) for name, setup in CASES
+             if any(name == prefix or name.startswith(prefix + '.') for prefix in wanted)]
+
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            saved = json.load(baseline_file)
+        baseline = saved['results']
+        if saved['environment'] != environment():
+            print('note: the baseline was recorded on a different environment, compare with care')
+
+    store = WordStore(SHORT_WORDLIST, LONG_WORDLIST)
+    results = {}
+    print('%-6s %-15s %12s %12s %10s %9s' % ('length', 'case', 'median us', 'min us', 'ops', 'change'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for length in args.lengths:
+            checked = check_scoring(store, length, random.Random(args.seed))
+            print(f'length {length}: scorers agree on {checked} pairs')
+            for name, setup in cases:
+                context = Context(store, length, PARAMETER_SETS[length], args.seed, temp_dir)
+                key = f'{length}/{name}'
+                run, ops = setup(context)
+                if ops == 0:
+                    print('%-6d %-15s %12s' % (length, name, 'no input'))
+                    continue
+                result = results[key] = time_case(run, ops, args.repeat)
+                before = baseline.get(key)
+                change = ''
+                if before and before['relative']:
+                    change = '%+8.1f%%' % ((result['relative'] / before['relative'] - 1) * 100)
+                print('%-6d %-15s %12.3f %12.3f %10d %9s' % (length, name, result['median_us'],
+                                                            result['min_us'], ops, change))
+
+    report = {'environment': environment(), 'seed': args.seed, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    if args.save:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f'baseline saved to {args.baseline}')
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for key, before, after, change in regressions:
+        print(f'REGRESSION {key}: {before:.3f} us -> {after:.3f} us ({change * 100:+.1f}% relative)')
+    if baseline and not regressions:
+        print(f'no regressions above {args.threshold * 100:.0f}%')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
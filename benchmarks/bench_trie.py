@@ -0,0 +1,76 @@
+"""
+File: benchmarks/bench_trie.py
+Reports the size of the prefix DAWGs (word_trie.py) built from the long
+word list, one per word length, next to the frozensets used for guess
+validation, and times a keystroke (one child() step).
+
+Usage: python benchmarks/bench_trie.py [--word-size N]
+"""
+
+# Imports
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import word_cache  # noqa: E402
+from word_store import WordStore  # noqa: E402
+from word_trie import WordTrie, PrefixCursor  # noqa: E402
+
+SHORT_WORDLIST = os.path.join(ROOT, 'short_wordlist.txt')
+LONG_WORDLIST = os.path.join(ROOT, 'long_wordlist.txt')
+
+
+def set_footprint(words):
+    """ Approximate bytes held by a frozenset of the words and the strings in it. """
+    valid = frozenset(words)
+    return sys.getsizeof(valid) + sum(sys.getsizeof(word) for word in valid)
+
+
+def main(argv=None):
+    """ Builds every per-length DAWG and prints their sizes and keystroke cost. """
+    parser = argparse.ArgumentParser(description='Measure the prefix DAWGs.')
+    parser.add_argument('--word-size', type=int, default=5, help='word length used for the keystroke timing')
+    parser.add_argument('--keystrokes', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    store = WordStore(SHORT_WORDLIST, LONG_WORDLIST)
+    totals = {'words': 0, 'nodes': 0, 'edges': 0, 'bytes': 0, 'set_bytes': 0, 'seconds': 0.0}
+    print(f'{"length":>6} {"words":>7} {"nodes":>7} {"edges":>7} {"bytes":>9} {"set bytes":>10} {"build ms":>9}')
+    for length in store.compiled.lengths(word_cache.LONG):
+        words = store.allowed_of_length(length)
+        start = time.perf_counter()
+        trie = WordTrie(words)
+        seconds = time.perf_counter() - start
+        set_bytes = set_footprint(words)
+        print(f'{length:>6} {trie.word_count:>7} {trie.node_count:>7} {trie.edge_count:>7} '
+              f'{trie.memory_footprint():>9} {set_bytes:>10} {seconds * 1000:>9.1f}')
+        for name, value in (('words', trie.word_count), ('nodes', trie.node_count),
+                            ('edges', trie.edge_count), ('bytes', trie.memory_footprint()),
+                            ('set_bytes', set_bytes), ('seconds', seconds)):
+            totals[name] += value
+    print(f'{"all":>6} {totals["words"]:>7} {totals["nodes"]:>7} {totals["edges"]:>7} '
+          f'{totals["bytes"]:>9} {totals["set_bytes"]:>10} {totals["seconds"] * 1000:>9.1f}')
+
+    # Type random words letter by letter, backing up at the end of each one
+    trie = WordTrie(store.allowed_of_length(args.word_size))
+    cursor = PrefixCursor(trie)
+    words = random.choices(store.allowed_of_length(args.word_size), k=args.keystrokes // args.word_size)
+    start = time.perf_counter()
+    for word in words:
+        cursor.reset()
+        for letter in word:
+            cursor.push(letter)
+            cursor.allowed()
+    seconds = time.perf_counter() - start
+    print(f'keystroke (push + allowed) at length {args.word_size}: '
+          f'{seconds / (len(words) * args.word_size) * 1e6:.2f} us')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
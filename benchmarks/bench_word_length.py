@@ -0,0 +1,70 @@
+"""
+File: benchmarks/bench_word_length.py
+Measures what the first game of each word length costs: decoding the
+length from the word list cache, building the candidate index, computing
+the pattern matrix (cold, in a temporary directory) and solving the
+opening guess.  Long words have the largest pattern matrices.
+
+Usage: python benchmarks/bench_word_length.py [--lengths 5 8 9 12]
+"""
+
+# Imports
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scoring  # noqa: E402
+from candidates import CandidateIndex  # noqa: E402
+from solver import Solver  # noqa: E402
+from word_store import WordStore  # noqa: E402
+
+
+def elapsed_ms(start):
+    """ Returns the milliseconds since start. """
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv=None):
+    """ Times the first request of each word length and prints a table. """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--lengths', type=int, nargs='+', default=[5, 8, 9, 10, 12, 14])
+    args = parser.parse_args(argv)
+
+    store = WordStore(os.path.join(ROOT, 'short_wordlist.txt'), os.path.join(ROOT, 'long_wordlist.txt'))
+    print('%6s %8s %8s %10s %10s %12s %10s %10s' % ('length', 'guesses', 'answers', 'decode ms',
+                                                      'index ms', 'matrix ms', 'matrix MB', 'opening ms'))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for length in args.lengths:
+            start = time.perf_counter()
+            guesses = store.allowed_of_length(length)
+            answers = store.answers_of_length(length)
+            decode = elapsed_ms(start)
+            if not answers:
+                continue
+
+            start = time.perf_counter()
+            CandidateIndex(answers)
+            CandidateIndex(guesses)
+            index = elapsed_ms(start)
+
+            start = time.perf_counter()
+            patterns = scoring.load_pattern_matrix(guesses, answers, cache_dir)
+            matrix = elapsed_ms(start)
+
+            start = time.perf_counter()
+            solver = Solver(store, length)
+            solver.best_guess(solver.answers.full)
+            opening = elapsed_ms(start)
+
+            print('%6d %8d %8d %10.1f %10.1f %12.1f %10.1f %10.1f' % (
+                length, len(guesses), len(answers), decode, index, matrix,
+                patterns.matrix.nbytes / 1e6, opening))
+
+
+if __name__ == '__main__':
+    main()
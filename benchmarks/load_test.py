@@ -0,0 +1,152 @@
+"""
+File: benchmarks/load_test.py
+Load test of the Wordy game server (server.py).  Starts the server in its
+own process, opens N sessions so they are all alive at once, then plays
+them round by round over a pool of keep-alive HTTP connections and reports
+the p50/p99 latency of the guess requests.
+
+Usage: python benchmarks/load_test.py [--sessions 1000 10000] [--connections 100]
+       python benchmarks/load_test.py --url http://127.0.0.1:8080   (server already running)
+"""
+
+# Imports
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from word_store import get_word_store  # noqa: E402
+
+SHORT_WORDLIST = os.path.join(ROOT, 'short_wordlist.txt')
+LONG_WORDLIST = os.path.join(ROOT, 'long_wordlist.txt')
+
+
+class Connection:
+    """ One keep-alive HTTP connection to the server. """
+
+    def __init__(self, reader, writer):
+        """ Wraps an open stream pair. """
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method, path, payload=None):
+        """ Sends a request and returns (status, JSON payload). """
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.writer.write((f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+                           f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n')
+                          .encode() + body)
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode().partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+
+def percentile(values, fraction):
+    """ Returns the value below which the given fraction of the sorted values fall. """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_load(host, port, sessions, connections, guesses, words):
+    """ Opens the sessions, plays them and returns the guess latencies in milliseconds. """
+    pool = [Connection(*await asyncio.open_connection(host, port)) for _ in range(connections)]
+
+    async def worker(connection, jobs, results):
+        for job in jobs:
+            results.append(await job(connection))
+
+    async def spread(jobs):
+        """ Runs the jobs over the connection pool and returns their results. """
+        results = []
+        await asyncio.gather(*(worker(connection, jobs[i::connections], results)
+                               for i, connection in enumerate(pool)))
+        return results
+
+    # Every session is opened before any guess, so they are all alive together
+    async def start(connection):
+        status, state = await connection.request('POST', '/start', {'word_size': 5})
+        return state['session']
+    ids = await spread([start] * sessions)
+
+    latencies = []
+    playing = list(ids)
+    for _ in range(guesses):
+        def guess_job(session_id):
+            async def job(connection):
+                begin = time.perf_counter()
+                status, state = await connection.request(
+                    'POST', '/guess', {'session': session_id, 'guess': random.choice(words)})
+                latencies.append((time.perf_counter() - begin) * 1000)
+                return session_id if status == 200 and state['status'] == 'playing' else None
+            return job
+        playing = [session_id for session_id in await spread([guess_job(s) for s in playing])
+                   if session_id is not None]
+
+    status, stats = await pool[0].request('GET', '/stats')
+    for connection in pool:
+        connection.writer.close()
+    return latencies, stats
+
+
+def start_server():
+    """ Starts server.py on a free port and returns (process, port). """
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'server.py'), '--port', '0',
+                                '--short-wordlist', SHORT_WORDLIST, '--long-wordlist', LONG_WORDLIST],
+                               stdout=subprocess.PIPE, text=True, cwd=ROOT)
+    line = process.stdout.readline()
+    return process, int(line.rsplit(':', 1)[1])
+
+
+def main(argv=None):
+    """ Runs the load test for each session count and prints the latencies. """
+    parser = argparse.ArgumentParser(description='Load test the Wordy game server.')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--guesses', type=int, default=6, help='guesses per session')
+    parser.add_argument('--url', help='server to test instead of starting one')
+    args = parser.parse_args(argv)
+
+    words = list(get_word_store(SHORT_WORDLIST, LONG_WORDLIST).allowed_of_length(5))
+    for sessions in args.sessions:
+        process = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port
+        else:
+            process, port = start_server()
+            host = '127.0.0.1'
+        try:
+            begin = time.perf_counter()
+            latencies, stats = asyncio.run(run_load(host, port, sessions, args.connections,
+                                                    args.guesses, words))
+            elapsed = time.perf_counter() - begin
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+        latencies.sort()
+        print(f'{sessions} sessions, {len(latencies)} guesses in {elapsed:.2f}s '
+              f'({len(latencies) / elapsed:.0f} guesses/sec, {args.connections} connections)')
+        print(f'  guess latency p50 {percentile(latencies, 0.50):.2f} ms, '
+              f'p99 {percentile(latencies, 0.99):.2f} ms, mean {statistics.mean(latencies):.2f} ms')
+        print(f'  server sessions {stats["sessions"]}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+File: candidates.py
+Filtering of the answer list down to the words that are still consistent
+with the feedback so far.  A set of words is a Python int used as a bitset
+(bit w is word w).  For every position/letter pair, every letter and every
+letter count the matching words are precomputed once per word length, so
+applying a wordy_engine.Constraints object is a few dozen big-int ANDs.
+"""
+
+# Imports
+import threading
+import numpy as np
+from scoring import word_array
+
+
+def to_bitset(flags):
+    """ Returns the int bitset of a boolean NumPy array. """
+    return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+
+class CandidateIndex:
+    """ Precomputed word bitsets for a list of equal length words. """
+
+    def __init__(self, words):
+        """ Builds the per-position letter, letter presence and letter count bitsets. """
+        self.words = tuple(words)
+        self.word_size = len(self.words[0]) if self.words else 0
+        self.full = (1 << len(self.words)) - 1
+        codes = word_array(self.words, self.word_size)
+
+        # at[position][letter] is the set of words with letter at position
+        self.at = [[to_bitset(codes[:, position] == letter) for letter in range(26)]
+                   for position in range(self.word_size)]
+
+        # at_least[letter][n] is the set of words holding at least n copies of letter
+        counts = np.zeros((len(self.words), 26), dtype=np.uint8)
+        for position in range(self.word_size):
+            counts[np.arange(len(self.words)), codes[:, position]] += 1
+        self.at_least = [[to_bitset(counts[:, letter] >= n) for n in range(self.word_size + 2)]
+                         for letter in range(26)]
+
+    def filter(self, constraints, within=None):
+        """
+        Returns the bitset of words consistent with the constraints, only
+        looking at the words in the within bitset when it is given.
+        """
+        bits = self.full if within is None else within
+
+        excluded = constraints.excluded
+        while excluded:
+            letter = (excluded & -excluded).bit_length() - 1
+            bits &= ~self.at_least[letter][1]
+            excluded &= excluded - 1
+
+        for position in range(self.word_size):
+            letter = constraints.fixed[position]
+            if letter is not None:
+                bits &= self.at[position][ord(letter) - ord('a')]
+                continue
+            banned = constraints.banned[position]
+            while banned:
+                letter = (banned & -banned).bit_length() - 1
+                bits &= ~self.at[position][letter]
+                banned &= banned - 1
+
+        for letter in range(26):
+            if constraints.min_count[letter]:
+                bits &= self.at_least[letter][constraints.min_count[letter]]
+            if 0 < constraints.max_count[letter] < self.word_size:
+                bits &= ~self.at_least[letter][constraints.max_count[letter] + 1]
+
+        return bits
+
+    def filter_hard_mode(self, constraints):
+        """ Returns the bitset of words that use every revealed hint, as hard mode requires. """
+        bits = self.full
+        for position in range(self.word_size):
+            letter = constraints.fixed[position]
+            if letter is not None:
+                bits &= self.at[position][ord(letter) - ord('a')]
+        for letter, minimum in constraints.required.items():
+            bits &= self.at_least[ord(letter) - ord('a')][minimum]
+        return bits
+
+    def indexes(self, bits):
+        """ Returns the sorted word indexes in a bitset as a NumPy array. """
+        data = np.frombuffer(bits.to_bytes((len(self.words) + 7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(data, bitorder='little'))
+
+    def words_in(self, bits, limit=None):
+        """ Returns the words of a bitset in list order, at most limit of them. """
+        indexes = self.indexes(bits)
+        if limit is not None:
+            indexes = indexes[:limit]
+        return [self.words[i] for i in indexes]
+
+
+def count(bits):
+    """ Returns the number of words in a bitset. """
+    return bits.bit_count()
+
+
+# Indexes already built in this process, keyed by store and word length
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_candidate_index(word_store, word_size, guesses=False):
+    """
+    Returns the CandidateIndex over the short list words of one length, or
+    over the long list words when guesses is True.
+    """
+    key = (id(word_store), word_size, guesses)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            if guesses:
+                index = CandidateIndex(word_store.allowed_of_length(word_size))
+            else:
+                index = CandidateIndex(word_store.answers_of_length(word_size))
+            _indexes[key] = index
+        return index
@@ -0,0 +1,237 @@
+"""
+File: dictionary_loader.py
+Loader for custom dictionaries.  Two source files (answers and allowed
+guesses, plain text or gzip, one entry per line) are streamed line by line:
+
+    normalize   Unicode NFKD, accents dropped, case folded, so "Éclair"
+                becomes "eclair".  Entries that are not letters A to Z
+                afterwards (digits, spaces, hyphens, other scripts) cannot be
+                typed on the keyboard and are skipped.
+    dedup       words are collected in sorted runs of at most RUN_SIZE words.
+                Full runs are spilled to temporary files and merged at the
+                end, so memory does not grow with the size of the input.
+    check       every answer must also be an allowed guess.  Answers missing
+                from the allowed list are an error, or are added to it with
+                --add-missing.
+
+The cleaned lists are written as text files (one word per line, sorted) and
+compiled into the word list cache of word_cache.py, so the game opens them
+straight from the cache.
+
+Usage: python dictionary_loader.py ANSWERS ALLOWED [--short-out FILE] [--long-out FILE]
+Then:  python Wordy.py --short-wordlist FILE --long-wordlist FILE
+"""
+
+# Imports
+import argparse
+import gzip
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unicodedata
+import word_cache
+
+RUN_SIZE = 1000000      # most distinct words held in memory before a run is spilled
+SHORT_OUTPUT_FILENAME = 'custom_short_wordlist.txt'
+LONG_OUTPUT_FILENAME = 'custom_long_wordlist.txt'
+MISSING_SHOWN = 10      # missing answers named in the error message
+
+
+def normalize(entry):
+    """ Returns an entry as lowercase letters a to z, or None if it cannot be typed. """
+    word = entry.strip()
+    if not word.isascii():
+        # Split accented letters into letter and accent, then drop the accents
+        word = unicodedata.normalize('NFKD', word)
+        word = ''.join(character for character in word if not unicodedata.combining(character))
+    word = word.casefold()
+    if word.isascii() and word.isalpha():
+        return word
+    return None
+
+
+def open_text(path, encoding='utf-8'):
+    """ Opens a text or gzip file for reading lines, undecodable bytes are replaced. """
+    with open(path, 'rb') as source:
+        compressed = source.read(2) == b'\x1f\x8b'
+    if compressed:
+        return gzip.open(path, 'rt', encoding=encoding, errors='replace')
+    return open(path, 'r', encoding=encoding, errors='replace')
+
+
+class SortedDeduplicator:
+    """ Collects words and returns them sorted and without duplicates in bounded memory. """
+
+    def __init__(self, run_size=RUN_SIZE):
+        """ Starts with no words. """
+        self.run_size = run_size
+        self.pending = set()
+        self.runs = []
+        self.temp_dir = None
+
+    def add(self, word):
+        """ Adds a word, spilling the pending words to a run file when there are run_size of them. """
+        self.pending.add(word)
+        if len(self.pending) >= self.run_size:
+            self.spill()
+
+    def spill(self):
+        """ Writes the pending words to a sorted run file. """
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.mkdtemp(prefix='wordy_dictionary_')
+        path = os.path.join(self.temp_dir, 'run%d.txt' % len(self.runs))
+        with open(path, 'w', encoding='ascii') as run_file:
+            run_file.writelines(word + '\n' for word in sorted(self.pending))
+        self.runs.append(path)
+        self.pending = set()
+
+    def __iter__(self):
+        """ Yields every distinct word in sorted order, merging the runs. """
+        run_files = [open(path, 'r', encoding='ascii') for path in self.runs]
+        try:
+            streams = [(line.rstrip('\n') for line in run_file) for run_file in run_files]
+            previous = None
+            for word in heapq.merge(sorted(self.pending), *streams):
+                if word != previous:
+                    yield word
+                    previous = word
+        finally:
+            for run_file in run_files:
+                run_file.close()
+
+    def close(self):
+        """ Removes the run files. """
+        if self.temp_dir is not None:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+        self.runs = []
+
+
+def read_entries(path, deduplicator, encoding='utf-8'):
+    """ Streams a source file into a deduplicator.  Returns (lines read, entries skipped). """
+    lines = skipped = 0
+    with open_text(path, encoding) as source:
+        for entry in source:
+            lines += 1
+            word = normalize(entry)
+            if word is None:
+                if entry.strip():
+                    skipped += 1
+                continue
+            deduplicator.add(word)
+    return lines, skipped
+
+
+def merge_lists(answers, allowed, add_missing, missing):
+    """
+    Walks the sorted answers and allowed words together.  Yields the allowed
+    words (with the missing answers when add_missing) and appends the
+    answers that are not allowed to the missing list.
+    """
+    answers = iter(answers)
+    answer = next(answers, None)
+    for word in allowed:
+        while answer is not None and answer < word:
+            missing.append(answer)
+            if add_missing:
+                yield answer
+            answer = next(answers, None)
+        if answer == word:
+            answer = next(answers, None)
+        yield word
+    while answer is not None:
+        missing.append(answer)
+        if add_missing:
+            yield answer
+        answer = next(answers, None)
+
+
+def write_words(path, words):
+    """ Writes words one per line to a temporary file next to path.  Returns (temp path, count). """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + '.tmp%d' % os.getpid()
+    count = 0
+    with open(temp_path, 'w', encoding='ascii') as output:
+        for word in words:
+            output.write(word + '\n')
+            count += 1
+    return temp_path, count
+
+
+def load_dictionary(answers_path, allowed_path, short_out=SHORT_OUTPUT_FILENAME,
+                    long_out=LONG_OUTPUT_FILENAME, add_missing=False, run_size=RUN_SIZE, encoding='utf-8'):
+    """
+    Normalizes and deduplicates two source files into the word list files
+    short_out and long_out and compiles their cache.  Raises ValueError,
+    without writing anything, if answers are missing from the allowed
+    guesses and add_missing is False.  Returns a report dictionary.
+    """
+    answers = SortedDeduplicator(run_size)
+    allowed = SortedDeduplicator(run_size)
+    temp_paths = []
+    missing = []
+    try:
+        answer_lines, answer_skipped = read_entries(answers_path, answers, encoding)
+        allowed_lines, allowed_skipped = read_entries(allowed_path, allowed, encoding)
+
+        # Both lists come out sorted, so the subset check is one merge pass
+        short_temp, answer_count = write_words(short_out, answers)
+        temp_paths.append(short_temp)
+        with open(short_temp, 'r', encoding='ascii') as written:
+            long_temp, allowed_count = write_words(long_out, merge_lists(
+                (line.rstrip('\n') for line in written), allowed, add_missing, missing))
+        temp_paths.append(long_temp)
+
+        if missing and not add_missing:
+            raise ValueError('%d answers are not allowed guesses (%s), use --add-missing to add them'
+                             % (len(missing), ', '.join(missing[:MISSING_SHOWN])))
+        os.replace(short_temp, short_out)
+        os.replace(long_temp, long_out)
+        temp_paths = []
+    finally:
+        answers.close()
+        allowed.close()
+        for temp_path in temp_paths:
+            os.remove(temp_path)
+
+    # Compile the cache the game loads the lists from
+    word_cache.load_word_lists(short_out, long_out)
+    return {'answers': answer_count, 'allowed': allowed_count,
+            'lines': answer_lines + allowed_lines, 'skipped': answer_skipped + allowed_skipped,
+            'missing_added': len(missing), 'cache': word_cache.default_cache_path(short_out, long_out)}
+
+
+def main(argv=None):
+    """ Parses the command line and loads the dictionary. """
+    parser = argparse.ArgumentParser(description='Build Wordy word lists from a custom dictionary.')
+    parser.add_argument('answers', help='hidden word candidates, text or gzip, one per line')
+    parser.add_argument('allowed', help='allowed guesses, text or gzip, one per line')
+    parser.add_argument('--short-out', default=SHORT_OUTPUT_FILENAME)
+    parser.add_argument('--long-out', default=LONG_OUTPUT_FILENAME)
+    parser.add_argument('--add-missing', action='store_true',
+                        help='add answers that are not allowed guesses to the allowed list')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--run-size', type=int, default=RUN_SIZE,
+                        help='distinct words kept in memory before spilling to disk')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        report = load_dictionary(args.answers, args.allowed, args.short_out, args.long_out,
+                                 args.add_missing, args.run_size, args.encoding)
+    except ValueError as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 1
+    print(f"{report['lines']} lines read, {report['skipped']} skipped, "
+          f"{report['answers']} answers, {report['allowed']} allowed guesses "
+          f"({report['missing_added']} answers added), {time.perf_counter() - start:.2f}s")
+    print(f"cache: {report['cache']}")
+    print(f'play with: python Wordy.py --short-wordlist {args.short_out} --long-wordlist {args.long_out}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+File: difficulty.py
+Per-answer difficulty index.  An offline pass plays every answer of a word
+length with the entropy solver (through simulate.run, so it uses the worker
+processes) and combines the number of guesses it needed with how rare the
+word's letters are.  The answers are written to a small binary index file
+sorted from easiest to hardest:
+
+    header      magic, word length, word count, sha1 of the word lists
+    records     word (ASCII), solver guesses (uint8), score (float32)
+
+Easy, Medium and Hard are the first, middle and last third of the records,
+so a word is drawn from a pool by reading one random record.  Each word
+length and pair of word list files has its own index file.  Solver results
+are kept between runs, also when the lists change, and only answers that
+are new to the index are played again.
+
+Usage: python difficulty.py [--word-size 5 6 ...] [--workers N]
+"""
+
+# Imports
+import argparse
+import hashlib
+import math
+import os
+import random
+import struct
+import sys
+import time
+import simulate
+from scoring import DEFAULT_CACHE_DIR
+from solver import get_solver
+from word_store import get_word_store
+
+MAGIC = b'WORDYDF1'
+LEVELS = ('Easy', 'Medium', 'Hard')
+RARITY_WEIGHT = 0.25    # score added per bit of average letter rarity
+
+_HEADER = struct.Struct('<8sHI20s')
+
+
+def index_path(word_store, word_size, cache_dir=None):
+    """ Returns the index file of one word length, named after the word list files of the store. """
+    key = (os.path.abspath(word_store.short_filename) + '\0' + os.path.abspath(word_store.long_filename)).encode()
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR,
+                        f'difficulty_{word_size}_{hashlib.sha1(key).hexdigest()[:16]}.idx')
+
+
+def letter_rarity(words):
+    """ Returns {word: average -log2 frequency of its letters} over a list of words. """
+    counts = {}
+    for word in words:
+        for letter in word:
+            counts[letter] = counts.get(letter, 0) + 1
+    total = sum(counts.values())
+    return {word: sum(-math.log2(counts[letter] / total) for letter in word) / len(word)
+            for word in words}
+
+
+class DifficultyIndex:
+    """ Read-only view of an index file, records sorted from easiest to hardest. """
+
+    def __init__(self, data):
+        """ Parses the header of the file bytes. """
+        magic, self.word_size, self.count, self.fingerprint = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError('not a Wordy difficulty index')
+        self.data = data
+        self.record = struct.Struct(f'<{self.word_size}sBf')
+
+    def entry(self, position):
+        """ Returns (word, guesses, score) of the record at a position. """
+        word, guesses, score = self.record.unpack_from(self.data, _HEADER.size + position * self.record.size)
+        return word.decode('ascii'), guesses, score
+
+    def entries(self):
+        """ Returns every (word, guesses, score) record, easiest first. """
+        return [self.entry(position) for position in range(self.count)]
+
+    def bounds(self, level):
+        """ Returns the record range (start, stop) of Easy, Medium or Hard. """
+        level = LEVELS.index(level)
+        return self.count * level // len(LEVELS), self.count * (level + 1) // len(LEVELS)
+
+    def draw(self, level, rng=random):
+        """ Returns a random word of a level in O(1). """
+        start, stop = self.bounds(level)
+        return self.entry(rng.randrange(start, stop))[0]
+
+
+def write_index(path, word_size, fingerprint, entries):
+    """ Atomically writes (word, guesses, score) entries sorted by score. """
+    record = struct.Struct(f'<{word_size}sBf')
+    entries = sorted(entries, key=lambda entry: (entry[2], entry[0]))
+    data = bytearray(_HEADER.pack(MAGIC, word_size, len(entries), bytes.fromhex(fingerprint)))
+    for word, guesses, score in entries:
+        data += record.pack(word.encode('ascii'), guesses, score)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp%d' % os.getpid()
+    with open(temp_path, 'wb') as index_file:
+        index_file.write(data)
+    os.replace(temp_path, path)
+
+
+def read_index(path):
+    """ Returns the DifficultyIndex in a file, or None if there is no usable one. """
+    try:
+        with open(path, 'rb') as index_file:
+            return DifficultyIndex(index_file.read())
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+class _Collector:
+    """ Result writer for simulate.run that keeps the guesses of each game. """
+
+    def __init__(self):
+        """ Starts empty. """
+        self.guesses = {}
+
+    def write(self, result):
+        """ Records one game, a lost game counts as one guess more than allowed. """
+        self.guesses[result['hidden_word']] = result['guesses'] if result['won'] else result['guesses'] + 1
+
+
+def build_index(word_store, word_size, workers=1, num_guesses=6, cache_dir=None, chunk_size=32):
+    """
+    Brings the index of one word length up to date with the word store and
+    returns (index, number of answers played).  Only answers without a
+    solver result in the previous index are played.
+    """
+    path = index_path(word_store, word_size, cache_dir)
+    answers = word_store.answers_of_length(word_size)
+    previous = read_index(path)
+    known = {word: guesses for word, guesses, _ in previous.entries()} if previous is not None else {}
+    new = [word for word in answers if word not in known]
+
+    if new:
+        settings = {'short': word_store.short_filename, 'long': word_store.long_filename,
+                    'strategy': 'entropy', 'num_guesses': num_guesses, 'hard_mode': False,
+                    'be_words': True, 'seed': 0}
+        # Build the shared pattern matrix before forking so workers map the
+        # saved file, the workers score their games serially (see simulate.py)
+        get_solver(word_store, word_size)
+        collector = _Collector()
+        simulate.run(new, settings, workers, chunk_size, collector)
+        known.update(collector.guesses)
+
+    # Rarity depends on the whole answer list, so every score is recomputed
+    rarity = letter_rarity(answers)
+    entries = [(word, known[word], known[word] + RARITY_WEIGHT * rarity[word]) for word in answers]
+    write_index(path, word_size, word_store.fingerprint, entries)
+    return read_index(path), len(new)
+
+
+# Indexes already read in this process, keyed by word store and length
+_indexes = {}
+
+
+def get_difficulty_index(word_store, word_size, cache_dir=None):
+    """ Returns the index of one word length if it was built for this word store, else None. """
+    key = (id(word_store), word_size, cache_dir)
+    index = _indexes.get(key)
+    if index is None:
+        index = read_index(index_path(word_store, word_size, cache_dir))
+        if index is None or index.fingerprint.hex() != word_store.fingerprint or \
+                index.word_size != word_size:
+            return None
+        _indexes[key] = index
+    return index
+
+
+def main(argv=None):
+    """ Parses the command line and builds the indexes. """
+    parser = argparse.ArgumentParser(description='Build the answer difficulty indexes.')
+    parser.add_argument('--word-size', type=int, nargs='+', default=[5])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--short-wordlist', default=simulate.SHORT_WORDLIST_FILENAME)
+    parser.add_argument('--long-wordlist', default=simulate.LONG_WORDLIST_FILENAME)
+    args = parser.parse_args(argv)
+
+    word_store = get_word_store(args.short_wordlist, args.long_wordlist)
+    for word_size in args.word_size:
+        start = time.perf_counter()
+        index, played = build_index(word_store, word_size, args.workers)
+        elapsed = time.perf_counter() - start
+        print(f'length {word_size}: {index.count} answers, {played} played, {elapsed:.2f}s '
+              f'-> {index_path(word_store, word_size)}')
+        for level in LEVELS:
+            start, stop = index.bounds(level)
+            if stop > start:
+                scores = [index.entry(position) for position in (start, stop - 1)]
+                print(f'  {level:<6} {stop - start:>5} words, '
+                      f'{scores[0][0]} ({scores[0][2]:.2f}) to {scores[1][0]} ({scores[1][2]:.2f})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
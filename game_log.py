@@ -0,0 +1,325 @@
+"""
+File: game_log.py
+Event log of a game.  Every key the engine is given is appended to a small
+binary file as one byte, so the game in progress survives a crash or Quit
+and can be rebuilt by replaying the keys through a headless engine.
+
+Layout of a log file:
+    header      magic, word length, guesses allowed, boards, flags,
+                difficulty, sha1 of the word lists, start time, then the
+                hidden word of each board as ASCII (none in adversarial mode)
+    events      one byte per key: 0 to 25 for A to Z, 26 ENTER, 27 BACK
+    end         one byte telling how the game ended: won, lost, or
+                abandoned when a new game was started
+
+Each key is a single unbuffered os.write, which reaches the operating system
+(and survives the process) without an fsync.  The log of the game being
+played is CURRENT_FILENAME, finished logs are moved to ARCHIVE_DIRNAME.
+Verifying a log replays it and checks that it ends the way it was logged
+and that every feedback matches the reference scorer.
+
+Usage: python game_log.py verify [FILE or DIRECTORY ...]
+"""
+
+# Imports
+import argparse
+import os
+import struct
+import sys
+import time
+from adversary import AdversarialEngine
+from difficulty import LEVELS
+from multiboard import MultiBoardEngine
+from scoring import DEFAULT_CACHE_DIR
+from word_store import get_word_store
+from wordy_engine import WordyEngine, InvalidGuess, score_guess, PLAYING, WON, LOST
+
+MAGIC = b'WORDYGL1'
+CURRENT_FILENAME = 'current_game.wgl'
+ARCHIVE_DIRNAME = 'game_logs'
+ENTER, BACK = 26, 27
+END_WON, END_LOST, END_ABANDONED = 253, 254, 255
+OUTCOMES = {END_WON: WON, END_LOST: LOST, END_ABANDONED: PLAYING}
+END_CODES = {status: code for code, status in OUTCOMES.items()}
+DIFFICULTIES = ('Any',) + LEVELS
+
+# Flag bits of the header
+HARD_MODE, MUST_BE_WORDS, ADVERSARIAL, SPECIFY_WORD = 1, 2, 4, 8
+
+_HEADER = struct.Struct('<8sBBBBB20sd')
+
+
+def current_path(cache_dir=None):
+    """ Returns the log file of the game being played. """
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, CURRENT_FILENAME)
+
+
+def archive_dir(cache_dir=None):
+    """ Returns the directory finished logs are moved to. """
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, ARCHIVE_DIRNAME)
+
+
+def key_code(key):
+    """ Returns the event byte of a keyboard button name (A to Z, ENTER or BACK). """
+    if key == 'ENTER':
+        return ENTER
+    if key == 'BACK':
+        return BACK
+    return ord(key.upper()) - ord('A')
+
+
+class LogHeader:
+    """ Settings of a logged game. """
+
+    __slots__ = ('word_size', 'num_guesses', 'hidden_words', 'hard_mode', 'guesses_must_be_words',
+                 'adversarial', 'specify_word', 'difficulty', 'fingerprint', 'started')
+
+    def __init__(self, word_size, num_guesses, hidden_words, hard_mode=False, guesses_must_be_words=True,
+                 adversarial=False, specify_word=False, difficulty='Any', fingerprint='', started=None):
+        """ Keeps the settings, hidden_words is empty in adversarial mode. """
+        self.word_size = word_size
+        self.num_guesses = num_guesses
+        self.hidden_words = list(hidden_words)
+        self.hard_mode = hard_mode
+        self.guesses_must_be_words = guesses_must_be_words
+        self.adversarial = adversarial
+        self.specify_word = specify_word
+        self.difficulty = difficulty
+        self.fingerprint = fingerprint
+        self.started = time.time() if started is None else started
+
+    def pack(self):
+        """ Returns the header bytes.  Raises ValueError if a hidden word is not letters a to z. """
+        words = ''.join(self.hidden_words)
+        if words and not (words.isascii() and words.isalpha()):
+            raise ValueError('hidden words must be letters a to z')
+        flags = (HARD_MODE * self.hard_mode | MUST_BE_WORDS * self.guesses_must_be_words |
+                 ADVERSARIAL * self.adversarial | SPECIFY_WORD * self.specify_word)
+        fingerprint = bytes.fromhex(self.fingerprint) if self.fingerprint else bytes(20)
+        return _HEADER.pack(MAGIC, self.word_size, self.num_guesses, len(self.hidden_words), flags,
+                            DIFFICULTIES.index(self.difficulty), fingerprint, self.started) + \
+            words.encode('ascii')
+
+    @classmethod
+    def unpack(cls, data):
+        """ Returns (header, offset of the first event).  Raises ValueError if data is not a game log. """
+        try:
+            magic, word_size, num_guesses, boards, flags, difficulty, fingerprint, started = \
+                _HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise ValueError('game log is truncated') from None
+        if magic != MAGIC:
+            raise ValueError('not a Wordy game log')
+        end = _HEADER.size + boards * word_size
+        words = bytes(data[_HEADER.size:end])
+        if len(words) != boards * word_size or words and not words.isalpha() or \
+                difficulty >= len(DIFFICULTIES):
+            raise ValueError('game log header is damaged')
+        words = words.decode('ascii')
+        hidden_words = [words[i:i + word_size] for i in range(0, len(words), word_size)]
+        return cls(word_size, num_guesses, hidden_words, bool(flags & HARD_MODE), bool(flags & MUST_BE_WORDS),
+                   bool(flags & ADVERSARIAL), bool(flags & SPECIFY_WORD), DIFFICULTIES[difficulty],
+                   fingerprint.hex(), started), end
+
+    def new_engine(self, word_store):
+        """ Returns a new engine for the logged settings. """
+        if self.adversarial:
+            return AdversarialEngine(word_store, self.word_size, self.num_guesses,
+                                     self.guesses_must_be_words, self.hard_mode)
+        if len(self.hidden_words) > 1:
+            return MultiBoardEngine(self.hidden_words, self.num_guesses, word_store, self.word_size,
+                                    self.guesses_must_be_words, self.hard_mode)
+        return WordyEngine(self.hidden_words[0], self.num_guesses, word_store, self.word_size,
+                           self.guesses_must_be_words, self.hard_mode)
+
+
+class GameLog:
+    """ Appends the keys of the game being played to its log file. """
+
+    def __init__(self, header, path=None):
+        """
+        Starts the log of a new game, ending and archiving the log of any
+        previous game.  The header is packed first, so a header that cannot
+        be written leaves the previous log alone.
+        """
+        data = header.pack()
+        self.path = path or current_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if os.path.exists(self.path):
+            archive(self.path)
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        os.write(self.fd, data)
+
+    @classmethod
+    def reopen(cls, path=None):
+        """ Continues the log of a resumed game. """
+        log = cls.__new__(cls)
+        log.path = path or current_path()
+        log.fd = os.open(log.path, os.O_WRONLY | os.O_APPEND)
+        return log
+
+    def append(self, key):
+        """ Logs one key with a single write. """
+        os.write(self.fd, bytes((key_code(key),)))
+
+    def close(self):
+        """ Closes the file and leaves the log to be resumed. """
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def finish(self, status):
+        """ Ends the log with the status the game ended with and moves it to the archive. """
+        if self.fd is not None:
+            os.write(self.fd, bytes((END_CODES[status],)))
+            self.close()
+            archive(self.path)
+
+
+def archive(path):
+    """ Ends a log file as abandoned if it has no end and moves it to the archive.  Returns the new path. """
+    with open(path, 'rb') as log_file:
+        data = log_file.read()
+    try:
+        header, offset = LogHeader.unpack(data)
+        started = header.started
+    except ValueError:
+        offset, started = len(data), time.time()
+    if len(data) == offset or data[-1] not in OUTCOMES:
+        with open(path, 'ab') as log_file:
+            log_file.write(bytes((END_ABANDONED,)))
+
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), ARCHIVE_DIRNAME)
+    os.makedirs(directory, exist_ok=True)
+    name = '%d-%d' % (int(started * 1000), os.getpid())
+    target = os.path.join(directory, name + '.wgl')
+    copy = 1
+    while os.path.exists(target):
+        target = os.path.join(directory, '%s-%d.wgl' % (name, copy))
+        copy += 1
+    os.replace(path, target)
+    return target
+
+
+def replay(data, word_store):
+    """
+    Rebuilds a game from the bytes of its log.  Returns (header, engine,
+    outcome, late): outcome is the status the end of the log records (None
+    if the log has no end yet) and late counts the keys logged after the
+    game was over.  Raises ValueError if the log is not a valid game log.
+    """
+    header, offset = LogHeader.unpack(data)
+    engine = header.new_engine(word_store)
+    late = 0
+    for position in range(offset, len(data)):
+        code = data[position]
+        if code in OUTCOMES:
+            if position != len(data) - 1:
+                raise ValueError('events after the end of the log')
+            return header, engine, OUTCOMES[code], late
+        if engine.status != PLAYING:
+            late += 1
+        if code == ENTER:
+            try:
+                engine.submit()
+            except InvalidGuess:
+                pass
+        elif code == BACK:
+            engine.delete_letter()
+        elif code < 26:
+            engine.type_letter(chr(ord('a') + code))
+        else:
+            raise ValueError(f'unknown event {code} at byte {position}')
+    return header, engine, None, late
+
+
+def load_current(word_store, path=None):
+    """ Returns (header, engine) of the game in the current log, or None if there is none to resume. """
+    path = path or current_path()
+    try:
+        with open(path, 'rb') as log_file:
+            data = log_file.read()
+        header, engine, outcome, _ = replay(data, word_store)
+    except (OSError, ValueError):
+        return None
+    if outcome is not None or header.fingerprint != word_store.fingerprint:
+        return None
+    return header, engine
+
+
+def verify(data, word_store):
+    """
+    Replays a log and checks it.  Returns a dictionary with the final
+    status, the number of guesses and a list of problems found: a replay
+    that does not end the way the log says, feedback that differs from
+    scoring the guess again, a game still going on after its last allowed
+    guess, keys after the game ended or a missing end.
+    """
+    try:
+        header, engine, outcome, late = replay(data, word_store)
+    except ValueError as error:
+        return {'status': None, 'guesses': 0, 'errors': [str(error)]}
+    errors = []
+    if header.fingerprint != word_store.fingerprint:
+        errors.append('logged with different word lists')
+
+    # Check every board's feedback with the reference scorer
+    boards = getattr(engine, 'boards', [engine])
+    for b, board in enumerate(boards):
+        for guess, feedback in zip(board.guesses, board.feedback):
+            if tuple(feedback) != score_guess(guess, board.hidden_word):
+                errors.append(f'board {b + 1}: wrong feedback for {guess}')
+        if board.status == WON and board.guesses[-1] != board.hidden_word:
+            errors.append(f'board {b + 1}: won without guessing {board.hidden_word}')
+    if engine.status == PLAYING and len(engine.guesses) >= engine.num_guesses:
+        errors.append('still playing after the last guess')
+    if late:
+        errors.append(f'{late} keys after the game ended')
+    if outcome is None:
+        errors.append('log has no end')
+    elif outcome != engine.status:
+        errors.append(f'logged as {outcome}, replays as {engine.status}')
+    return {'status': engine.status, 'guesses': len(engine.guesses), 'errors': errors}
+
+
+def log_paths(paths):
+    """ Yields the log files among the given files and directories. """
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.wgl'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def main(argv=None):
+    """ Parses the command line and verifies the logs. """
+    parser = argparse.ArgumentParser(description='Replay and check Wordy game logs.')
+    parser.add_argument('command', choices=('verify',))
+    parser.add_argument('paths', nargs='*', help='log files or directories (default: the archive)')
+    parser.add_argument('--short-wordlist', default='short_wordlist.txt')
+    parser.add_argument('--long-wordlist', default='long_wordlist.txt')
+    args = parser.parse_args(argv)
+
+    word_store = get_word_store(args.short_wordlist, args.long_wordlist)
+    start = time.perf_counter()
+    totals = {WON: 0, LOST: 0, PLAYING: 0}
+    checked = failed = 0
+    for path in log_paths(args.paths or [archive_dir()]):
+        with open(path, 'rb') as log_file:
+            result = verify(log_file.read(), word_store)
+        checked += 1
+        if result['errors']:
+            failed += 1
+            print(f"{path}: {'; '.join(result['errors'])}")
+        else:
+            totals[result['status']] += 1
+    elapsed = time.perf_counter() - start
+    print(f'{checked} logs checked in {elapsed:.2f}s, {failed} with problems, '
+          f'{totals[WON]} won, {totals[LOST]} lost, {totals[PLAYING]} abandoned')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
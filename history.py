@@ -0,0 +1,193 @@
+"""
+File: history.py
+Append-only record of every finished game: the settings, hidden word,
+guesses, feedback and timings.  Games are kept in a SQLite file in WAL mode.
+record() only updates the in-memory statistics and puts the game on a
+queue, and a writer thread appends whatever has queued up in one
+transaction, so the Tk thread never waits for the disk.
+
+The statistics (games played, wins, guess distribution, streaks) are
+aggregates updated with each game and stored next to the games in the same
+transaction.  Reading them never scans the history.
+"""
+
+# Imports
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from scoring import DEFAULT_CACHE_DIR
+
+HISTORY_FILENAME = 'history.sqlite'
+MAX_BATCH = 256     # most games appended in one transaction
+
+_STOP = object()
+
+
+def empty_stats():
+    """ Returns the statistics of a history without games. """
+    return {'games': 0, 'wins': 0, 'streak': 0, 'best_streak': 0, 'distribution': {}}
+
+
+def add_game(stats, won, guesses):
+    """ Updates the statistics with one finished game. """
+    stats['games'] += 1
+    if won:
+        stats['wins'] += 1
+        stats['streak'] += 1
+        stats['best_streak'] = max(stats['best_streak'], stats['streak'])
+        key = str(guesses)
+        stats['distribution'][key] = stats['distribution'].get(key, 0) + 1
+    else:
+        stats['streak'] = 0
+
+
+def encode_feedback(feedback):
+    """ Returns the feedback of a guess as a digit string, or a list of them (None for solved boards). """
+    if any(value is None or isinstance(value, (list, tuple)) for value in feedback):
+        return [encode_feedback(board) if board is not None else None for board in feedback]
+    return ''.join(str(int(value)) for value in feedback)
+
+
+class GameHistory:
+    """ Game history in a SQLite file with a background writer and live statistics. """
+
+    def __init__(self, path=None):
+        """ Opens (or creates) the history and loads the stored statistics. """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, HISTORY_FILENAME)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+
+        connection = self.connect()
+        connection.execute('CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, finished_at REAL, '
+                           'settings TEXT, hidden_word TEXT, won INTEGER, guesses TEXT, feedback TEXT, '
+                           'guess_seconds TEXT, seconds REAL)')
+        connection.execute('CREATE TABLE IF NOT EXISTS aggregates (id INTEGER PRIMARY KEY CHECK (id = 1), '
+                           'stats TEXT)')
+        connection.commit()
+        row = connection.execute('SELECT stats FROM aggregates WHERE id = 1').fetchone()
+        if row is not None:
+            self.stats_cache = json.loads(row[0])
+        else:
+            # Histories written before the aggregates were kept are counted once
+            self.stats_cache = self.rebuild(connection)
+        connection.close()
+
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        """ Returns a new connection to the history file in WAL mode. """
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def record(self, settings, hidden_word, won, guesses, feedback, guess_seconds, seconds):
+        """
+        Adds a finished game.  feedback holds one entry per guess (a list
+        per board in multi-board games) and guess_seconds the time of each
+        guess since the start (None when unknown).  Returns at once, the
+        game is written by the writer thread.
+        """
+        game = (time.time(), json.dumps(settings, sort_keys=True), hidden_word, int(bool(won)),
+                json.dumps(list(guesses)), json.dumps([encode_feedback(row) for row in feedback]),
+                json.dumps([None if second is None else round(second, 3) for second in guess_seconds]),
+                round(seconds, 3))
+        with self.lock:
+            add_game(self.stats_cache, won, len(guesses))
+            snapshot = json.dumps(self.stats_cache)
+        self.queue.put((game, snapshot))
+
+    def stats(self):
+        """ Returns a copy of the statistics with the win rate. """
+        with self.lock:
+            stats = json.loads(json.dumps(self.stats_cache))
+        stats['win_rate'] = stats['wins'] / stats['games'] if stats['games'] else 0.0
+        return stats
+
+    def _write(self):
+        """ Writer thread: appends the queued games in batches with the statistics after the last one. """
+        connection = self.connect()
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if item is not _STOP]
+            stopping = len(items) < len(batch)
+            if items:
+                with connection:
+                    connection.executemany('INSERT INTO games (finished_at, settings, hidden_word, won, '
+                                           'guesses, feedback, guess_seconds, seconds) '
+                                           'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', [game for game, _ in items])
+                    connection.execute('INSERT OR REPLACE INTO aggregates VALUES (1, ?)', (items[-1][1],))
+            for _ in batch:
+                self.queue.task_done()
+        connection.close()
+
+    def flush(self):
+        """ Waits until every recorded game is on disk. """
+        self.queue.join()
+
+    def games(self, limit=None):
+        """ Returns the stored games, oldest first, as dictionaries. """
+        connection = self.connect()
+        query = 'SELECT finished_at, settings, hidden_word, won, guesses, feedback, guess_seconds, seconds ' \
+                'FROM games ORDER BY id'
+        if limit is not None:
+            query += ' LIMIT %d' % int(limit)
+        games = [{'finished_at': row[0], 'settings': json.loads(row[1]), 'hidden_word': row[2],
+                  'won': bool(row[3]), 'guesses': json.loads(row[4]), 'feedback': json.loads(row[5]),
+                  'guess_seconds': json.loads(row[6]), 'seconds': row[7]}
+                 for row in connection.execute(query)]
+        connection.close()
+        return games
+
+    def rebuild(self, connection=None):
+        """ Recounts the statistics from every stored game.  Only used to check or repair the aggregates. """
+        own = connection is None
+        if own:
+            connection = self.connect()
+        stats = empty_stats()
+        for won, guesses in connection.execute('SELECT won, guesses FROM games ORDER BY id'):
+            add_game(stats, won, len(json.loads(guesses)))
+        if own:
+            connection.close()
+        return stats
+
+    def close(self):
+        """ Writes the queued games and stops the writer thread. """
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_game_history():
+    """ Returns the shared GameHistory, opening it on first use. """
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = GameHistory()
+        return _history
+
+
+def close_game_history():
+    """ Writes the queued games of the shared GameHistory, if it was opened, and closes it. """
+    global _history
+    with _history_lock:
+        if _history is not None:
+            _history.close()
+            _history = None
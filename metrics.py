@@ -0,0 +1,178 @@
+"""
+File: metrics.py
+Lightweight metrics for the game's hot paths.  Code records into the shared
+`metrics` object:
+
+    with metrics.timer('guess.score'):     latency of a block
+    metrics.count('keys.letter')           counter
+    metrics.note('settings', {...})        last value of a piece of state
+
+Latencies go into histograms with power of two microsecond buckets, so
+recording is a few integer operations.  When metrics are disabled timer()
+returns one shared no-op context manager and count()/observe()/note()
+return after a single attribute check.  The collected data is written to a
+JSON file with dump(), and an optional cProfile capture runs alongside.
+"""
+
+# Imports
+import cProfile
+import json
+import os
+import time
+
+METRICS_FILENAME = 'wordy_metrics.json'
+PROFILE_FILENAME = 'wordy_profile.prof'
+
+
+class _NullTimer:
+    """ Context manager that does nothing, handed out while metrics are disabled. """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        """ Does nothing. """
+        return self
+
+    def __exit__(self, *exc):
+        """ Does nothing, exceptions propagate. """
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """ Context manager that records the time spent in its block. """
+
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        """ Times a block for metrics under name. """
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        """ Starts the clock. """
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        """ Records the elapsed time, exceptions propagate. """
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Histogram:
+    """ Latency histogram, bucket i counts samples below 2**i microseconds. """
+
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        """ Starts empty. """
+        self.buckets = []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """ Records one sample. """
+        bucket = int(seconds * 1e6).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """ Returns the upper bound in seconds of the bucket holding the given fraction of samples. """
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, samples in enumerate(self.buckets):
+            seen += samples
+            if seen >= wanted and samples:
+                return min(self.max, (1 << bucket) / 1e6)
+        return self.max
+
+    def summary(self):
+        """ Returns count, mean, p50, p99 and max, times in milliseconds. """
+        return {'count': self.count,
+                'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+                'p50_ms': self.percentile(0.50) * 1000,
+                'p99_ms': self.percentile(0.99) * 1000,
+                'max_ms': self.max * 1000,
+                'buckets_us': {str(1 << bucket): samples
+                               for bucket, samples in enumerate(self.buckets) if samples}}
+
+
+class Metrics:
+    """ Counters, latency histograms and notes, recorded only while enabled. """
+
+    def __init__(self, enabled=False):
+        """ Starts empty. """
+        self.enabled = enabled
+        self.counters = {}
+        self.histograms = {}
+        self.notes = {}
+        self.profiler = None
+
+    def timer(self, name):
+        """ Returns a context manager that records the latency of its block under name. """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def observe(self, name, seconds):
+        """ Records one latency sample. """
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def count(self, name, amount=1):
+        """ Adds to a counter. """
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def note(self, name, value):
+        """ Keeps the latest value of something worth reporting, such as the game settings. """
+        if not self.enabled:
+            return
+        self.notes[name] = value
+
+    def snapshot(self):
+        """ Returns everything recorded as a JSON-ready dictionary. """
+        return {'counters': dict(sorted(self.counters.items())),
+                'latency': {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+                'notes': self.notes}
+
+    def dump(self, path=METRICS_FILENAME):
+        """ Writes the snapshot to a JSON file when metrics are enabled.  Returns the path. """
+        if not self.enabled:
+            return None
+        with open(path, 'w') as metrics_file:
+            json.dump(self.snapshot(), metrics_file, indent=2, default=str)
+        return os.path.abspath(path)
+
+    def start_profile(self):
+        """ Starts a cProfile capture. """
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop_profile(self, path=PROFILE_FILENAME):
+        """ Stops the cProfile capture and saves it for pstats or snakeviz.  Returns the path. """
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        self.profiler.dump_stats(path)
+        self.profiler = None
+        return os.path.abspath(path)
+
+
+# Shared instance, enabled with WORDY_METRICS=1 or python Wordy.py --metrics
+metrics = Metrics(enabled=os.environ.get('WORDY_METRICS') == '1')
@@ -0,0 +1,114 @@
+"""
+File: multiboard.py
+Multi-board games (Quordle style): every typed guess is played on K boards,
+each with its own hidden word.  A board stops taking guesses once it is
+solved, and the game is won when every board is solved.
+
+The guess is scored against all K hidden words in one vectorized call
+(scoring.score_against over a K row letter array) and the feedback is then
+recorded on each board that is still being played.
+"""
+
+# Imports
+from metrics import metrics
+from scoring import word_array, score_against, decode
+from wordy_engine import WordyEngine, InvalidGuess, PLAYING, WON, LOST
+
+BOARD_CHOICES = (1, 2, 4, 8, 16)
+
+
+def default_num_guesses(num_boards, num_guesses=6):
+    """ Returns the guesses allowed for K boards: one extra per board after the first. """
+    return num_guesses + num_boards - 1
+
+
+class MultiBoardEngine:
+    """ State and rules of a game played on several boards at once. """
+
+    __slots__ = ('boards', 'word_size', 'num_guesses', 'word_store', 'guesses_must_be_words',
+                 'hard_mode', 'guesses', 'current', 'status', 'answer_codes')
+
+    def __init__(self, hidden_words, num_guesses=None, word_store=None, word_size=None,
+                 guesses_must_be_words=True, hard_mode=False):
+        """ Starts one WordyEngine board per hidden word. """
+        if not hidden_words:
+            raise ValueError('a multi-board game needs at least one hidden word')
+        if num_guesses is None:
+            num_guesses = default_num_guesses(len(hidden_words))
+        self.boards = [WordyEngine(word, num_guesses, word_store, word_size,
+                                   guesses_must_be_words, hard_mode) for word in hidden_words]
+        self.word_size = self.boards[0].word_size
+        self.num_guesses = num_guesses
+        self.word_store = word_store
+        self.guesses_must_be_words = self.boards[0].guesses_must_be_words
+        self.hard_mode = hard_mode
+
+        self.guesses = []     # submitted guesses, shared by every board
+        self.current = []     # letters of the guess being typed
+        self.status = PLAYING
+        self.answer_codes = word_array([board.hidden_word for board in self.boards], self.word_size)
+
+    @property
+    def row(self):
+        """ Index of the guess currently being typed. """
+        return len(self.guesses)
+
+    @property
+    def playing(self):
+        """ Boards that are not solved yet. """
+        return [board for board in self.boards if board.status == PLAYING]
+
+    @property
+    def constraints(self):
+        """ Constraints of the first unsolved board, used for hints and remaining words. """
+        playing = self.playing
+        return (playing[0] if playing else self.boards[0]).constraints
+
+    def type_letter(self, letter):
+        """ Adds a letter to the current guess.  Returns False if the row is full. """
+        if self.status != PLAYING or len(self.current) >= self.word_size:
+            return False
+        self.current.append(letter.lower())
+        return True
+
+    def delete_letter(self):
+        """ Removes the last typed letter.  Returns False if there was none. """
+        if self.status != PLAYING or not self.current:
+            return False
+        self.current.pop()
+        return True
+
+    def submit(self, guess=None):
+        """
+        Submits a guess (the typed letters by default) to every unsolved
+        board.  Returns the feedback of each board, None for boards that
+        were already solved.  Raises InvalidGuess if the guess is not accepted.
+        """
+        if self.status != PLAYING:
+            raise InvalidGuess('Game over')
+        if guess is None:
+            guess = ''.join(self.current)
+
+        # In hard mode each board checks the hints it revealed
+        with metrics.timer('guess.validate'):
+            for board in self.playing:
+                guess = board.validate(guess)
+
+        # Score the guess against every hidden word at once
+        with metrics.timer('guess.score'):
+            patterns = score_against(guess, self.answer_codes)
+        feedback = []
+        for board, pattern in zip(self.boards, patterns):
+            if board.status == PLAYING:
+                board.record(guess, decode(pattern, self.word_size))
+                feedback.append(board.feedback[-1])
+            else:
+                feedback.append(None)
+
+        self.guesses.append(guess)
+        self.current = []
+        if all(board.status == WON for board in self.boards):
+            self.status = WON
+        elif any(board.status == LOST for board in self.boards):
+            self.status = LOST
+        return feedback
@@ -0,0 +1,170 @@
+"""
+File: opening_book.py
+Memo of solver decisions.  The first turns of a game always start from the
+same candidate sets, so their best guesses are kept in an in-memory LRU and
+written through to a SQLite file that survives restarts.  Entries are keyed
+by a hash of the dictionary fingerprint, word length, hard mode flag and a
+signature of the candidate set (plus the hints hard mode must reuse).
+"""
+
+# Imports
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+from candidates import to_bitset
+from scoring import DEFAULT_CACHE_DIR
+from solver import get_solver
+
+BOOK_FILENAME = 'opening_book.sqlite'
+
+# Positions with at most this many candidates are cheap to solve and not stored
+MIN_STORED_CANDIDATES = 20
+
+
+def position_key(fingerprint, word_size, hard_mode, candidates, constraints=None):
+    """ Returns the book key of a solver position. """
+    digest = hashlib.sha1()
+    digest.update(('%s:%d:%d:' % (fingerprint, word_size, bool(hard_mode))).encode())
+    digest.update(candidates.to_bytes((candidates.bit_length() + 7) // 8, 'little'))
+    if hard_mode:
+        # In hard mode the allowed guesses also depend on the revealed hints,
+        # no constraints are the same position as constraints with no hints
+        fixed = constraints.fixed if constraints is not None else [None] * word_size
+        required = sorted(constraints.required.items()) if constraints is not None else []
+        digest.update(repr((fixed, required)).encode())
+    return digest.hexdigest()
+
+
+class OpeningBook:
+    """ LRU memo of best guesses, backed by a SQLite file. """
+
+    def __init__(self, path=None, capacity=4096):
+        """ Opens (or creates) the on-disk store. """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, BOOK_FILENAME)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.capacity = capacity
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.warm_threads = {}      # (fingerprint, word size) -> thread of its last warm-up
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS book (key TEXT PRIMARY KEY, guess TEXT)')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS warmed '
+                                '(fingerprint TEXT, word_size INTEGER, PRIMARY KEY (fingerprint, word_size))')
+        self.connection.commit()
+
+    def get(self, key):
+        """ Returns the stored guess for a key, or None.  Counts a hit or a miss. """
+        with self.lock:
+            guess = self.memory.get(key)
+            if guess is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return guess
+
+            row = self.connection.execute('SELECT guess FROM book WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, key, guess):
+        """ Stores a guess in memory and on disk. """
+        with self.lock:
+            self._remember(key, guess)
+            self.connection.execute('INSERT OR REPLACE INTO book VALUES (?, ?)', (key, guess))
+            self.connection.commit()
+
+    def _remember(self, key, guess):
+        """ Adds a key to the in-memory LRU, evicting the least recently used entry. """
+        self.memory[key] = guess
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def stats(self):
+        """ Returns the hit and miss counts and the number of entries held in memory. """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'in_memory': len(self.memory)}
+
+    def best_guess(self, word_store, word_size, candidates, constraints=None, hard_mode=False):
+        """ Returns the solver's best guess for a position, looking it up in the book first. """
+        solver = get_solver(word_store, word_size)
+        if candidates.bit_count() <= MIN_STORED_CANDIDATES:
+            return solver.best_guess(candidates, constraints, hard_mode)
+
+        key = position_key(word_store.fingerprint, word_size, hard_mode, candidates, constraints)
+        guess = self.get(key)
+        if guess is None:
+            guess = solver.best_guess(candidates, constraints, hard_mode)
+            if guess is not None:
+                self.put(key, guess)
+        return guess
+
+    def warm(self, word_store, word_size):
+        """
+        Solves the opening (both modes) and every second turn position of a
+        dictionary and word length the first time they are seen.
+        """
+        fingerprint = word_store.fingerprint
+        with self.lock:
+            seen = self.connection.execute('SELECT 1 FROM warmed WHERE fingerprint = ? AND word_size = ?',
+                                           (fingerprint, word_size)).fetchone()
+        if seen is not None:
+            return
+
+        solver = get_solver(word_store, word_size)
+        full = solver.answers.full
+        self.best_guess(word_store, word_size, full, hard_mode=True)
+        opening = self.best_guess(word_store, word_size, full)
+
+        # Group the answers by the feedback they give to the opening guess
+        if opening is not None:
+            row = np.asarray(solver.patterns.row(opening))
+            for pattern in np.unique(row):
+                self.best_guess(word_store, word_size, to_bitset(row == pattern))
+
+        with self.lock:
+            self.connection.execute('INSERT OR IGNORE INTO warmed VALUES (?, ?)', (fingerprint, word_size))
+            self.connection.commit()
+
+    def warm_in_background(self, word_store, word_size):
+        """
+        Runs warm() on a daemon thread, unless a warm-up of the same
+        dictionary and word length is still running.  Returns the thread.
+        """
+        key = (word_store.fingerprint, word_size)
+        thread = self.warm_threads.get(key)
+        if thread is not None and thread.is_alive():
+            return thread
+        thread = threading.Thread(target=self.warm, args=(word_store, word_size), daemon=True)
+        self.warm_threads[key] = thread
+        thread.start()
+        return thread
+
+    def close(self):
+        """ Closes the on-disk store. """
+        with self.lock:
+            self.connection.close()
+
+
+_book = None
+_book_lock = threading.Lock()
+
+
+def get_opening_book():
+    """ Returns the shared OpeningBook, opening it on first use. """
+    global _book
+    with _book_lock:
+        if _book is None:
+            _book = OpeningBook()
+        return _book
@@ -0,0 +1,50 @@
+"""
+File: render.py
+Diffed rendering for the Wordy window.  The view computes the full state it
+wants (text and colors of every guess box and keyboard key) and the
+DiffRenderer compares it with what was last applied to each widget, so Tk
+configure calls are only issued for widgets that actually changed.
+"""
+
+
+class DiffRenderer:
+    """ Remembers the options applied to each widget and only sends changes. """
+
+    def __init__(self):
+        """ Starts with no widgets known. """
+        self.applied = {}           # widget key -> {option: value} last applied
+        self.widgets = {}           # widget key -> widget
+        self.requested = {}         # widget key -> options dict last passed to apply_all
+        self.configure_calls = 0    # total configure calls issued
+
+    def add(self, key, widget, **options):
+        """ Registers a widget with the options it was created with. """
+        self.widgets[key] = widget
+        self.applied[key] = dict(options)
+        self.requested.pop(key, None)
+
+    def remove(self, key):
+        """ Forgets a widget that was destroyed. """
+        self.widgets.pop(key, None)
+        self.applied.pop(key, None)
+        self.requested.pop(key, None)
+
+    def apply(self, key, **options):
+        """ Configures the widget with the options that differ from the last applied ones. """
+        applied = self.applied[key]
+        changed = {option: value for option, value in options.items() if applied.get(option) != value}
+        if changed:
+            self.widgets[key].configure(**changed)
+            applied.update(changed)
+            self.configure_calls += 1
+
+    def apply_all(self, state):
+        """
+        Applies a {widget key: options} view state.  Widgets asked for the
+        same options as last time are skipped with one dictionary compare.
+        """
+        requested = self.requested
+        for key, options in state.items():
+            if requested.get(key) != options:
+                requested[key] = options
+                self.apply(key, **options)
@@ -0,0 +1,102 @@
+"""
+File: scheduler.py
+Frame scheduler for animations on top of Tk's after() timer.  Steps are
+queued with a delay, every step that is due by the next frame runs in the
+same tick and the window is redrawn once per tick, so the event loop keeps
+handling input between frames.  Nothing here imports tkinter: the after,
+after_cancel and clock functions are passed in, which lets tests drive the
+scheduler with a fake clock.
+"""
+
+# Imports
+import heapq
+import time
+
+FRAME_TIME_MS = 16  # about 60 frames per second
+
+
+def monotonic_ms():
+    """ Returns a monotonic clock reading in milliseconds. """
+    return time.monotonic() * 1000
+
+
+class FrameScheduler:
+    """ Runs queued animation steps in batches, one redraw per frame. """
+
+    def __init__(self, after, after_cancel, redraw, clock=monotonic_ms, frame_ms=FRAME_TIME_MS):
+        """
+        after(ms, callback) and after_cancel(id) schedule timers (window.after
+        and window.after_cancel), redraw() is called once after each batch.
+        """
+        self.after = after
+        self.after_cancel = after_cancel
+        self.redraw = redraw
+        self.clock = clock
+        self.frame_ms = frame_ms
+        self.queue = []            # heap of (due time ms, sequence number, step)
+        self.sequence = 0
+        self.timer = None
+        self.timer_due = None      # clock time the pending timer fires at
+        self.idle_callbacks = []   # called once when the queue empties
+        self.frames = 0            # number of batched redraws so far
+
+    @property
+    def busy(self):
+        """ True while steps are waiting to run. """
+        return bool(self.queue)
+
+    def schedule(self, delay_ms, step):
+        """ Queues step() to run delay_ms from now. """
+        due = self.clock() + delay_ms
+        heapq.heappush(self.queue, (due, self.sequence, step))
+        self.sequence += 1
+
+        # Make sure a timer fires by the time the new step is due
+        if self.timer is not None and self.timer_due > due:
+            self.after_cancel(self.timer)
+            self.timer = None
+        if self.timer is None:
+            self._start_timer(delay_ms)
+
+    def _start_timer(self, delay_ms):
+        """ Schedules the next tick. """
+        delay_ms = max(0, int(delay_ms))
+        self.timer_due = self.clock() + delay_ms
+        self.timer = self.after(delay_ms, self.tick)
+
+    def when_idle(self, callback):
+        """ Calls callback() once the queued steps have all run (right away if none are queued). """
+        if self.queue:
+            self.idle_callbacks.append(callback)
+        else:
+            callback()
+
+    def tick(self):
+        """ Runs every step due by the end of this frame, then redraws once. """
+        self.timer = None
+        horizon = self.clock() + self.frame_ms / 2
+        ran = False
+        while self.queue and self.queue[0][0] <= horizon:
+            step = heapq.heappop(self.queue)[2]
+            step()
+            ran = True
+
+        if ran:
+            self.redraw()
+            self.frames += 1
+
+        if self.queue:
+            # Sleep until the next step is due, but never less than a frame
+            self._start_timer(max(self.frame_ms if ran else 1, self.queue[0][0] - self.clock()))
+        else:
+            callbacks, self.idle_callbacks = self.idle_callbacks, []
+            for callback in callbacks:
+                callback()
+
+    def cancel(self):
+        """ Drops every queued step and idle callback. """
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+            self.timer = None
+        self.queue = []
+        self.idle_callbacks = []
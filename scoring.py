@@ -0,0 +1,233 @@
+"""
+File: scoring.py
+Vectorized Wordy feedback.  A guess's feedback is encoded as a base 3 integer
+(letter i contributes feedback * 3**i, using the ABSENT / PRESENT / CORRECT
+values from wordy_engine), so one number describes the colors of a whole row.
+The guess x answer pattern matrix for a word length is computed with NumPy,
+saved to disk and memory-mapped when it is needed again.
+"""
+
+# Imports
+import hashlib
+import os
+import threading
+import numpy as np
+from wordy_engine import PRESENT, CORRECT
+
+CACHE_DIRNAME = '.wordy_cache'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_DIRNAME)
+
+# Upper bound on guesses x answers x letters booleans held at once while scoring
+CHUNK_CELLS = 1 << 25
+
+
+def pattern_dtype(word_size):
+    """ Returns the smallest unsigned dtype that holds every pattern for a word size. """
+    count = 3 ** word_size
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if count <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def encode(feedback):
+    """ Returns the base 3 pattern of a feedback tuple. """
+    pattern = 0
+    for result in reversed(feedback):
+        pattern = pattern * 3 + result
+    return pattern
+
+
+def decode(pattern, word_size):
+    """ Returns the feedback tuple of a base 3 pattern. """
+    pattern = int(pattern)
+    feedback = []
+    for _ in range(word_size):
+        pattern, result = divmod(pattern, 3)
+        feedback.append(result)
+    return tuple(feedback)
+
+
+def all_correct(word_size):
+    """ Returns the pattern of a guess that matches the hidden word. """
+    return (3 ** word_size - 1) // 2 * CORRECT
+
+
+def word_array(words, word_size=None):
+    """ Returns an (n, word size) uint8 array of letter codes (a = 0) for equal length words. """
+    if word_size is None:
+        word_size = len(words[0]) if words else 0
+    data = ''.join(words).encode('ascii')
+    codes = np.frombuffer(data, dtype=np.uint8) - ord('a')
+    return codes.reshape(len(words), word_size)
+
+
+def score_block(guess_codes, answer_codes):
+    """
+    Returns the (guesses, answers) pattern array for two letter code arrays.
+    Matches wordy_engine.score_guess: correct letters first, then repeated
+    letters are present left to right while unmatched copies remain.
+    """
+    word_size = guess_codes.shape[1]
+    dtype = pattern_dtype(word_size)
+    powers = [dtype.type(3 ** i) for i in range(word_size)]
+
+    # correct[g, a, i] is True when guess g and answer a share letter i
+    correct = guess_codes[:, None, :] == answer_codes[None, :, :]
+    patterns = np.zeros(correct.shape[:2], dtype=dtype)
+
+    for i in range(word_size):
+        patterns += correct[:, :, i] * dtype.type(CORRECT) * powers[i]
+        letter = guess_codes[:, i][:, None]
+
+        # Copies of this letter in the answer that were not matched in place
+        unmatched = np.zeros(patterns.shape, dtype=np.uint8)
+        for j in range(word_size):
+            unmatched += (answer_codes[None, :, j] == letter) & ~correct[:, :, j]
+
+        # Earlier unmatched copies of this letter in the guess use those up first
+        earlier = np.zeros(patterns.shape, dtype=np.uint8)
+        for k in range(i):
+            same = (guess_codes[:, k] == guess_codes[:, i])[:, None]
+            earlier += same & ~correct[:, :, k]
+
+        present = ~correct[:, :, i] & (earlier < unmatched)
+        patterns += present * dtype.type(PRESENT) * powers[i]
+
+    return patterns
+
+
+def score_against(guess, answer_codes):
+    """ Returns the pattern of one guess against every row of an answer code array. """
+    return score_block(word_array([guess]), answer_codes)[0]
+
+
+def partition(guess, answer_codes):
+    """
+    Groups answers by the pattern they give to one guess in a single
+    vectorized pass.  Returns (patterns, keys, counts): the pattern of every
+    answer, the distinct patterns in increasing order and their bucket sizes.
+    """
+    patterns = score_against(guess, answer_codes)
+    bins = 3 ** answer_codes.shape[1]
+    if bins <= 4 * len(patterns):
+        counts = np.bincount(patterns, minlength=bins)
+        keys = np.flatnonzero(counts)
+        return patterns, keys, counts[keys]
+    # Too many possible patterns for a dense count (long words)
+    keys, counts = np.unique(patterns, return_counts=True)
+    return patterns, keys, counts
+
+
+def largest_bucket(guess, answer_codes):
+    """
+    Returns (pattern, mask) of the biggest group of answers sharing one
+    pattern for the guess.  Ties go to the lowest pattern (fewest hits).
+    """
+    patterns, keys, counts = partition(guess, answer_codes)
+    pattern = keys[np.argmax(counts)]
+    return int(pattern), patterns == pattern
+
+
+def pattern_matrix(guesses, answers):
+    """ Computes the full guess x answer pattern matrix for two lists of equal length words. """
+    word_size = len(guesses[0]) if guesses else len(answers[0])
+    guess_codes = word_array(guesses, word_size)
+    answer_codes = word_array(answers, word_size)
+    matrix = np.empty((len(guesses), len(answers)), dtype=pattern_dtype(word_size))
+
+    # Score the guesses in chunks to bound the temporary boolean arrays
+    chunk = max(1, CHUNK_CELLS // max(1, len(answers) * word_size))
+    for start in range(0, len(guesses), chunk):
+        matrix[start:start + chunk] = score_block(guess_codes[start:start + chunk], answer_codes)
+    return matrix
+
+
+class PatternMatrix:
+    """ A guess x answer pattern matrix together with the words of its rows and columns. """
+
+    def __init__(self, guesses, answers, matrix, path=None):
+        """ Wraps a computed or memory-mapped matrix, path is its .npy file if saved. """
+        self.guesses = tuple(guesses)
+        self.answers = tuple(answers)
+        self.matrix = matrix
+        self.path = path
+        self.word_size = len(self.answers[0]) if self.answers else 0
+        self.guess_index = {word: i for i, word in enumerate(self.guesses)}
+        self.answer_index = {word: i for i, word in enumerate(self.answers)}
+        self._answer_codes = None
+
+    @property
+    def answer_codes(self):
+        """ Letter code array of the answers, built on first use. """
+        if self._answer_codes is None:
+            self._answer_codes = word_array(self.answers, self.word_size)
+        return self._answer_codes
+
+    def feedback(self, guess, answer):
+        """ Returns the pattern for a guess and an answer with a single lookup. """
+        return self.matrix[self.guess_index[guess], self.answer_index[answer]]
+
+    def row(self, guess):
+        """ Returns the patterns of a guess against every answer. """
+        index = self.guess_index.get(guess)
+        if index is None:
+            # Guesses outside the long list are scored on the fly
+            return score_against(guess, self.answer_codes)
+        return self.matrix[index]
+
+
+def _cache_key(guesses, answers):
+    """ Returns a digest identifying a pair of word lists. """
+    digest = hashlib.sha1()
+    digest.update('\n'.join(guesses).encode('ascii'))
+    digest.update(b'\0')
+    digest.update('\n'.join(answers).encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+# Matrices already loaded in this process, keyed by word list digest
+_matrices = {}
+_matrices_lock = threading.Lock()
+
+
+def load_pattern_matrix(guesses, answers, cache_dir=None):
+    """
+    Returns the PatternMatrix for the word lists, memory-mapping it from the
+    cache directory if it was computed before and saving it there otherwise.
+    """
+    key = _cache_key(guesses, answers)
+    with _matrices_lock:
+        if key in _matrices:
+            return _matrices[key]
+
+        if cache_dir is None:
+            cache_dir = DEFAULT_CACHE_DIR
+        word_size = len(answers[0]) if answers else 0
+        path = os.path.join(cache_dir, 'patterns-%d-%s.npy' % (word_size, key))
+
+        try:
+            matrix = np.load(path, mmap_mode='r')
+            saved = path
+        except (OSError, ValueError):
+            matrix = pattern_matrix(guesses, answers)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                temp_path = path + '.tmp%d' % os.getpid()
+                with open(temp_path, 'wb') as cache_file:
+                    np.save(cache_file, matrix)
+                os.replace(temp_path, path)
+                matrix = np.load(path, mmap_mode='r')
+                saved = path
+            except OSError:
+                # Read-only install, keep the matrix in memory only
+                saved = None
+
+        _matrices[key] = PatternMatrix(guesses, answers, matrix, saved)
+        return _matrices[key]
+
+
+def get_pattern_matrix(word_store, word_size):
+    """ Returns the pattern matrix of the long (guesses) and short (answers) lists of a store. """
+    return load_pattern_matrix(word_store.allowed_of_length(word_size),
+                               word_store.answers_of_length(word_size))
@@ -0,0 +1,374 @@
+"""
+File: server.py
+Asyncio game server hosting many Wordy games at once on localhost.
+
+Every game is a small slotted Session around a WordyEngine.  All sessions
+share the one WordStore of the process (see word_store.py), so a session
+only holds its own guesses and feedback.  Sessions that are not used for
+longer than the TTL are evicted by a background task.
+
+HTTP endpoints (JSON in, JSON out):
+    POST /start     {"word_size": 5, "num_guesses": 6, "hard_mode": false, "any_guess": false}
+    POST /guess     {"session": id, "guess": "crane"}
+                    (a guess that is not a word gets "did you mean" suggestions)
+    GET  /state?session=id
+    GET  /stats
+WebSocket endpoint /ws takes the same requests as text messages with an
+"action" field ("start", "guess", "state" or "stats") and answers each one
+with a JSON message.
+
+Usage: python server.py [--host 127.0.0.1] [--port 8080] [--ttl 600]
+"""
+
+# Imports
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import secrets
+import struct
+import sys
+import time
+from urllib.parse import urlsplit, parse_qs
+from suggest import suggest
+from word_store import get_word_store
+from wordy_engine import WordyEngine, InvalidGuess, PLAYING
+
+SHORT_WORDLIST_FILENAME = 'short_wordlist.txt'
+LONG_WORDLIST_FILENAME = 'long_wordlist.txt'
+
+SESSION_TTL = 600           # seconds a session may sit idle before it is evicted
+MAX_BODY_SIZE = 1 << 16     # largest request body or WebSocket message accepted
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large'}
+
+
+class Session:
+    """ One game hosted by the server. """
+
+    __slots__ = ('id', 'engine', 'last_seen')
+
+    def __init__(self, session_id, engine, now):
+        """ Wraps an engine, now is the time of the last request. """
+        self.id = session_id
+        self.engine = engine
+        self.last_seen = now
+
+    def state(self):
+        """ Returns the JSON state of the game, the answer is only included once it is over. """
+        engine = self.engine
+        state = {'session': self.id, 'word_size': engine.word_size,
+                 'num_guesses': engine.num_guesses, 'guesses': engine.guesses,
+                 'feedback': engine.feedback, 'keyboard': engine.keyboard,
+                 'status': engine.status}
+        if engine.status != PLAYING:
+            state['answer'] = engine.hidden_word
+        return state
+
+
+class SessionManager:
+    """ Holds the sessions of the server, all sharing one word store. """
+
+    def __init__(self, word_store, ttl=SESSION_TTL, clock=time.monotonic):
+        """ Starts with no sessions. """
+        self.word_store = word_store
+        self.ttl = ttl
+        self.clock = clock
+        self.sessions = {}
+        self.started = 0
+        self.evicted = 0
+
+    def start(self, word_size=5, num_guesses=6, hard_mode=False, any_guess=False):
+        """ Creates a session with a random hidden word and returns it. """
+        word_size = int(word_size)
+        num_guesses = int(num_guesses)
+        if not self.word_store.answers_of_length(word_size):
+            raise InvalidGuess(f'No words of length {word_size}')
+        if num_guesses < 1:
+            raise InvalidGuess('Number of guesses must be at least 1')
+
+        engine = WordyEngine(self.word_store.random_answer(word_size), num_guesses,
+                             self.word_store, word_size,
+                             guesses_must_be_words=not any_guess, hard_mode=bool(hard_mode))
+        session_id = secrets.token_hex(8)
+        while session_id in self.sessions:
+            session_id = secrets.token_hex(8)
+        session = Session(session_id, engine, self.clock())
+        self.sessions[session_id] = session
+        self.started += 1
+        return session
+
+    def get(self, session_id):
+        """ Returns a session and marks it as used.  Raises KeyError if it is unknown. """
+        if not isinstance(session_id, str):
+            raise KeyError(session_id)
+        session = self.sessions[session_id]
+        session.last_seen = self.clock()
+        return session
+
+    def guess(self, session_id, guess):
+        """ Submits a guess to a session and returns the session. """
+        session = self.get(session_id)
+        if not isinstance(guess, str) or not (guess.isascii() and guess.isalpha()):
+            raise InvalidGuess('Guess must be letters')
+        session.engine.submit(guess)
+        return session
+
+    def evict(self):
+        """ Removes the sessions idle for longer than the TTL.  Returns how many were removed. """
+        oldest = self.clock() - self.ttl
+        idle = [session_id for session_id, session in self.sessions.items()
+                if session.last_seen < oldest]
+        for session_id in idle:
+            del self.sessions[session_id]
+        self.evicted += len(idle)
+        return len(idle)
+
+    def stats(self):
+        """ Returns the session counts. """
+        return {'sessions': len(self.sessions), 'started': self.started, 'evicted': self.evicted}
+
+    def handle(self, action, params):
+        """ Runs one request and returns (HTTP status, JSON payload). """
+        try:
+            if action == 'start':
+                options = {name: params[name] for name in
+                           ('word_size', 'num_guesses', 'hard_mode', 'any_guess') if name in params}
+                return 200, self.start(**options).state()
+            if action == 'guess':
+                return 200, self.guess(params.get('session'), params.get('guess')).state()
+            if action == 'state':
+                return 200, self.get(params.get('session')).state()
+            if action == 'stats':
+                return 200, self.stats()
+            return 404, {'error': f'Unknown action {action}'}
+        except KeyError:
+            return 404, {'error': 'Unknown or expired session'}
+        except (InvalidGuess, ValueError, TypeError) as error:
+            payload = {'error': str(error)}
+            guess = params.get('guess')
+            session_id = params.get('session')
+            session = self.sessions.get(session_id) if isinstance(session_id, str) else None
+            if action == 'guess' and session is not None and session.engine.guesses_must_be_words and \
+                    isinstance(guess, str) and guess.isascii() and guess.isalpha() and \
+                    len(guess) == session.engine.word_size and not self.word_store.is_valid(guess.lower()):
+                payload['suggestions'] = suggest(self.word_store, guess)
+            return 400, payload
+
+
+class GameServer:
+    """ HTTP and WebSocket front end of a SessionManager. """
+
+    def __init__(self, manager):
+        """ Serves the sessions of manager. """
+        self.manager = manager
+        self.server = None
+        self.evictor = None
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """ Starts listening and the eviction task.  Returns the bound port. """
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        self.evictor = asyncio.ensure_future(self.evict_forever())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """ Stops listening and the eviction task. """
+        self.evictor.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def evict_forever(self):
+        """ Evicts idle sessions a few times per TTL. """
+        while True:
+            await asyncio.sleep(max(1.0, self.manager.ttl / 4))
+            self.manager.evict()
+
+    async def handle_connection(self, reader, writer):
+        """ Serves keep-alive HTTP requests until the client closes or upgrades to a WebSocket. """
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+
+                if path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                    await self.serve_websocket(reader, writer, headers)
+                    break
+
+                status, payload = self.route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # Malformed request, nothing sensible can be answered
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method, path, body):
+        """ Maps an HTTP request onto a manager action. """
+        url = urlsplit(path)
+        action = url.path.strip('/')
+        if action in ('start', 'guess'):
+            if method != 'POST':
+                return 405, {'error': 'Use POST'}
+            try:
+                params = json.loads(body) if body else {}
+            except ValueError:
+                return 400, {'error': 'Body must be JSON'}
+            if not isinstance(params, dict):
+                return 400, {'error': 'Body must be a JSON object'}
+        elif action in ('state', 'stats'):
+            if method != 'GET':
+                return 405, {'error': 'Use GET'}
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        else:
+            return 404, {'error': f'No endpoint {url.path}'}
+        return self.manager.handle(action, params)
+
+    async def serve_websocket(self, reader, writer, headers):
+        """ Completes the WebSocket handshake and answers messages until the client closes. """
+        key = headers.get('sec-websocket-key', '').encode()
+        accept = base64.b64encode(hashlib.sha1(key + WEBSOCKET_GUID).digest()).decode()
+        writer.write(('HTTP/1.1 101 Switching Protocols\r\n'
+                      'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+                      f'Sec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+        await writer.drain()
+
+        while True:
+            opcode, message = await read_frame(reader)
+            if opcode == 0x8:
+                writer.write(websocket_frame(0x8, message[:2]))
+                await writer.drain()
+                return
+            if opcode == 0x9:
+                writer.write(websocket_frame(0xA, message))
+            elif opcode == 0x1:
+                try:
+                    params = json.loads(message.decode('utf-8'))
+                    if not isinstance(params, dict):
+                        raise ValueError
+                except ValueError:
+                    status, payload = 400, {'error': 'Message must be a JSON object'}
+                else:
+                    status, payload = self.manager.handle(params.get('action'), params)
+                payload = dict(payload, status_code=status)
+                writer.write(websocket_frame(0x1, json.dumps(payload).encode()))
+            await writer.drain()
+
+
+async def read_request(reader):
+    """ Reads one HTTP request.  Returns (method, path, headers, body), or None at end of stream. """
+    line = await reader.readline()
+    if not line:
+        return None
+    method, path, _ = line.decode('latin-1').split(' ', 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY_SIZE:
+        raise ValueError('request body too large')
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+
+def http_response(status, payload, keep_alive=True):
+    """ Returns the bytes of a JSON HTTP response. """
+    body = json.dumps(payload).encode()
+    head = (f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+    return head.encode() + body
+
+
+async def read_frame(reader):
+    """ Reads one (possibly fragmented) WebSocket message.  Returns (opcode, payload). """
+    opcode = None
+    payload = b''
+    while True:
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('>H', await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('>Q', await reader.readexactly(8))[0]
+        if len(payload) + length > MAX_BODY_SIZE:
+            raise ValueError('message too large')
+
+        mask = await reader.readexactly(4) if second & 0x80 else b''
+        data = await reader.readexactly(length)
+        if mask:
+            data = bytes(byte ^ mask[i % 4] for i, byte in enumerate(data))
+
+        # Continuation frames (opcode 0) extend the message being read
+        if opcode is None or first & 0x0F:
+            opcode = first & 0x0F
+        payload += data
+        if first & 0x80:
+            return opcode, payload
+
+
+def websocket_frame(opcode, payload, mask=False):
+    """ Returns the bytes of a single unfragmented WebSocket frame. """
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        head = struct.pack('>BB', 0x80 | opcode, mask_bit | length)
+    elif length < 1 << 16:
+        head = struct.pack('>BBH', 0x80 | opcode, mask_bit | 126, length)
+    else:
+        head = struct.pack('>BBQ', 0x80 | opcode, mask_bit | 127, length)
+    if not mask:
+        return head + payload
+    key = secrets.token_bytes(4)
+    return head + key + bytes(byte ^ key[i % 4] for i, byte in enumerate(payload))
+
+
+async def serve(host, port, ttl, short_filename, long_filename):
+    """ Loads the dictionary once and serves until cancelled. """
+    manager = SessionManager(get_word_store(short_filename, long_filename), ttl)
+    server = GameServer(manager)
+    port = await server.start(host, port)
+    print(f'Wordy server listening on http://{host}:{port}', flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """ Parses the command line and runs the server. """
+    parser = argparse.ArgumentParser(description='Host Wordy games over HTTP and WebSocket.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080, help='0 picks a free port')
+    parser.add_argument('--ttl', type=float, default=SESSION_TTL,
+                        help='seconds an idle session is kept')
+    parser.add_argument('--short-wordlist', default=SHORT_WORDLIST_FILENAME)
+    parser.add_argument('--long-wordlist', default=LONG_WORDLIST_FILENAME)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.ttl, args.short_wordlist, args.long_wordlist))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
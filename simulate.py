@@ -0,0 +1,233 @@
+"""
+File: simulate.py
+Plays Wordy games headlessly to grade guessing strategies.  Every answer of
+the chosen length (or N random ones) is used as the hidden word, the games
+are spread across worker processes in chunks, and one result per game is
+streamed to a JSONL or CSV file.
+
+Usage: python simulate.py [--games N] [--strategy entropy|random|module:function] ...
+A strategy is a function that takes the WordyEngine of a game in progress
+and returns its next guess.
+"""
+
+# Imports
+import argparse
+import csv
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from candidates import get_candidate_index
+from solver import get_solver
+from word_store import get_word_store
+from wordy_engine import WordyEngine, InvalidGuess, PLAYING, WON
+
+SHORT_WORDLIST_FILENAME = 'short_wordlist.txt'
+LONG_WORDLIST_FILENAME = 'long_wordlist.txt'
+
+
+# Best guesses already computed in this process, keyed by position
+_entropy_memo = {}
+
+# Random numbers of the random strategy, seeded from --seed for each chunk of games
+rng = random.Random()
+
+
+def entropy_strategy(engine):
+    """ Guesses the word with the most expected information (see solver.py). """
+    solver = get_solver(engine.word_store, engine.word_size)
+    candidates = solver.answers.filter(engine.constraints)
+    key = (candidates, engine.hard_mode)
+    if engine.hard_mode:
+        # In hard mode the allowed guesses also depend on the revealed hints
+        key += (tuple(engine.constraints.fixed), tuple(sorted(engine.constraints.required.items())))
+    guess = _entropy_memo.get(key)
+    if guess is None:
+        guess = solver.best_guess(candidates, engine.constraints, engine.hard_mode,
+                                  parallel=_worker.get('parallel', True))
+        _entropy_memo[key] = guess
+    return guess
+
+
+def random_strategy(engine):
+    """ Guesses a random answer that is still consistent with the feedback. """
+    answers = get_candidate_index(engine.word_store, engine.word_size)
+    words = answers.words_in(answers.filter(engine.constraints))
+    return rng.choice(words) if words else answers.words[0]
+
+
+STRATEGIES = {'entropy': entropy_strategy, 'random': random_strategy}
+
+
+def load_strategy(name):
+    """ Returns a built in strategy or one given as module:function. """
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module_name, _, function_name = name.partition(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def play_game(hidden_word, strategy, word_store, num_guesses, hard_mode, be_words):
+    """ Plays one game and returns its result record. """
+    engine = WordyEngine(hidden_word, num_guesses, word_store,
+                         guesses_must_be_words=be_words, hard_mode=hard_mode)
+    start = time.perf_counter()
+    error = None
+    while engine.status == PLAYING:
+        guess = strategy(engine)
+        try:
+            engine.submit(guess)
+        except InvalidGuess as invalid:
+            # A strategy that makes an invalid guess loses the game
+            error = f'{guess}: {invalid}'
+            break
+    return {'hidden_word': hidden_word, 'won': engine.status == WON,
+            'guesses': len(engine.guesses), 'path': engine.guesses,
+            'seconds': time.perf_counter() - start, 'error': error}
+
+
+# Settings of the current worker process, set by _init_worker
+_worker = {}
+
+
+def _init_worker(settings):
+    """ Loads the word store and strategy once per worker process. """
+    _worker.update(settings)
+    _worker['store'] = get_word_store(settings['short'], settings['long'])
+    _worker['strategy'] = load_strategy(settings['strategy'])
+    # Pool workers cannot have children, and the games already use every
+    # worker, so the solver does not split its blocks further
+    _worker['parallel'] = not multiprocessing.current_process().daemon
+
+
+def _play_chunk(chunk):
+    """
+    Plays a numbered chunk of games in a worker process.  The random
+    strategy is seeded from the seed and the chunk number, so a seed replays
+    the same games whichever worker gets the chunk.
+    """
+    number, hidden_words = chunk
+    rng.seed(f"{_worker['seed']}:{number}")
+    return [play_game(word, _worker['strategy'], _worker['store'], _worker['num_guesses'],
+                      _worker['hard_mode'], _worker['be_words']) for word in hidden_words]
+
+
+class ResultWriter:
+    """ Streams game results to a JSONL or CSV file. """
+
+    FIELDS = ['hidden_word', 'won', 'guesses', 'path', 'seconds', 'error']
+
+    def __init__(self, path):
+        """ Opens the output file, the format follows its extension. """
+        self.file = open(path, 'w', newline='') if path else None
+        self.csv = None
+        if path and path.endswith('.csv'):
+            self.csv = csv.DictWriter(self.file, fieldnames=self.FIELDS)
+            self.csv.writeheader()
+
+    def write(self, result):
+        """ Writes one result. """
+        if self.file is None:
+            return
+        if self.csv is not None:
+            self.csv.writerow(dict(result, path=' '.join(result['path'])))
+        else:
+            self.file.write(json.dumps(result) + '\n')
+
+    def close(self):
+        """ Closes the output file. """
+        if self.file is not None:
+            self.file.close()
+
+
+def run(hidden_words, settings, workers, chunk_size, writer):
+    """ Plays every hidden word and writes the results.  Returns the summary counts. """
+    chunks = [hidden_words[i:i + chunk_size] for i in range(0, len(hidden_words), chunk_size)]
+    summary = {'games': 0, 'wins': 0, 'guesses': 0, 'distribution': {}}
+
+    if workers <= 1:
+        _init_worker(settings)
+        results = map(_play_chunk, enumerate(chunks))
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(settings,))
+        results = pool.imap_unordered(_play_chunk, enumerate(chunks))
+
+    try:
+        for chunk in results:
+            for result in chunk:
+                writer.write(result)
+                summary['games'] += 1
+                if result['won']:
+                    summary['wins'] += 1
+                    summary['guesses'] += result['guesses']
+                    summary['distribution'][result['guesses']] = \
+                        summary['distribution'].get(result['guesses'], 0) + 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return summary
+
+
+def main(argv=None):
+    """ Parses the command line, runs the simulation and prints a summary. """
+    parser = argparse.ArgumentParser(description='Play Wordy games headlessly.')
+    parser.add_argument('--games', type=int, default=0,
+                        help='number of random hidden words to play (default: every answer)')
+    parser.add_argument('--strategy', default='entropy',
+                        help='entropy, random, or module:function')
+    parser.add_argument('--word-size', type=int, default=5)
+    parser.add_argument('--num-guesses', type=int, default=6)
+    parser.add_argument('--hard-mode', action='store_true')
+    parser.add_argument('--any-guess', action='store_true',
+                        help='guesses do not have to be words')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=32)
+    parser.add_argument('--output', help='results file, .jsonl or .csv')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--short-wordlist', default=SHORT_WORDLIST_FILENAME)
+    parser.add_argument('--long-wordlist', default=LONG_WORDLIST_FILENAME)
+    args = parser.parse_args(argv)
+
+    settings = {'short': args.short_wordlist, 'long': args.long_wordlist,
+                'strategy': args.strategy, 'num_guesses': args.num_guesses,
+                'hard_mode': args.hard_mode, 'be_words': not args.any_guess, 'seed': args.seed}
+
+    answers = list(get_word_store(args.short_wordlist, args.long_wordlist)
+                   .answers_of_length(args.word_size))
+    if not answers:
+        parser.error(f'no answers of length {args.word_size}')
+    if args.games:
+        answer_rng = random.Random(args.seed)
+        answers = [answer_rng.choice(answers) for _ in range(args.games)]
+
+    # Build the shared pattern matrix before forking so workers map the saved file
+    if args.strategy == 'entropy':
+        get_solver(get_word_store(args.short_wordlist, args.long_wordlist), args.word_size)
+
+    writer = ResultWriter(args.output)
+    start = time.perf_counter()
+    try:
+        summary = run(answers, settings, args.workers, args.chunk_size, writer)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    games = summary['games']
+    print(f'{games} games in {elapsed:.2f}s ({games / elapsed:.1f} games/sec, {args.workers} workers)')
+    print(f'won {summary["wins"]} ({100 * summary["wins"] / games:.1f}%)', end='')
+    if summary['wins']:
+        print(f', average {summary["guesses"] / summary["wins"]:.3f} guesses per win')
+    else:
+        print()
+    for guesses in sorted(summary['distribution']):
+        print(f'  {guesses}: {summary["distribution"][guesses]}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+File: solver.py
+Entropy based solver used for hints.  For every allowed guess (long list)
+the expected information gained over the remaining candidate answers (short
+list) is computed from the pattern matrix with one vectorized count per
+block of guesses.  Large guess x candidate blocks are split across a
+ProcessPoolExecutor whose workers memory-map the same saved matrix.
+"""
+
+# Imports
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from candidates import get_candidate_index
+from scoring import get_pattern_matrix
+
+# Guess x candidate cells above which the guesses are split across processes
+PARALLEL_CELLS = 1 << 24
+
+# Number of worker processes used for large blocks
+WORKERS = os.cpu_count() or 1
+
+# Upper bound on the bincount table (rows x patterns) built at once
+BINCOUNT_CELLS = 1 << 22
+
+
+def entropies(patterns, bins):
+    """
+    Returns the entropy in bits of the feedback distribution of each row of
+    a (guesses, candidates) pattern array, where patterns are below bins.
+    """
+    rows, candidates = patterns.shape
+    if rows == 0 or candidates == 0:
+        return np.zeros(rows)
+    total = np.zeros(rows)
+
+    if bins <= 4 * candidates:
+        # Few possible patterns, count them with one bincount per block of rows
+        block = max(1, BINCOUNT_CELLS // bins)
+        for start in range(0, rows, block):
+            chunk = patterns[start:start + block].astype(np.int64)
+            offsets = (np.arange(chunk.shape[0], dtype=np.int64) * bins)[:, None]
+            counts = np.bincount((chunk + offsets).ravel(), minlength=chunk.shape[0] * bins)
+            counts = counts.reshape(chunk.shape[0], bins)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                total[start:start + chunk.shape[0]] = np.where(
+                    counts > 0, counts * np.log2(counts), 0).sum(axis=1)
+    else:
+        # Many possible patterns (long words), count runs of equal sorted patterns
+        ordered = np.sort(patterns, axis=1)
+        starts = np.ones((rows, candidates + 1), dtype=bool)
+        starts[:, 1:candidates] = ordered[:, 1:] != ordered[:, :-1]
+        positions = np.flatnonzero(starts)
+        lengths = np.diff(positions)
+        # The step from one row's end to the next row's start has length 1
+        # and adds nothing to the sum, so it needs no special case
+        owner = positions[:-1] // (candidates + 1)
+        total = np.bincount(owner, weights=lengths * np.log2(lengths), minlength=rows)
+
+    return np.log2(candidates) - total / candidates
+
+
+def _rows_entropy(matrix, rows, candidates, bins):
+    """ Returns the entropies of some guess rows over the candidate columns. """
+    block = matrix[rows] if rows is not None else matrix
+    return entropies(np.take(block, candidates, axis=1), bins)
+
+
+# Matrix opened by each worker process, keyed by file path
+_worker_matrices = {}
+
+
+def _worker_entropy(path, rows, candidates, bins):
+    """ Worker process entry point, maps the saved matrix once per process. """
+    matrix = _worker_matrices.get(path)
+    if matrix is None:
+        matrix = np.load(path, mmap_mode='r')
+        _worker_matrices[path] = matrix
+    return _rows_entropy(matrix, rows, candidates, bins)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """ Returns the shared process pool, starting it on first use. """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=WORKERS)
+        return _executor
+
+
+class Solver:
+    """ Picks guesses for one word list and word length. """
+
+    def __init__(self, word_store, word_size):
+        """ Loads the pattern matrix and the answer and guess indexes. """
+        self.word_size = word_size
+        self.patterns = get_pattern_matrix(word_store, word_size)
+        self.answers = get_candidate_index(word_store, word_size)
+        self.guesses = get_candidate_index(word_store, word_size, guesses=True)
+        self.bins = 3 ** word_size
+
+        # Guess row of every answer, or -1 if the answer is not an allowed guess
+        self.answer_rows = np.array([self.patterns.guess_index.get(word, -1)
+                                     for word in self.answers.words], dtype=np.int64)
+
+    def guess_entropies(self, rows, candidates, parallel=True):
+        """
+        Returns the entropy of each guess row (all rows if None) over the
+        candidates.  Large blocks are split across processes unless parallel
+        is False (in processes that cannot start workers of their own).
+        """
+        row_count = len(self.patterns.guesses) if rows is None else len(rows)
+        if not parallel or row_count * len(candidates) < PARALLEL_CELLS or self.patterns.path is None:
+            return _rows_entropy(self.patterns.matrix, rows, candidates, self.bins)
+
+        # Split the guess rows evenly across the worker processes
+        if rows is None:
+            rows = np.arange(row_count)
+        executor = get_executor()
+        parts = np.array_split(rows, WORKERS)
+        futures = [executor.submit(_worker_entropy, self.patterns.path, part, candidates, self.bins)
+                   for part in parts if len(part)]
+        return np.concatenate([future.result() for future in futures])
+
+    def best_guess(self, candidates, constraints=None, hard_mode=False, parallel=True):
+        """
+        Returns the guess with the most expected information about the answers
+        in the candidates bitset, or None if no answer is left.  In hard mode
+        only guesses that use every revealed hint are considered.  parallel is
+        passed on to guess_entropies.
+        """
+        candidates = self.answers.indexes(candidates)
+        if len(candidates) == 0:
+            return None
+        if len(candidates) <= 2:
+            return self.answers.words[candidates[0]]
+
+        rows = None
+        if hard_mode and constraints is not None:
+            rows = self.guesses.indexes(self.guesses.filter_hard_mode(constraints))
+            if len(rows) == 0:
+                return self.answers.words[candidates[0]]
+
+        scores = self.guess_entropies(rows, candidates, parallel)
+
+        # A guess that might be the answer wins outright with probability 1 / candidates
+        could_win = np.zeros(len(self.patterns.guesses), dtype=bool)
+        candidate_rows = self.answer_rows[candidates]
+        could_win[candidate_rows[candidate_rows >= 0]] = True
+        scores = scores + (could_win if rows is None else could_win[rows]) / len(candidates)
+
+        best = int(np.argmax(scores))
+        return self.patterns.guesses[best if rows is None else rows[best]]
+
+
+# Solvers already built in this process, keyed by store and word length
+_solvers = {}
+_solvers_lock = threading.Lock()
+
+
+def get_solver(word_store, word_size):
+    """ Returns the shared Solver for a store and word length. """
+    key = (id(word_store), word_size)
+    with _solvers_lock:
+        solver = _solvers.get(key)
+        if solver is None:
+            solver = Solver(word_store, word_size)
+            _solvers[key] = solver
+        return solver
+
+
+def best_guess(state):
+    """ Returns the best next guess for a WordyEngine game in progress. """
+    solver = get_solver(state.word_store, state.word_size)
+    candidates = solver.answers.filter(state.constraints)
+    return solver.best_guess(candidates, state.constraints, state.hard_mode)
@@ -0,0 +1,97 @@
+"""
+File: suggest.py
+"Did you mean" suggestions for guesses that are not in the word list.
+
+Guesses always have the word length, so the distance between a guess and a
+word is the Hamming distance (no insertions or deletions).  Every long list
+word of one length is indexed under each of its one-letter wildcard forms
+("cr.ne" for crane at position 2).  Words at distance 1 from a query share
+one of its wildcard forms; words at distance 2 share a wildcard form of the
+query with one letter substituted.  A lookup within distance 2 is then
+about 25 * L * L / 2 dictionary probes, whatever the size of the list.
+"""
+
+# Imports
+import string
+import threading
+
+MAX_DISTANCE = 2
+SUGGESTIONS = 3
+
+
+def hamming(a, b):
+    """ Returns the number of positions where two equal length words differ. """
+    return sum(x != y for x, y in zip(a, b))
+
+
+def wildcard(word, position):
+    """ Returns the word with the letter at position replaced by a dot. """
+    return word[:position] + '.' + word[position + 1:]
+
+
+class NeighborIndex:
+    """ Wildcard index of equal length words for lookups within Hamming distance 2. """
+
+    def __init__(self, words):
+        """ Indexes every word under each of its wildcard forms. """
+        self.words = tuple(dict.fromkeys(words))
+        self.word_size = len(self.words[0]) if self.words else 0
+        self.valid = frozenset(self.words)
+        self.wildcards = {}
+        for word in self.words:
+            for position in range(self.word_size):
+                self.wildcards.setdefault(wildcard(word, position), []).append(word)
+
+    def search(self, word, max_distance=MAX_DISTANCE):
+        """ Returns the (distance, word) pairs within max_distance (at most 2), nearest first. """
+        if len(word) != self.word_size:
+            return []
+        found = set()
+        if word in self.valid:
+            found.add(word)
+        if max_distance >= 1:
+            for position in range(self.word_size):
+                found.update(self.wildcards.get(wildcard(word, position), ()))
+        if max_distance >= 2:
+            for first in range(self.word_size):
+                for letter in string.ascii_lowercase:
+                    if letter == word[first]:
+                        continue
+                    changed = word[:first] + letter + word[first + 1:]
+                    for second in range(first + 1, self.word_size):
+                        found.update(self.wildcards.get(wildcard(changed, second), ()))
+        return sorted((hamming(word, other), other) for other in found)
+
+
+def brute_force_search(words, word, max_distance=MAX_DISTANCE):
+    """ Scans every word, the reference for NeighborIndex.search. """
+    return sorted((distance, other) for other in words
+                  if (distance := hamming(word, other)) <= max_distance)
+
+
+# Indexes that have already been built in this process
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_neighbor_index(word_store, word_size):
+    """ Returns the NeighborIndex over the long list words of one length, building it on first use. """
+    key = (id(word_store), word_size)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = NeighborIndex(word_store.allowed_of_length(word_size))
+            _indexes[key] = index
+        return index
+
+
+def suggest(word_store, word, k=SUGGESTIONS, max_distance=MAX_DISTANCE):
+    """
+    Returns up to k valid words closest to word, within max_distance.  Among
+    words at the same distance the possible answers come first.
+    """
+    word = word.lower()
+    found = get_neighbor_index(word_store, len(word)).search(word, max_distance)
+    answers = set(word_store.answers_of_length(len(word)))
+    found.sort(key=lambda pair: (pair[0], pair[1] not in answers, pair[1]))
+    return [other for _, other in found[:k]]
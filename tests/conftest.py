@@ -0,0 +1,10 @@
+"""
+File: conftest.py
+Puts the game modules on the import path of the tests.
+"""
+
+# Imports
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,56 @@
+"""
+File: test_candidates.py
+Tests that the bitset filters agree with checking every word by brute force.
+"""
+
+# Imports
+import os
+import random
+import pytest
+from candidates import CandidateIndex
+from wordy_engine import Constraints, score_guess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def words():
+    """ The five letter answers of the game. """
+    with open(os.path.join(ROOT, 'short_wordlist.txt')) as source:
+        return [line.strip().lower() for line in source if len(line.strip()) == 5 and line.strip().isalpha()]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_filter_matches_brute_force(words, seed):
+    """ The remaining words are exactly those that would give the same feedback to every guess. """
+    rng = random.Random(seed)
+    index = CandidateIndex(words)
+    hidden_word = rng.choice(words)
+    constraints = Constraints(5)
+    guesses = []
+    remaining = index.full
+    for guess in rng.sample(words, 4):
+        feedback = score_guess(guess, hidden_word)
+        constraints.update(guess, feedback)
+        guesses.append((guess, feedback))
+        remaining = index.filter(constraints, remaining)
+
+        expected = [word for word in words
+                    if all(score_guess(previous, word) == shown for previous, shown in guesses)]
+        assert index.words_in(remaining) == expected
+        assert index.words_in(index.filter(constraints)) == expected
+        assert hidden_word in expected
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_hard_mode_filter_matches_check(words, seed):
+    """ The words allowed in hard mode are exactly those Constraints.check accepts. """
+    rng = random.Random(seed)
+    index = CandidateIndex(words)
+    hidden_word = rng.choice(words)
+    constraints = Constraints(5)
+    for guess in rng.sample(words, 2):
+        constraints.update(guess, score_guess(guess, hidden_word))
+
+    assert index.words_in(index.filter_hard_mode(constraints)) == \
+        [word for word in words if constraints.check(word) is None]
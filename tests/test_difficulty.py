@@ -0,0 +1,70 @@
+"""
+File: test_difficulty.py
+Tests for the answer difficulty index.
+"""
+
+# Imports
+import difficulty
+import simulate
+import solver
+import word_store as word_store_module
+from test_simulate import write_word_lists
+from word_store import get_word_store
+
+
+def test_build_index_with_workers_above_parallel_threshold(tmp_path, monkeypatch):
+    """ The index is built with 2 worker processes when the solver would split its blocks. """
+    (short, long), words = write_word_lists(str(tmp_path))
+    monkeypatch.setattr(solver, 'PARALLEL_CELLS', 1)
+    word_store = get_word_store(short, long)
+
+    index, played = difficulty.build_index(word_store, 5, workers=2, cache_dir=str(tmp_path))
+
+    assert played == len(words)
+    assert sorted(word for word, _, _ in index.entries()) == sorted(words)
+
+
+def test_indexes_of_different_dictionaries_are_kept_apart(tmp_path):
+    """ Building the index of another dictionary neither reuses nor overwrites the first one's. """
+    (short, long), words = write_word_lists(str(tmp_path))
+    first = get_word_store(short, long)
+    difficulty.build_index(first, 5, cache_dir=str(tmp_path))
+
+    other_dir = tmp_path / 'other'
+    other_dir.mkdir()
+    other_words = words[::2]
+    for path in (other_dir / 'short.txt', other_dir / 'long.txt'):
+        path.write_text('\n'.join(other_words) + '\n')
+    second = get_word_store(str(other_dir / 'short.txt'), str(other_dir / 'long.txt'))
+
+    index, played = difficulty.build_index(second, 5, cache_dir=str(tmp_path))
+
+    assert played == len(other_words)
+    assert sorted(word for word, _, _ in index.entries()) == sorted(other_words)
+    kept = difficulty.get_difficulty_index(first, 5, cache_dir=str(tmp_path))
+    assert kept is not None and kept.count == len(words)
+
+
+def test_adding_words_plays_only_the_new_answers(tmp_path, monkeypatch):
+    """ Rebuilding after words were added to the lists keeps the solver results of the other answers. """
+    (short, long), words = write_word_lists(str(tmp_path))
+    for path in (short, long):
+        with open(path, 'w') as word_file:
+            word_file.write('\n'.join(words[:-2]) + '\n')
+    first = get_word_store(short, long)
+    index, played = difficulty.build_index(first, 5, cache_dir=str(tmp_path))
+    assert played == len(words) - 2
+
+    for path in (short, long):
+        with open(path, 'a') as word_file:
+            word_file.write('\n'.join(words[-2:]) + '\n')
+    # A new process would load the changed lists, this one has them cached
+    monkeypatch.setattr(word_store_module, '_stores', {})
+    monkeypatch.setattr(simulate, '_entropy_memo', {})
+    second = get_word_store(short, long)
+    assert second.fingerprint != first.fingerprint
+
+    index, played = difficulty.build_index(second, 5, cache_dir=str(tmp_path))
+    assert played == 2
+    assert index.count == len(words)
+    assert difficulty.get_difficulty_index(second, 5, cache_dir=str(tmp_path)) is not None
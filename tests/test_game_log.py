@@ -0,0 +1,37 @@
+"""
+File: test_game_log.py
+Tests for the event log of the game in progress.
+"""
+
+# Imports
+import os
+import pytest
+from game_log import GameLog, LogHeader, archive_dir
+
+
+@pytest.mark.parametrize('word', ['ééééé', 'ab1de'])
+def test_header_that_cannot_be_packed_leaves_the_previous_log(tmp_path, word):
+    """ A hidden word that is not a to z is refused before the current log is archived or truncated. """
+    path = str(tmp_path / 'current_game.wgl')
+    previous = GameLog(LogHeader(5, 6, ['crane']), path)
+    previous.append('S')
+    previous.close()
+    with open(path, 'rb') as log_file:
+        data = log_file.read()
+
+    with pytest.raises(ValueError):
+        GameLog(LogHeader(5, 6, [word]), path)
+
+    with open(path, 'rb') as log_file:
+        assert log_file.read() == data
+    assert not os.path.exists(archive_dir(str(tmp_path)))
+
+
+def test_packed_header_unpacks_to_the_same_settings():
+    """ Every setting and hidden word survives a round trip through the header bytes. """
+    header = LogHeader(5, 7, ['crane', 'slate'], hard_mode=True, specify_word=True, difficulty='Hard',
+                       fingerprint='ab' * 20, started=12.5)
+    unpacked, offset = LogHeader.unpack(header.pack())
+    assert offset == len(header.pack())
+    assert [getattr(unpacked, name) for name in LogHeader.__slots__] == \
+        [getattr(header, name) for name in LogHeader.__slots__]
@@ -0,0 +1,54 @@
+"""
+File: test_opening_book.py
+Tests for the memo of solver decisions.
+"""
+
+# Imports
+import threading
+from opening_book import OpeningBook, position_key
+from wordy_engine import Constraints
+
+
+class Store:
+    """ Stands in for a word store, only its fingerprint is used. """
+
+    def __init__(self, fingerprint):
+        """ Keeps the fingerprint. """
+        self.fingerprint = fingerprint
+
+
+def test_hard_mode_opening_key_is_the_same_without_constraints():
+    """ The warmed hard mode opening is found by hints, which always pass the game's constraints. """
+    candidates = (1 << 40) - 1
+    assert position_key('ab' * 20, 5, True, candidates) == \
+        position_key('ab' * 20, 5, True, candidates, Constraints(5))
+
+    constraints = Constraints(5)
+    constraints.update('crane', (2, 0, 0, 1, 0))
+    assert position_key('ab' * 20, 5, True, candidates) != \
+        position_key('ab' * 20, 5, True, candidates, constraints)
+
+
+def test_warm_ups_run_once_per_dictionary_and_word_length(tmp_path):
+    """ A running warm-up is not started twice, other word lengths and dictionaries still warm up. """
+    book = OpeningBook(str(tmp_path / 'book.sqlite'))
+    release = threading.Event()
+    warmed = []
+
+    def warm(word_store, word_size):
+        """ Notes the warm-up and waits to be released. """
+        warmed.append((word_store.fingerprint, word_size))
+        release.wait()
+
+    book.warm = warm
+    first = book.warm_in_background(Store('a'), 5)
+    assert book.warm_in_background(Store('a'), 5) is first
+    others = [book.warm_in_background(Store('a'), 6), book.warm_in_background(Store('b'), 5)]
+    release.set()
+    for thread in [first] + others:
+        thread.join()
+
+    assert sorted(warmed) == [('a', 5), ('a', 6), ('b', 5)]
+    book.warm_in_background(Store('a'), 5).join()
+    assert len(warmed) == 4
+    book.close()
@@ -0,0 +1,210 @@
+"""
+File: test_scheduler.py
+Tests for the frame scheduler and the keys held back while a guess is
+revealed, driven by a fake after() timer and clock instead of a window.
+"""
+
+# Imports
+import time
+from scheduler import FrameScheduler
+from wordy_engine import WordyEngine, PLAYING
+from Wordy import Wordy
+
+
+class FakeTimers:
+    """ Stands in for window.after, window.after_cancel and the clock. """
+
+    def __init__(self):
+        """ Starts at time 0 without timers. """
+        self.now = 0
+        self.timers = {}       # timer id -> (due time ms, callback)
+        self.next_id = 0
+        self.cancelled = []
+
+    def after(self, delay_ms, callback):
+        """ Schedules a callback, returns its timer id. """
+        self.next_id += 1
+        self.timers[self.next_id] = (self.now + delay_ms, callback)
+        return self.next_id
+
+    def after_cancel(self, timer):
+        """ Drops a timer. """
+        self.cancelled.append(timer)
+        del self.timers[timer]
+
+    def clock(self):
+        """ Returns the fake time in milliseconds. """
+        return self.now
+
+    def advance(self, delay_ms):
+        """ Moves the clock forward, firing the timers that come due in order. """
+        end = self.now + delay_ms
+        while self.timers:
+            timer = min(self.timers, key=lambda key: self.timers[key][0])
+            due, callback = self.timers[timer]
+            if due > end:
+                break
+            del self.timers[timer]
+            self.now = max(self.now, due)
+            callback()
+        self.now = end
+
+
+def make_scheduler(timers, redraws):
+    """ Returns a FrameScheduler on the fake timers that counts its redraws. """
+    return FrameScheduler(timers.after, timers.after_cancel, lambda: redraws.append(timers.now),
+                          clock=timers.clock)
+
+
+def test_steps_due_in_the_same_frame_share_one_redraw():
+    """ Steps due within half a frame run in one tick, later steps in a later one. """
+    timers = FakeTimers()
+    redraws = []
+    scheduler = make_scheduler(timers, redraws)
+    ran = []
+    for delay in (0, 3, 5, 100):
+        scheduler.schedule(delay, lambda delay=delay: ran.append(delay))
+
+    timers.advance(50)
+    assert ran == [0, 3, 5]
+    assert redraws == [0]
+    assert scheduler.busy
+
+    timers.advance(100)
+    assert ran == [0, 3, 5, 100]
+    assert redraws == [0, 100]
+    assert scheduler.frames == 2
+    assert not scheduler.busy
+
+
+def test_earlier_step_replaces_a_later_timer():
+    """ A step due before the pending timer moves the timer forward. """
+    timers = FakeTimers()
+    scheduler = make_scheduler(timers, [])
+    ran = []
+    scheduler.schedule(200, lambda: ran.append('late'))
+    scheduler.schedule(10, lambda: ran.append('early'))
+
+    assert len(timers.cancelled) == 1
+    timers.advance(10)
+    assert ran == ['early']
+    timers.advance(200)
+    assert ran == ['early', 'late']
+
+
+def test_cancel_drops_steps_and_idle_callbacks():
+    """ Nothing queued before cancel() runs afterwards. """
+    timers = FakeTimers()
+    redraws = []
+    scheduler = make_scheduler(timers, redraws)
+    ran = []
+    scheduler.schedule(0, lambda: ran.append('step'))
+    scheduler.when_idle(lambda: ran.append('idle'))
+
+    scheduler.cancel()
+    timers.advance(1000)
+    assert ran == []
+    assert redraws == []
+    assert not scheduler.busy
+    assert not timers.timers
+
+
+def test_when_idle_runs_once_after_the_last_step():
+    """ Idle callbacks wait for the queue to empty and run right away when it already is. """
+    timers = FakeTimers()
+    scheduler = make_scheduler(timers, [])
+    ran = []
+    scheduler.when_idle(lambda: ran.append('empty'))
+    assert ran == ['empty']
+
+    scheduler.schedule(0, lambda: ran.append('first'))
+    scheduler.schedule(250, lambda: ran.append('second'))
+    scheduler.when_idle(lambda: ran.append('idle'))
+    timers.advance(100)
+    assert ran == ['empty', 'first']
+
+    timers.advance(1000)
+    assert ran == ['empty', 'first', 'second', 'idle']
+
+
+class KeyLog:
+    """ Game log that keeps the keys it is given. """
+
+    def __init__(self):
+        """ Starts empty. """
+        self.keys = []
+
+    def append(self, key):
+        """ Keeps one key. """
+        self.keys.append(key)
+
+
+class Counter:
+    """ Stands in for the renderer, which only needs its configure count here. """
+
+    configure_calls = 0
+
+
+class Variable:
+    """ Stands in for a Tk variable. """
+
+    def set(self, value):
+        """ Ignores the value. """
+
+
+class HeadlessWordy(Wordy):
+    """ Wordy without a window: the game state is real, the drawing does nothing. """
+
+    def __init__(self, timers, hidden_word):
+        """ Sets up a game in progress on the fake timers. """
+        self.engine = WordyEngine(hidden_word, 6, guesses_must_be_words=False)
+        self.boards = [self.engine]
+        self.settled = set()
+        self.WORD_SIZE = len(hidden_word)
+        self.PROCESS_GUESS_WAITTIME = 0.25
+        self.scheduler = make_scheduler(timers, [])
+        self.pending_keys = []
+        self.reveal_order = {}
+        self.revealed = {}
+        self.prefix = None
+        self.game_log = KeyLog()
+        self.renderer = Counter()
+        self.configure_calls_at_guess = 0
+        self.configure_calls_var = Variable()
+        self.game_started_at = time.perf_counter()
+        self.guess_seconds = []
+        self.revealed_rows = []
+
+    def render(self):
+        """ Nothing to draw. """
+
+    def update_candidates(self):
+        """ No candidate list to show. """
+
+    def guess_revealed(self, row):
+        """ Notes the row, then finishes the guess as the game does. """
+        self.revealed_rows.append(row)
+        super().guess_revealed(row)
+
+
+def test_keys_hit_during_a_reveal_are_replayed_after_it():
+    """ Keys wait in pending_keys while the boxes turn and are handled in order by guess_revealed. """
+    timers = FakeTimers()
+    game = HeadlessWordy(timers, 'crane')
+    for key in 'SLATE':
+        game.keyboard_button_handler(key)
+    game.keyboard_button_handler('ENTER')
+    assert game.scheduler.busy
+
+    for key in ('B', 'R', 'BACK', 'I'):
+        game.keyboard_button_handler(key)
+    assert game.pending_keys == ['B', 'R', 'BACK', 'I']
+    assert game.engine.current == []
+    assert game.game_log.keys == list('SLATE') + ['ENTER']
+
+    timers.advance(1000)
+    assert game.revealed_rows == [0]
+    assert game.pending_keys == []
+    assert game.engine.current == ['b', 'i']
+    assert game.game_log.keys == list('SLATE') + ['ENTER', 'B', 'R', 'BACK', 'I']
+    assert game.engine.status == PLAYING
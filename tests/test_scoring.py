@@ -0,0 +1,42 @@
+"""
+File: test_scoring.py
+Tests that the vectorized feedback matches the game's scorer.
+"""
+
+# Imports
+import itertools
+import random
+import pytest
+from scoring import encode, decode, all_correct, word_array, score_block, pattern_matrix
+from wordy_engine import score_guess
+
+REPEATED = ['speed', 'abide', 'eerie', 'lever', 'geese', 'those', 'lolly', 'hello', 'abbey', 'babes',
+            'sissy', 'esses', 'mamma', 'llama', 'crane']
+
+
+def test_patterns_round_trip():
+    """ Every feedback tuple encodes to a distinct pattern that decodes back. """
+    feedbacks = list(itertools.product(range(3), repeat=4))
+    patterns = [encode(feedback) for feedback in feedbacks]
+    assert sorted(patterns) == list(range(3 ** 4))
+    assert [decode(pattern, 4) for pattern in patterns] == feedbacks
+    assert decode(all_correct(6), 6) == (2,) * 6
+
+
+def test_matrix_matches_score_guess_on_repeated_letters():
+    """ Every guess x answer pair of words with repeated letters scores like score_guess. """
+    matrix = pattern_matrix(REPEATED, REPEATED)
+    for i, guess in enumerate(REPEATED):
+        for j, answer in enumerate(REPEATED):
+            assert decode(matrix[i, j], 5) == score_guess(guess, answer), (guess, answer)
+
+
+@pytest.mark.parametrize('word_size', [3, 5, 8, 12])
+def test_block_matches_score_guess_on_random_words(word_size):
+    """ Random words over a small alphabet, so letters repeat often, score like score_guess. """
+    rng = random.Random(word_size)
+    words = [''.join(rng.choice('abcde') for _ in range(word_size)) for _ in range(40)]
+    patterns = score_block(word_array(words), word_array(words))
+    for i, guess in enumerate(words):
+        for j, answer in enumerate(words):
+            assert decode(patterns[i, j], word_size) == score_guess(guess, answer), (guess, answer)
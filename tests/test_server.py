@@ -0,0 +1,47 @@
+"""
+File: test_server.py
+Tests for the game sessions of the server.
+"""
+
+# Imports
+import os
+import pytest
+from server import SessionManager
+from word_store import get_word_store
+from wordy_engine import WordyEngine, InvalidGuess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('guess', ['ééééé', 'ab1de', 'ａｂｃｄｅ'])
+def test_guess_that_is_not_a_to_z_is_rejected_without_changing_the_game(guess):
+    """ Letters the keyboard does not have get a 400 and leave the session as it was. """
+    manager = SessionManager(get_word_store(os.path.join(ROOT, 'short_wordlist.txt'),
+                                            os.path.join(ROOT, 'long_wordlist.txt')))
+    state = manager.handle('start', {'any_guess': True})[1]
+
+    status, payload = manager.handle('guess', {'session': state['session'], 'guess': guess})
+
+    assert status == 400 and 'error' in payload
+    assert manager.sessions[state['session']].engine.guesses == []
+
+
+def test_engine_rejects_letters_outside_a_to_z():
+    """ The engine never records a guess its constraints cannot track. """
+    engine = WordyEngine('crane', guesses_must_be_words=False)
+    with pytest.raises(InvalidGuess):
+        engine.submit('ééééé')
+    assert engine.guesses == [] and engine.constraints.min_count == WordyEngine('crane').constraints.min_count
+
+
+@pytest.mark.parametrize('action', ['guess', 'state'])
+@pytest.mark.parametrize('session_id', [['a', 'b'], {'id': 1}, 7, None])
+def test_session_id_that_is_not_a_string_is_unknown(action, session_id):
+    """ Lists and objects sent as the session id get a 404 instead of breaking the handler. """
+    manager = SessionManager(get_word_store(os.path.join(ROOT, 'short_wordlist.txt'),
+                                            os.path.join(ROOT, 'long_wordlist.txt')))
+    manager.handle('start', {})
+
+    status, payload = manager.handle(action, {'session': session_id, 'guess': 'crane'})
+
+    assert status == 404 and 'error' in payload
@@ -0,0 +1,78 @@
+"""
+File: test_simulate.py
+Tests for the headless game simulator.
+"""
+
+# Imports
+import os
+import random
+import simulate
+import solver
+from word_store import get_word_store
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORD_COUNT = 300
+
+
+class Collector:
+    """ Result writer that keeps every result. """
+
+    def __init__(self):
+        """ Starts empty. """
+        self.results = []
+
+    def write(self, result):
+        """ Keeps one result. """
+        self.results.append(result)
+
+
+def write_word_lists(directory):
+    """ Writes a short and a long list made of the first five letter answers of the game. """
+    with open(os.path.join(ROOT, 'short_wordlist.txt')) as source:
+        words = [line.strip() for line in source if len(line.strip()) == 5][:WORD_COUNT]
+    paths = []
+    for name in ('short.txt', 'long.txt'):
+        path = os.path.join(directory, name)
+        with open(path, 'w') as word_file:
+            word_file.write('\n'.join(words) + '\n')
+        paths.append(path)
+    return paths, words
+
+
+def test_workers_score_serially_above_parallel_threshold(tmp_path, monkeypatch):
+    """ Pool workers cannot start the solver's own process pool, so large blocks are scored in the worker. """
+    (short, long), words = write_word_lists(str(tmp_path))
+    # Every block is above the threshold, as with a large dictionary
+    monkeypatch.setattr(solver, 'PARALLEL_CELLS', 1)
+    word_solver = solver.get_solver(get_word_store(short, long), 5)
+    assert word_solver.patterns.path is not None
+
+    settings = {'short': short, 'long': long, 'strategy': 'entropy', 'num_guesses': 6,
+                'hard_mode': False, 'be_words': True, 'seed': 0}
+    collector = Collector()
+    summary = simulate.run(words[:8], settings, 2, 2, collector)
+
+    assert summary['games'] == 8
+    assert all(result['error'] is None for result in collector.results)
+
+
+def test_seed_replays_random_strategy_games(tmp_path):
+    """ The same seed plays the same games with any number of workers and leaves the global random alone. """
+    (short, long), words = write_word_lists(str(tmp_path))
+    settings = {'short': short, 'long': long, 'strategy': 'random', 'num_guesses': 6,
+                'hard_mode': False, 'be_words': True, 'seed': 3}
+
+    def games(workers):
+        """ Returns the sorted (hidden word, guesses) of one run. """
+        collector = Collector()
+        simulate.run(words[:40], settings, workers, 4, collector)
+        return sorted((result['hidden_word'], result['path']) for result in collector.results)
+
+    state = random.getstate()
+    serial = games(1)
+    assert random.getstate() == state
+    assert games(1) == serial
+    assert games(2) == serial
+
+    settings['seed'] = 4
+    assert games(1) != serial
@@ -0,0 +1,56 @@
+"""
+File: test_word_cache.py
+Tests for the compiled word list cache.
+"""
+
+# Imports
+import os
+import pytest
+import word_cache
+
+
+def write_lists(directory):
+    """ Writes a short and a long word list, returns their paths. """
+    short = os.path.join(directory, 'short.txt')
+    long = os.path.join(directory, 'long.txt')
+    with open(short, 'w') as word_file:
+        word_file.write('crane\nslate\n')
+    with open(long, 'w') as word_file:
+        word_file.write('crane\nslate\ntrace\nab\n')
+    return short, long
+
+
+def test_touched_lists_are_not_hashed_again(tmp_path, monkeypatch):
+    """ A cache whose sources only got new timestamps keeps its words and records the new mtimes. """
+    short, long = write_lists(str(tmp_path))
+    cache_path = str(tmp_path / 'lists.wordcache')
+    word_cache.load_word_lists(short, long, cache_path)
+    for path in (short, long):
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    compiled = word_cache.load_word_lists(short, long, cache_path)
+    assert compiled.words(word_cache.LONG, 5) == ('crane', 'slate', 'trace')
+    assert compiled.long_info[1] == os.stat(long).st_mtime_ns
+
+    def no_hashing(filename):
+        """ Fails the test if a source file is hashed. """
+        pytest.fail(f'{filename} was hashed again')
+
+    monkeypatch.setattr(word_cache, 'file_digest', no_hashing)
+    compiled = word_cache.load_word_lists(short, long, cache_path)
+    assert compiled.words(word_cache.SHORT, 5) == ('crane', 'slate')
+    assert compiled.words(word_cache.LONG, 2) == ('ab',)
+
+
+def test_changed_lists_are_compiled_again(tmp_path):
+    """ New contents of the same size replace the cached words. """
+    short, long = write_lists(str(tmp_path))
+    cache_path = str(tmp_path / 'lists.wordcache')
+    word_cache.load_word_lists(short, long, cache_path)
+    with open(short, 'w') as word_file:
+        word_file.write('trace\nslate\n')
+    stat = os.stat(short)
+    os.utime(short, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert word_cache.load_word_lists(short, long, cache_path).words(word_cache.SHORT, 5) == ('trace', 'slate')
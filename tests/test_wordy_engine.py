@@ -0,0 +1,90 @@
+"""
+File: test_wordy_engine.py
+Tests for the game rules: feedback, hard mode and the constraints.
+"""
+
+# Imports
+import pytest
+from wordy_engine import (WordyEngine, Constraints, InvalidGuess, score_guess, ABSENT, PRESENT, CORRECT,
+                          WON, LOST)
+
+A, P, C = ABSENT, PRESENT, CORRECT
+
+
+@pytest.mark.parametrize('guess, hidden_word, feedback', [
+    ('crane', 'crane', (C, C, C, C, C)),
+    ('slate', 'crane', (A, A, C, A, C)),
+    # A repeated letter is only present as often as the hidden word still holds it
+    ('speed', 'abide', (A, A, P, A, P)),
+    ('eerie', 'lever', (P, C, P, A, A)),
+    # Correct copies are matched before present ones, even further right
+    ('geese', 'those', (A, A, A, C, C)),
+    ('lolly', 'hello', (A, P, C, C, A)),
+    ('abbey', 'babes', (P, P, C, C, A)),
+])
+def test_repeated_letters(guess, hidden_word, feedback):
+    """ Feedback for guesses and hidden words with repeated letters. """
+    assert score_guess(guess, hidden_word) == feedback
+
+
+def play(hidden_word, *guesses, hard_mode=True):
+    """ Returns an engine after submitting the guesses, without a word list. """
+    engine = WordyEngine(hidden_word, 6, guesses_must_be_words=False, hard_mode=hard_mode)
+    for guess in guesses:
+        engine.submit(guess)
+    return engine
+
+
+@pytest.mark.parametrize('guesses, guess, message', [
+    (['slate'], 'crone', '1st letter must be S'),
+    (['slate'], 'spurt', '5th letter must be E'),
+    (['irate'], 'crane', 'Guess must contain I'),
+    (['sissy'], 'baste', '1st letter must be S'),
+])
+def test_hard_mode_rejects_ignored_hints(guesses, guess, message):
+    """ Hard mode names the first hint a guess does not use. """
+    engine = play('spine', *guesses)
+    with pytest.raises(InvalidGuess, match=message):
+        engine.submit(guess)
+    assert engine.guesses == guesses
+
+
+def test_hard_mode_needs_every_copy_of_a_repeated_letter():
+    """ Two present copies of a letter have to be used twice. """
+    engine = play('geese', 'elder')
+    assert engine.constraints.required == {'e': 2}
+    with pytest.raises(InvalidGuess, match='Guess must contain E'):
+        engine.submit('exalt')
+    assert engine.submit('ebbed') is not None
+
+
+def test_hints_are_optional_without_hard_mode():
+    """ Without hard mode any word of the right length is accepted. """
+    engine = play('spine', 'slate', hard_mode=False)
+    assert engine.submit('crony') == score_guess('crony', 'spine')
+
+
+def test_constraints_collect_every_guess():
+    """ The incrementally updated constraints hold the hints of all guesses. """
+    constraints = Constraints(5)
+    constraints.update('slate', score_guess('slate', 'spine'))
+    constraints.update('spiny', score_guess('spiny', 'spine'))
+    assert constraints.fixed == ['s', 'p', 'i', 'n', 'e']
+    assert constraints.required == {'s': 1, 'e': 1, 'p': 1, 'i': 1, 'n': 1}
+    assert constraints.check('spine') is None
+    assert constraints.check('spice') == '4th letter must be N'
+    # A grey letter is not in the word, a grey extra copy caps the count
+    assert constraints.max_count[ord('y') - ord('a')] == 0
+    constraints.update('sassy', score_guess('sassy', 'spine'))
+    assert constraints.max_count[ord('s') - ord('a')] == 1
+
+
+def test_game_ends_on_the_answer_or_the_last_guess():
+    """ The status follows the guesses, later guesses are refused. """
+    assert play('crane', 'slate', 'crane', hard_mode=False).status == WON
+    engine = WordyEngine('crane', 2, guesses_must_be_words=False)
+    engine.submit('slate')
+    engine.submit('slate')
+    assert engine.status == LOST
+    with pytest.raises(InvalidGuess, match='Game over'):
+        engine.submit('crane')
@@ -0,0 +1,83 @@
+"""
+File: warmup.py
+Background warm-up of the data the game needs.  The steps (loading the word
+lists, building indexes, loading pattern data) run one after another on a
+worker thread while the window is already shown.  Their results go through
+a queue that the Tk thread polls with window.after, so every widget update
+still happens on the Tk thread.  The shared caches (get_word_store,
+get_candidate_index, ...) are filled by the worker, so the game picks the
+finished structures up from them.
+"""
+
+# Imports
+import queue
+import threading
+import time
+
+POLL_MS = 50    # how often the Tk thread checks for finished steps
+
+
+class WarmUp:
+    """ Runs warm-up steps on a worker thread and reports them on the Tk thread. """
+
+    def __init__(self, steps, after, on_progress, on_ready, poll_ms=POLL_MS):
+        """
+        steps is a list of (label, function, required) tuples, each function
+        takes the dictionary of results so far.  on_progress(label, done,
+        total, error) is called on the Tk thread after each step, and
+        on_ready(results, errors) once every required step has finished.
+        """
+        self.steps = steps
+        self.after = after
+        self.on_progress = on_progress
+        self.on_ready = on_ready
+        self.poll_ms = poll_ms
+        self.queue = queue.Queue()
+        self.results = {}
+        self.errors = {}
+        self.timings = {}   # label -> seconds the step took
+        self.done = 0
+        self.ready = False
+        self.thread = None
+
+    def start(self):
+        """ Starts the worker thread and the polling. """
+        self.thread = threading.Thread(target=self._work, daemon=True)
+        self.thread.start()
+        self.after(self.poll_ms, self.poll)
+
+    def _work(self):
+        """ Runs the steps on the worker thread. """
+        results = {}
+        for label, function, _ in self.steps:
+            start = time.perf_counter()
+            try:
+                results[label] = function(results)
+                error = None
+            except Exception as failure:
+                error = failure
+            self.queue.put((label, results.get(label), error, time.perf_counter() - start))
+
+    def poll(self):
+        """ Hands finished steps to the Tk thread, then polls again until every step is done. """
+        while True:
+            try:
+                label, result, error, seconds = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.done += 1
+            self.timings[label] = seconds
+            if error is None:
+                self.results[label] = result
+            else:
+                self.errors[label] = error
+            self.on_progress(label, self.done, len(self.steps), error)
+
+        # The game is playable once the required steps are through
+        required = [label for label, _, needed in self.steps if needed]
+        if not self.ready and all(label in self.timings for label in required):
+            self.ready = True
+            self.on_ready(self.results, self.errors)
+
+        if self.done < len(self.steps):
+            self.after(self.poll_ms, self.poll)
@@ -0,0 +1,189 @@
+"""
+File: word_cache.py
+Compiled binary cache of the short and long word lists.
+
+Layout of a cache file (all integers little endian):
+    header      magic, then size / mtime_ns / sha1 of the short and long
+                source files, then the number of length groups in each list
+    groups      one (word length, word count, byte offset) entry per group,
+                short list groups first
+    records     the words of each group packed back to back as fixed width
+                ASCII records, so word i of a group starts at offset + i*length
+
+The file is memory-mapped when loaded and a group is only decoded the first
+time its word length is requested.
+"""
+
+# Imports
+import hashlib
+import mmap
+import os
+import struct
+
+MAGIC = b'WORDYWC2'
+CACHE_DIRNAME = '.wordy_cache'
+SHORT, LONG = 0, 1
+
+_HEADER = struct.Struct('<8s' + 'qq20s' * 2 + 'II')
+_GROUP = struct.Struct('<HIQ')     # word length, word count, byte offset
+
+
+def default_cache_path(short_filename, long_filename):
+    """ Returns the cache file path used for a pair of word list files. """
+    key = (os.path.abspath(short_filename) + '\0' + os.path.abspath(long_filename)).encode()
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(long_filename)), CACHE_DIRNAME)
+    return os.path.join(cache_dir, hashlib.sha1(key).hexdigest()[:16] + '.wordcache')
+
+
+def file_digest(filename):
+    """ Returns the sha1 digest of a file's contents. """
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as source:
+        for block in iter(lambda: source.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def source_info(filename, with_digest=True):
+    """ Returns (size, mtime_ns, sha1) for a source file. """
+    stat = os.stat(filename)
+    digest = file_digest(filename) if with_digest else b''
+    return (stat.st_size, stat.st_mtime_ns, digest)
+
+
+def read_text_word_list(filename):
+    """
+    Returns a dictionary mapping word length to the list of words in a text
+    file.  Entries that cannot be typed on the keyboard (such as cross-bun)
+    are skipped.
+    """
+    by_length = {}
+    with open(filename, 'r') as word_file:
+        for word in word_file:
+            word = word.strip().lower()
+            if word.isascii() and word.isalpha():
+                by_length.setdefault(len(word), []).append(word)
+    return by_length
+
+
+def compile_word_lists(short_by_length, long_by_length, short_info, long_info):
+    """ Returns the bytes of a cache file built from two length -> words dictionaries. """
+    groups = []
+    records = []
+    offset = 0
+    for by_length in (short_by_length, long_by_length):
+        for length in sorted(by_length):
+            words = by_length[length]
+            groups.append((length, len(words), offset))
+            block = ''.join(words).encode('ascii')
+            records.append(block)
+            offset += len(block)
+
+    header = _HEADER.pack(MAGIC, *short_info, *long_info,
+                          len(short_by_length), len(long_by_length))
+    table_size = _GROUP.size * len(groups)
+    base = len(header) + table_size
+    table = b''.join(_GROUP.pack(length, count, base + off) for length, count, off in groups)
+    return header + table + b''.join(records)
+
+
+def write_cache(path, data):
+    """ Atomically writes cache bytes to path. """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp%d' % os.getpid()
+    with open(temp_path, 'wb') as cache_file:
+        cache_file.write(data)
+    os.replace(temp_path, path)
+
+
+class CompiledWordLists:
+    """ Read-only view over the bytes of a compiled cache file. """
+
+    def __init__(self, buffer):
+        """ Parses the header and group table of the buffer. """
+        self.buffer = buffer
+        fields = _HEADER.unpack_from(buffer, 0)
+        if fields[0] != MAGIC:
+            raise ValueError('not a Wordy word list cache')
+        self.short_info = fields[1:4]
+        self.long_info = fields[4:7]
+        self.group_counts = group_counts = fields[7:9]
+
+        # (list, length) -> (count, offset)
+        self.groups = {}
+        position = _HEADER.size
+        for which in (SHORT, LONG):
+            for _ in range(group_counts[which]):
+                length, count, offset = _GROUP.unpack_from(buffer, position)
+                self.groups[(which, length)] = (count, offset)
+                position += _GROUP.size
+
+    def lengths(self, which):
+        """ Returns the sorted word lengths present in the short or long list. """
+        return sorted(length for (group_list, length) in self.groups if group_list == which)
+
+    def words(self, which, length):
+        """ Decodes and returns the tuple of words of one length from one list. """
+        count, offset = self.groups.get((which, length), (0, 0))
+        if count == 0:
+            return ()
+        block = bytes(self.buffer[offset:offset + count * length]).decode('ascii')
+        return tuple(block[i:i + length] for i in range(0, count * length, length))
+
+
+def _open_mapped(path):
+    """ Memory-maps a cache file and returns a CompiledWordLists over it. """
+    with open(path, 'rb') as cache_file:
+        buffer = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return CompiledWordLists(buffer)
+
+
+def _fresh_info(cached_info, filename):
+    """
+    Returns the info to record for a source file that still matches the
+    info in the cache (with the new mtime if only that changed), or None if
+    the file changed.
+    """
+    size, mtime_ns, digest = cached_info
+    current_size, current_mtime_ns, _ = source_info(filename, with_digest=False)
+    if (current_size, current_mtime_ns) == (size, mtime_ns):
+        return cached_info
+    # The timestamp changed, only the contents decide whether to recompile
+    if current_size == size and file_digest(filename) == digest:
+        return (size, current_mtime_ns, digest)
+    return None
+
+
+def load_word_lists(short_filename, long_filename, cache_path=None):
+    """
+    Returns a CompiledWordLists for the two files, memory-mapping the cache
+    when it is up to date and recompiling it from the text files otherwise.
+    """
+    if cache_path is None:
+        cache_path = default_cache_path(short_filename, long_filename)
+
+    data = None
+    try:
+        compiled = _open_mapped(cache_path)
+        short_info = _fresh_info(compiled.short_info, short_filename)
+        long_info = _fresh_info(compiled.long_info, long_filename)
+        if short_info is not None and long_info is not None:
+            if (short_info, long_info) == (compiled.short_info, compiled.long_info):
+                return compiled
+            # Only timestamps changed, record them so later starts skip hashing
+            data = _HEADER.pack(MAGIC, *short_info, *long_info, *compiled.group_counts) + \
+                bytes(compiled.buffer[_HEADER.size:])
+            compiled.buffer.close()
+    except (OSError, ValueError, struct.error):
+        pass
+
+    if data is None:
+        data = compile_word_lists(read_text_word_list(short_filename),
+                                  read_text_word_list(long_filename),
+                                  source_info(short_filename), source_info(long_filename))
+    try:
+        write_cache(cache_path, data)
+        return _open_mapped(cache_path)
+    except OSError:
+        # Read-only install, keep the compiled lists in memory only
+        return CompiledWordLists(data)
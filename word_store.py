@@ -0,0 +1,85 @@
+"""
+File: word_store.py
+Load-once dictionary store for Wordy.  Each word list file is read a single
+time per process and indexed by word length so that guess validation and
+hidden word selection are constant time.  The lists come from the compiled
+cache in word_cache.py, so a word length is only decoded when first used.
+"""
+
+# Imports
+import hashlib
+import os
+import random
+import threading
+import word_cache
+
+
+class WordStore:
+    """ Holds the short (answer) and long (allowed guess) word lists indexed by length. """
+
+    def __init__(self, short_filename, long_filename):
+        """ Opens the compiled word lists, per-length indexes are built on demand. """
+        self.short_filename = short_filename
+        self.long_filename = long_filename
+        self.compiled = word_cache.load_word_lists(short_filename, long_filename)
+
+        # length -> tuple of words, in file order
+        self.answers = {}
+        self.allowed = {}
+
+        # length -> frozenset of words, for O(1) membership tests
+        self.valid = {}
+        self.lock = threading.Lock()
+
+    def _index(self, cache, which, length):
+        """ Returns the words of one length from one list, decoding them on first use. """
+        words = cache.get(length)
+        if words is None:
+            with self.lock:
+                words = cache.get(length)
+                if words is None:
+                    words = self.compiled.words(which, length)
+                    cache[length] = words
+        return words
+
+    @property
+    def fingerprint(self):
+        """ Hex digest identifying the contents of both word list files. """
+        digest = hashlib.sha1(self.compiled.short_info[2] + self.compiled.long_info[2])
+        return digest.hexdigest()
+
+    def is_valid(self, word):
+        """ Returns True if the word is in the long word list. """
+        valid = self.valid.get(len(word))
+        if valid is None:
+            valid = frozenset(self.allowed_of_length(len(word)))
+            self.valid[len(word)] = valid
+        return word in valid
+
+    def random_answer(self, length):
+        """ Returns a random word of the given length from the short word list. """
+        return random.choice(self.answers_of_length(length))
+
+    def answers_of_length(self, length):
+        """ Returns the tuple of short list words with the given length. """
+        return self._index(self.answers, word_cache.SHORT, length)
+
+    def allowed_of_length(self, length):
+        """ Returns the tuple of long list words with the given length. """
+        return self._index(self.allowed, word_cache.LONG, length)
+
+
+# Stores that have already been loaded in this process, keyed by file paths
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_word_store(short_filename, long_filename):
+    """ Returns the shared WordStore for the two files, loading it on first use. """
+    key = (os.path.abspath(short_filename), os.path.abspath(long_filename))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = WordStore(short_filename, long_filename)
+            _stores[key] = store
+        return store
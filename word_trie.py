@@ -0,0 +1,184 @@
+"""
+File: word_trie.py
+Prefix validation of the letters typed so far.  The long list words of one
+length are compiled into a DAWG (a trie whose identical suffixes are shared)
+stored in three flat arrays:
+
+    masks[node]     26-bit mask of the letters that have an edge out of node
+    first[node]     index in targets of the first edge out of node
+    targets[edge]   node an edge leads to, edges of a node ordered by letter
+
+Following a letter is a mask test plus a popcount, so every keystroke costs
+O(1).  As all words of a DAWG have the same length, any node reached by a
+prefix leads to at least one word, and masks[node] is exactly the set of
+letters that can still be typed.
+"""
+
+# Imports
+import threading
+from array import array
+from wordy_engine import letter_index
+
+DEAD = -1   # node of a prefix that no word starts with
+
+
+def build_dawg(words):
+    """
+    Returns (edges, root) of the minimal DAWG of the words, where edges is a
+    list of {letter index: node} dictionaries.  Uses the incremental
+    construction for sorted input: once a branch is left it is minimized
+    by merging its nodes with identical ones seen before.
+    """
+    edges = [{}]
+    final = [False]
+    register = {}
+    unchecked = []      # (parent, letter, child) along the last word added
+    previous = ''
+
+    def minimize(down_to):
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            signature = (final[child], tuple(sorted(edges[child].items())))
+            same = register.get(signature)
+            if same is None:
+                register[signature] = child
+            else:
+                edges[parent][letter] = same
+
+    for word in sorted(set(words)):
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        minimize(common)
+
+        node = unchecked[-1][2] if unchecked else 0
+        for letter in word[common:]:
+            child = len(edges)
+            edges.append({})
+            final.append(False)
+            edges[node][letter_index(letter)] = child
+            unchecked.append((node, letter_index(letter), child))
+            node = child
+        final[node] = True
+        previous = word
+    minimize(0)
+    return edges, 0
+
+
+class WordTrie:
+    """ Array-backed DAWG of equal length words. """
+
+    def __init__(self, words):
+        """ Builds the DAWG and packs the nodes reachable from the root into arrays. """
+        words = tuple(words)
+        self.word_size = len(words[0]) if words else 0
+        self.word_count = len(set(words))
+        edges, root = build_dawg(words)
+
+        # Number the reachable nodes breadth first, the root is node 0
+        numbers = {root: 0}
+        order = [root]
+        for node in order:
+            for child in edges[node].values():
+                if child not in numbers:
+                    numbers[child] = len(order)
+                    order.append(child)
+
+        self.masks = array('I')
+        self.first = array('I')
+        self.targets = array('I')
+        for node in order:
+            mask = 0
+            self.first.append(len(self.targets))
+            for letter, child in sorted(edges[node].items()):
+                mask |= 1 << letter
+                self.targets.append(numbers[child])
+            self.masks.append(mask)
+
+    def child(self, node, letter):
+        """ Returns the node reached by following a letter (a-z) from node, or DEAD. """
+        if node == DEAD:
+            return DEAD
+        bit = 1 << letter_index(letter)
+        mask = self.masks[node]
+        if not mask & bit:
+            return DEAD
+        return self.targets[self.first[node] + (mask & (bit - 1)).bit_count()]
+
+    def allowed(self, node):
+        """ Returns the 26-bit mask of letters that can follow the prefix of node. """
+        return 0 if node == DEAD else self.masks[node]
+
+    def is_prefix(self, prefix):
+        """ Returns True if some word starts with the prefix. """
+        node = 0
+        for letter in prefix:
+            node = self.child(node, letter)
+        return node != DEAD
+
+    def __contains__(self, word):
+        """ Returns True if the word is in the DAWG. """
+        return len(word) == self.word_size and self.is_prefix(word)
+
+    @property
+    def node_count(self):
+        """ Number of nodes. """
+        return len(self.masks)
+
+    @property
+    def edge_count(self):
+        """ Number of edges. """
+        return len(self.targets)
+
+    def memory_footprint(self):
+        """ Returns the number of bytes held by the arrays. """
+        return sum(table.itemsize * len(table) for table in (self.masks, self.first, self.targets))
+
+
+class PrefixCursor:
+    """ Follows the letters of the guess being typed through a WordTrie. """
+
+    def __init__(self, trie):
+        """ Starts at the empty prefix. """
+        self.trie = trie
+        self.nodes = [0]
+
+    def reset(self):
+        """ Goes back to the empty prefix. """
+        del self.nodes[1:]
+
+    def push(self, letter):
+        """ Follows a typed letter. """
+        self.nodes.append(self.trie.child(self.nodes[-1], letter))
+
+    def pop(self):
+        """ Undoes the last typed letter. """
+        if len(self.nodes) > 1:
+            self.nodes.pop()
+
+    @property
+    def valid(self):
+        """ True if the letters typed so far can still become a word. """
+        return self.nodes[-1] != DEAD
+
+    def allowed(self):
+        """ Returns the 26-bit mask of letters that keep the prefix valid. """
+        return self.trie.allowed(self.nodes[-1])
+
+
+# Tries that have already been built in this process
+_tries = {}
+_tries_lock = threading.Lock()
+
+
+def get_word_trie(word_store, word_size):
+    """ Returns the WordTrie over the long list words of one length, building it on first use. """
+    key = (id(word_store), word_size)
+    with _tries_lock:
+        trie = _tries.get(key)
+        if trie is None:
+            trie = WordTrie(word_store.allowed_of_length(word_size))
+            _tries[key] = trie
+        return trie
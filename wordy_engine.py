@@ -0,0 +1,237 @@
+"""
+File: wordy_engine.py
+Headless Wordy game rules.  WordyEngine holds the state of a single game and
+scores guesses without any dependency on tkinter, so games can be played by
+the GUI, by scripts, or on machines without a display.
+
+Constraints tracks what the feedback so far reveals about the hidden word.
+It is updated incrementally after every scored guess, so the hard mode
+check never re-scans the earlier guess rows.
+"""
+
+# Imports
+from metrics import metrics
+
+# Feedback for a single letter of a guess
+ABSENT = 0    # letter is not in the hidden word (grey)
+PRESENT = 1   # letter is in the hidden word but in the wrong spot (orange)
+CORRECT = 2   # letter is in the hidden word and in the correct spot (green)
+
+# Game status
+PLAYING = 'playing'
+WON = 'won'
+LOST = 'lost'
+
+
+ORDINALS = ['1st', '2nd', '3rd']
+
+
+def letter_index(letter):
+    """ Returns the 0-25 index of a lower case letter. """
+    return ord(letter) - ord('a')
+
+
+def ordinal(number):
+    """ Returns 1st, 2nd, 3rd, 4th ... for a 1 based position. """
+    return ORDINALS[number - 1] if number <= len(ORDINALS) else '%dth' % number
+
+
+class Constraints:
+    """ Known letters of the hidden word, as revealed by feedback. """
+
+    __slots__ = ('word_size', 'fixed', 'banned', 'min_count', 'max_count', 'excluded', 'required')
+
+    def __init__(self, word_size):
+        """ Starts with nothing known about the hidden word. """
+        self.word_size = word_size
+        self.fixed = [None] * word_size            # position -> letter shown green
+        self.banned = [0] * word_size              # position -> 26 bit mask of letters not there
+        self.min_count = [0] * 26                  # letter -> copies known to be in the word
+        self.max_count = [word_size] * 26          # letter -> copies the word can hold at most
+        self.excluded = 0                          # 26 bit mask of letters not in the word
+        self.required = {}                         # letter -> min count, only for letters with one
+
+    def update(self, guess, feedback):
+        """ Adds the information from one scored guess. """
+        # Count the copies of each letter that were marked green or orange
+        shown = {}
+        for letter, result in zip(guess, feedback):
+            if result != ABSENT:
+                shown[letter] = shown.get(letter, 0) + 1
+
+        for position, (letter, result) in enumerate(zip(guess, feedback)):
+            index = letter_index(letter)
+            count = shown.get(letter, 0)
+            if result == CORRECT:
+                self.fixed[position] = letter
+            else:
+                self.banned[position] |= 1 << index
+            if result == ABSENT:
+                # A grey copy means the word holds exactly the shown copies
+                self.max_count[index] = count
+                if count == 0:
+                    self.excluded |= 1 << index
+            if count > self.min_count[index]:
+                self.min_count[index] = count
+                self.required[letter] = count
+
+    def check(self, guess):
+        """
+        Returns None if the guess uses every revealed hint (hard mode),
+        otherwise a message saying which hint it ignores.
+        """
+        for position, letter in enumerate(self.fixed):
+            if letter is not None and guess[position] != letter:
+                return f'{ordinal(position + 1)} letter must be {letter.upper()}'
+
+        counts = {}
+        for letter in guess:
+            counts[letter] = counts.get(letter, 0) + 1
+        for letter, count in self.required.items():
+            if counts.get(letter, 0) < count:
+                return f'Guess must contain {letter.upper()}'
+
+        return None
+
+
+class InvalidGuess(ValueError):
+    """ Raised when a submitted guess is rejected.  The message is shown to the player. """
+
+
+def score_guess(guess, hidden_word):
+    """
+    Returns a tuple with the feedback (ABSENT, PRESENT or CORRECT) for each
+    letter of the guess.  Correct letters are matched first, then repeated
+    letters are marked present from left to right only as many times as
+    they are still unmatched in the hidden word.
+    """
+    feedback = [ABSENT] * len(guess)
+
+    # Count the hidden word letters that were not matched in place
+    unmatched = {}
+    for i in range(len(guess)):
+        if guess[i] == hidden_word[i]:
+            feedback[i] = CORRECT
+        else:
+            unmatched[hidden_word[i]] = unmatched.get(hidden_word[i], 0) + 1
+
+    for i in range(len(guess)):
+        if feedback[i] != CORRECT and unmatched.get(guess[i], 0) > 0:
+            feedback[i] = PRESENT
+            unmatched[guess[i]] -= 1
+
+    return tuple(feedback)
+
+
+class WordyEngine:
+    """ State and rules of one game of Wordy. """
+
+    __slots__ = ('hidden_word', 'word_size', 'num_guesses', 'word_store',
+                 'guesses_must_be_words', 'hard_mode', 'guesses', 'feedback',
+                 'keyboard', 'current', 'status', 'constraints')
+
+    def __init__(self, hidden_word, num_guesses=6, word_store=None, word_size=None,
+                 guesses_must_be_words=True, hard_mode=False):
+        """
+        Starts a new game.  word_store is only needed when guesses must be
+        words, it must provide is_valid(word).  word_size defaults to the
+        length of the hidden word.
+        """
+        if word_size is not None and len(hidden_word) != word_size:
+            raise ValueError(f'hidden word {hidden_word!r} does not have {word_size} letters')
+        self.hidden_word = hidden_word.lower()
+        self.word_size = len(hidden_word)
+        self.num_guesses = num_guesses
+        self.word_store = word_store
+        self.guesses_must_be_words = guesses_must_be_words and word_store is not None
+        self.hard_mode = hard_mode
+
+        self.guesses = []     # submitted guesses
+        self.feedback = []    # feedback tuple for each submitted guess
+        self.keyboard = {}    # letter -> best feedback seen for that letter
+        self.current = []     # letters of the guess being typed
+        self.status = PLAYING
+        self.constraints = Constraints(self.word_size)
+
+    @property
+    def row(self):
+        """ Index of the guess currently being typed. """
+        return len(self.guesses)
+
+    def type_letter(self, letter):
+        """ Adds a letter to the current guess.  Returns False if the row is full. """
+        if self.status != PLAYING or len(self.current) >= self.word_size:
+            return False
+        self.current.append(letter.lower())
+        return True
+
+    def delete_letter(self):
+        """ Removes the last typed letter.  Returns False if there was none. """
+        if self.status != PLAYING or not self.current:
+            return False
+        self.current.pop()
+        return True
+
+    def score(self, guess):
+        """ Returns the feedback of an accepted guess. """
+        return score_guess(guess, self.hidden_word)
+
+    def validate(self, guess=None):
+        """
+        Returns the guess (the typed letters by default) in lower case.
+        Raises InvalidGuess if the guess is not accepted.
+        """
+        if guess is None:
+            guess = ''.join(self.current)
+        guess = guess.lower()
+
+        if self.status != PLAYING:
+            raise InvalidGuess('Game over')
+
+        # Check if a full word was guessed
+        if len(guess) != self.word_size:
+            raise InvalidGuess('Word not finished')
+
+        # Only the letters a to z can be scored and tracked by the constraints
+        if not (guess.isascii() and guess.isalpha()):
+            raise InvalidGuess('Guess must be letters A to Z')
+
+        # If guesses must be words check the long list
+        if self.guesses_must_be_words and not self.word_store.is_valid(guess):
+            raise InvalidGuess(f'{guess} is not in the word list')
+
+        # In hard mode every revealed hint has to be used
+        if self.hard_mode:
+            error = self.constraints.check(guess)
+            if error is not None:
+                raise InvalidGuess(error)
+        return guess
+
+    def record(self, guess, feedback):
+        """ Adds a validated guess and its feedback to the game. """
+        self.guesses.append(guess)
+        self.feedback.append(feedback)
+        self.current = []
+        self.constraints.update(guess, feedback)
+
+        # Keep the best result seen for each letter for the keyboard colors
+        for letter, result in zip(guess, feedback):
+            if result > self.keyboard.get(letter, -1):
+                self.keyboard[letter] = result
+
+        if guess == self.hidden_word:
+            self.status = WON
+        elif len(self.guesses) == self.num_guesses:
+            self.status = LOST
+
+    def submit(self, guess=None):
+        """
+        Submits a guess (the typed letters by default) and returns its
+        feedback.  Raises InvalidGuess if the guess is not accepted.
+        """
+        with metrics.timer('guess.validate'):
+            guess = self.validate(guess)
+        with metrics.timer('guess.score'):
+            feedback = self.score(guess)
+        self.record(guess, feedback)
+        return feedback